@@ -0,0 +1,26 @@
+"""Add generated_resumes.section_content
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 00:00:00
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Tables are created by create_all on startup, so the column may already exist
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("generated_resumes")}
+    if "section_content" not in columns:
+        op.add_column("generated_resumes", sa.Column("section_content", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("generated_resumes", "section_content")
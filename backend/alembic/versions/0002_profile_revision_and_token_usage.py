@@ -0,0 +1,36 @@
+"""Add users.profile_revision and guardrail_attempts token usage
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 00:00:00
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _columns(table: str) -> set:
+    return {c["name"] for c in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def upgrade() -> None:
+    # Tables are created by create_all on startup, so the columns may already exist
+    if "profile_revision" not in _columns("users"):
+        op.add_column("users", sa.Column("profile_revision", sa.Integer(), nullable=False, server_default="0"))
+    attempt_columns = _columns("guardrail_attempts")
+    if "prompt_tokens" not in attempt_columns:
+        op.add_column("guardrail_attempts", sa.Column("prompt_tokens", sa.Integer(), nullable=True))
+    if "cached_tokens" not in attempt_columns:
+        op.add_column("guardrail_attempts", sa.Column("cached_tokens", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("guardrail_attempts", "cached_tokens")
+    op.drop_column("guardrail_attempts", "prompt_tokens")
+    op.drop_column("users", "profile_revision")
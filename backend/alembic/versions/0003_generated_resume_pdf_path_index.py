@@ -0,0 +1,28 @@
+"""Index generated_resumes.pdf_path for PDF cache reference counts
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 00:00:00
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_INDEX = "ix_generated_resumes_pdf_path"
+
+
+def upgrade() -> None:
+    # Tables are created by create_all on startup, so the index may already exist
+    indexes = {i["name"] for i in sa.inspect(op.get_bind()).get_indexes("generated_resumes")}
+    if _INDEX not in indexes:
+        op.create_index(_INDEX, "generated_resumes", ["pdf_path"])
+
+
+def downgrade() -> None:
+    op.drop_index(_INDEX, table_name="generated_resumes")
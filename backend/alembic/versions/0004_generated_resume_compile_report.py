@@ -0,0 +1,26 @@
+"""Add generated_resumes.compile_report
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 00:00:00
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Tables are created by create_all on startup, so the column may already exist
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("generated_resumes")}
+    if "compile_report" not in columns:
+        op.add_column("generated_resumes", sa.Column("compile_report", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("generated_resumes", "compile_report")
@@ -0,0 +1,43 @@
+"""Add generated_resumes compile queue columns
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 00:00:00
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_INDEX = "ix_generated_resumes_compile_status"
+
+
+def upgrade() -> None:
+    # Tables are created by create_all on startup, so the columns may already exist
+    inspector = sa.inspect(op.get_bind())
+    columns = {c["name"] for c in inspector.get_columns("generated_resumes")}
+    if "compile_status" not in columns:
+        op.add_column("generated_resumes", sa.Column("compile_status", sa.String(20), nullable=True))
+    if "compile_attempts" not in columns:
+        op.add_column("generated_resumes", sa.Column("compile_attempts", sa.Integer(), nullable=True, server_default="0"))
+    if "compile_error" not in columns:
+        op.add_column("generated_resumes", sa.Column("compile_error", sa.Text(), nullable=True))
+    if _INDEX not in {i["name"] for i in inspector.get_indexes("generated_resumes")}:
+        op.create_index(_INDEX, "generated_resumes", ["compile_status"])
+    # Existing rows were compiled synchronously
+    op.execute(
+        "UPDATE generated_resumes SET compile_status = CASE WHEN pdf_path LIKE '%.pdf' "
+        "THEN 'ready' ELSE 'failed' END WHERE compile_status IS NULL"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(_INDEX, table_name="generated_resumes")
+    op.drop_column("generated_resumes", "compile_error")
+    op.drop_column("generated_resumes", "compile_attempts")
+    op.drop_column("generated_resumes", "compile_status")
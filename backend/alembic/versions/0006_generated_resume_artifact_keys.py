@@ -0,0 +1,40 @@
+"""Store artifact keys instead of local paths in generated_resumes.pdf_path
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 00:00:00
+"""
+import re
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# <output>/pdf/<shard>/<sha256>.pdf, the layout of the PDF cache before the artifact store
+_CACHED_PDF = re.compile(r"/pdf/([0-9a-f]{2})/(\1[0-9a-f]{62}\.pdf)$")
+
+
+def upgrade() -> None:
+    # The local artifact store keeps the same layout, so only the reference changes
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT id, pdf_path FROM generated_resumes WHERE pdf_path LIKE '%/pdf/%.pdf'"
+    )).fetchall()
+    for resume_id, pdf_path in rows:
+        match = _CACHED_PDF.search(pdf_path.replace("\\", "/"))
+        if match:
+            bind.execute(
+                sa.text("UPDATE generated_resumes SET pdf_path = :key WHERE id = :id"),
+                {"key": match.group(2), "id": resume_id},
+            )
+
+
+def downgrade() -> None:
+    # Artifact keys do not record which output directory they came from; downloads
+    # of converted rows need the artifact store
+    pass
@@ -4,6 +4,7 @@ from app.auth.auth import (
     create_access_token,
     decode_access_token,
     get_current_user,
+    get_current_admin,
 )
 
 __all__ = [
@@ -12,4 +13,5 @@ __all__ = [
     "create_access_token",
     "decode_access_token",
     "get_current_user",
+    "get_current_admin",
 ]
@@ -5,10 +5,12 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.database import get_db
+from app.database import get_async_db, get_db
 from app.models.user import User
 
 pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
@@ -51,14 +53,35 @@ def get_current_user(
     db: Session = Depends(get_db),
 ) -> User:
     """Dependency: extract and validate the current user from the JWT token."""
-    payload = decode_access_token(credentials.credentials)
+    user_id = _token_user_id(credentials.credentials)
+    return _active_user(db.query(User).filter(User.id == user_id).first())
+
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db),
+) -> User:
+    """
+    Dependency: get_current_user for async routers. The user is loaded through the
+    endpoint's own AsyncSession, so changes to it commit with the endpoint's.
+    """
+    user_id = _token_user_id(credentials.credentials)
+    result = await db.execute(select(User).where(User.id == user_id))
+    return _active_user(result.scalars().first())
+
+
+def _token_user_id(token: str) -> str:
+    payload = decode_access_token(token)
     user_id: str = payload.get("sub")
     if user_id is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token payload",
         )
-    user = db.query(User).filter(User.id == user_id).first()
+    return user_id
+
+
+def _active_user(user: Optional[User]) -> User:
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -72,6 +95,16 @@ def get_current_user(
     return user
 
 
+def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+    """Dependency: require the current user to be listed in ADMIN_EMAILS."""
+    if current_user.email.lower() not in settings.admin_emails:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required",
+        )
+    return current_user
+
+
 def get_current_user_pdf(
     token: Optional[str] = None,
     db: Session = Depends(get_db),
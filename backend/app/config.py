@@ -14,24 +14,68 @@ class Settings(BaseSettings):
 
     # OpenAI
     OPENAI_API_KEY: str = ""
+    LLM_MAX_CONCURRENCY: int = 4  # LLM requests in flight across the process
+
+    # Generation
+    PARALLEL_SECTION_GENERATION: bool = False
+    STREAMING_GUARDRAIL: bool = True  # Stream generations and abort on the first definite violation
+    SPECULATIVE_TEMPERATURES: str = "0.2,0.5,0.8"  # One candidate per entry
+    SPECULATIVE_USER_BUDGET: int = 6  # Max in-flight candidates per user
 
     # Server
     BACKEND_HOST: str = "0.0.0.0"
     BACKEND_PORT: int = 8000
     BACKEND_CORS_ORIGINS: str = "http://localhost:3000"
 
+    # Admin (comma-separated emails allowed to use /api/admin)
+    ADMIN_EMAILS: str = ""
+
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = 30
 
     # LaTeX
     LATEX_TIMEOUT_SECONDS: int = 60
-    LATEX_MAX_RUNS: int = 2
+    LATEX_MAX_RUNS: int = 3  # Upper bound; passes stop once the log stops asking for a rerun
     LATEX_OUTPUT_DIR: str = os.path.join(os.path.dirname(__file__), "..", "output")
+    LATEX_WORKERS: int = 2  # Warm compile workers per backend process, i.e. max concurrent pdflatex
+    LATEX_COMPILE_QUEUE_LIMIT: int = 8  # Compiles allowed to wait for a worker before 503s
+    LATEX_COMPILE_BACKLOG_LIMIT: int = 100  # Resumes queued for background compilation before 503s
+    LATEX_SANDBOX_CONTAINER: str = "latex-sandbox"
+    LATEX_SANDBOX_OUTPUT_DIR: str = "/output"  # LATEX_OUTPUT_DIR as mounted in the sandbox
+    LATEX_SANDBOX_PROBE_TTL_SECONDS: int = 60
+    LATEX_PRECOMPILED_FORMATS: bool = True  # Dump a .fmt per template preamble on save
+    LATEX_PREFLIGHT: bool = True  # Lint before compiling; structurally broken documents never reach pdflatex
+    LATEX_PDF_CACHE_MAX_MB: int = 1024
+    LATEX_COMPILE_RETRIES: int = 2  # Retries after a compile infrastructure failure
+    LATEX_COMPILE_RETRY_BACKOFF_SECONDS: float = 2.0  # Doubled after every failed attempt
+    LATEX_PDF_CACHE_MIN_AGE_SECONDS: int = 3600  # Never evict entries used more recently
+    LATEX_SCRATCH_DIR: str = ""  # Per-job compile directories; empty uses /dev/shm when writable
+    LATEX_ARTIFACT_RETENTION_DAYS: int = 30  # Unreferenced PDFs unused this long are deleted; 0 keeps them
+    LATEX_IDLE_COMPILE_SECONDS: float = 20  # Edited resumes compile once editing pauses this long; 0 waits for a download
+    LATEX_ON_DEMAND_WAIT_SECONDS: float = 30  # A download of an edited resume waits this long for its compile
+    LATEX_GC_INTERVAL_SECONDS: int = 3600  # Between artifact garbage collection passes; 0 disables
+
+    # Artifact storage for compiled PDFs: "local" (LATEX_OUTPUT_DIR/pdf) or "s3"
+    ARTIFACT_STORE: str = "local"
+    ARTIFACT_S3_ENDPOINT_URL: str = ""  # e.g. https://s3.us-east-1.amazonaws.com or a MinIO URL
+    ARTIFACT_S3_BUCKET: str = ""
+    ARTIFACT_S3_REGION: str = "us-east-1"
+    ARTIFACT_S3_ACCESS_KEY: str = ""
+    ARTIFACT_S3_SECRET_KEY: str = ""
+    ARTIFACT_S3_PREFIX: str = "pdf/"
 
     @property
     def cors_origins(self) -> List[str]:
         return [origin.strip() for origin in self.BACKEND_CORS_ORIGINS.split(",")]
 
+    @property
+    def speculative_temperatures(self) -> List[float]:
+        return [float(t) for t in self.SPECULATIVE_TEMPERATURES.split(",") if t.strip()]
+
+    @property
+    def admin_emails(self) -> List[str]:
+        return [email.strip().lower() for email in self.ADMIN_EMAILS.split(",") if email.strip()]
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -1,23 +1,42 @@
 from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 from app.config import settings
 
 
 _url = settings.DATABASE_URL
 
+# Async drivers for the same database: CRUD routers await their queries on the
+# event loop instead of holding a threadpool worker next to LLM calls
+_ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def async_url(url: str) -> str:
+    """The URL of `url`'s database through its asyncio driver (aiosqlite, asyncpg)."""
+    parsed = make_url(url)
+    driver = _ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver for database URL {parsed.drivername!r}")
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def _set_sqlite_pragma(dbapi_conn, connection_record):
+    """Enable WAL mode and foreign keys for SQLite."""
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL;")
+    cursor.execute("PRAGMA foreign_keys=ON;")
+    cursor.close()
+
+
 if _url.startswith("sqlite"):
     engine = create_engine(
         _url,
         connect_args={"check_same_thread": False},
     )
-
-    # Enable WAL mode and foreign keys for SQLite
-    @event.listens_for(engine, "connect")
-    def _set_sqlite_pragma(dbapi_conn, connection_record):
-        cursor = dbapi_conn.cursor()
-        cursor.execute("PRAGMA journal_mode=WAL;")
-        cursor.execute("PRAGMA foreign_keys=ON;")
-        cursor.close()
+    async_engine = create_async_engine(async_url(_url))
+    event.listen(engine, "connect", _set_sqlite_pragma)
+    event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragma)
 else:
     engine = create_engine(
         _url,
@@ -25,8 +44,16 @@ else:
         pool_size=10,
         max_overflow=20,
     )
+    async_engine = create_async_engine(
+        async_url(_url),
+        pool_pre_ping=True,
+        pool_size=10,
+        max_overflow=20,
+    )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False: attributes read after commit would otherwise lazy-load outside the loop
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 
 class Base(DeclarativeBase):
@@ -41,3 +68,9 @@ def get_db():
     finally:
         db.close()
 
+
+
+async def get_async_db():
+    """Dependency that provides an asyncio database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,12 +1,16 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
 from app.config import settings
-from app.database import engine, Base
-from app.routers import auth, skills, projects, experiences, achievements, templates, resumes, chat
+from app.database import async_engine, engine, Base
+from app.services.latex_compiler import shutdown_compile_pool, CompileQueueFull
+from app.services.compile_queue import recover_pending_jobs
+from app.services.artifact_gc import start_gc, stop_gc
+from app.routers import auth, skills, projects, experiences, achievements, templates, resumes, chat, admin, preview
 
 # Create rate limiter
 limiter = Limiter(key_func=get_remote_address)
@@ -21,6 +25,16 @@ app = FastAPI(
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+
+@app.exception_handler(CompileQueueFull)
+async def compile_queue_full_handler(request: Request, exc: CompileQueueFull):
+    """Shed load when the LaTeX compile queue is full instead of piling up pdflatex processes."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -33,8 +47,18 @@ app.add_middleware(
 
 @app.on_event("startup")
 async def startup():
-    """Create database tables on startup."""
+    """Create database tables on startup, resume unfinished compile jobs and start artifact GC."""
     Base.metadata.create_all(bind=engine)
+    recover_pending_jobs()
+    start_gc()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop the warm LaTeX compile workers and artifact GC, and close pooled async connections."""
+    stop_gc()
+    shutdown_compile_pool()
+    await async_engine.dispose()
 
 
 @app.get("/health")
@@ -51,3 +75,5 @@ app.include_router(achievements.router, prefix="/api/achievements", tags=["Achie
 app.include_router(templates.router, prefix="/api/templates", tags=["Resume Templates"])
 app.include_router(resumes.router, prefix="/api/resumes", tags=["Generated Resumes"])
 app.include_router(chat.router, prefix="/api/chat", tags=["AI Refinement Chat"])
+app.include_router(admin.router, prefix="/api/admin", tags=["Admin"])
+app.include_router(preview.router, prefix="/api/preview", tags=["LaTeX Preview"])
@@ -5,8 +5,11 @@ from app.models.experience import Experience
 from app.models.achievement import Achievement
 from app.models.resume_template import ResumeTemplate
 from app.models.generated_resume import GeneratedResume
+from app.models.guardrail_attempt import GuardrailAttempt
+from app.models.guardrail_violation import GuardrailViolation
 
 __all__ = [
     "User", "Skill", "Project", "Experience",
     "Achievement", "ResumeTemplate", "GeneratedResume",
+    "GuardrailAttempt", "GuardrailViolation",
 ]
@@ -13,11 +13,16 @@ class GeneratedResume(Base):
     template_id = Column(String, ForeignKey("resume_templates.id", ondelete="SET NULL"), nullable=True)
     job_description = Column(Text, nullable=False)
     latex_output = Column(Text, nullable=False)
-    pdf_path = Column(String(500), nullable=True)
+    pdf_path = Column(String(500), nullable=True, index=True)  # Artifact key; identical PDFs share one key
     match_score = Column(Float, nullable=True)
     matched_skills = Column(Text, nullable=True)  # JSON
     missing_skills = Column(Text, nullable=True)  # JSON
     metadata_json = Column(Text, nullable=True)  # Full analysis JSON
+    section_content = Column(Text, nullable=True)  # JSON: section name -> generated content
+    compile_report = Column(Text, nullable=True)  # JSON CompileReport: errors, warnings, pages, runs
+    compile_status = Column(String(20), nullable=True, index=True)  # pending, compiling, ready, failed, stale
+    compile_attempts = Column(Integer, default=0)
+    compile_error = Column(Text, nullable=True)
     version = Column(Integer, default=1)
     created_at = Column(DateTime, default=datetime.utcnow)
 
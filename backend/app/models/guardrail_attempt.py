@@ -0,0 +1,26 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Float, Integer, Boolean
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+
+class GuardrailAttempt(Base):
+    __tablename__ = "guardrail_attempts"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    generation_id = Column(String, nullable=False, index=True)  # Groups attempts of one request
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    template_id = Column(String, ForeignKey("resume_templates.id", ondelete="SET NULL"), nullable=True, index=True)
+    resume_id = Column(String, ForeignKey("generated_resumes.id", ondelete="SET NULL"), nullable=True)
+    source = Column(String(20), nullable=False)  # "generate" or "refine"
+    attempt_number = Column(Integer, nullable=False)
+    section = Column(String(50), nullable=True)  # None when the whole document was validated
+    passed = Column(Boolean, nullable=False)
+    error = Column(Text, nullable=True)  # Set when the attempt raised instead of validating
+    latency_ms = Column(Float, nullable=True)
+    prompt_tokens = Column(Integer, nullable=True)  # LLM usage of the attempt
+    cached_tokens = Column(Integer, nullable=True)  # Prompt tokens served from the provider's prefix cache
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    violations = relationship("GuardrailViolation", back_populates="attempt", cascade="all, delete-orphan")
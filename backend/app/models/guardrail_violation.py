@@ -0,0 +1,17 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+
+class GuardrailViolation(Base):
+    __tablename__ = "guardrail_violations"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    attempt_id = Column(String, ForeignKey("guardrail_attempts.id", ondelete="CASCADE"), nullable=False, index=True)
+    term = Column(String(255), nullable=False, index=True)
+    accepted = Column(Boolean, default=False)  # Term still present in the finally accepted content
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    attempt = relationship("GuardrailAttempt", back_populates="violations")
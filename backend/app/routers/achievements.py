@@ -1,64 +1,72 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_async_db
 from app.models.user import User
 from app.models.achievement import Achievement
 from app.schemas.schemas import AchievementCreate, AchievementUpdate, AchievementResponse
-from app.auth.auth import get_current_user
+from app.auth.auth import get_current_user_async
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[AchievementResponse])
-def list_achievements(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+async def list_achievements(
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    return db.query(Achievement).filter(Achievement.user_id == current_user.id).all()
+    result = await db.execute(select(Achievement).where(Achievement.user_id == current_user.id))
+    return result.scalars().all()
 
 
 @router.post("/", response_model=AchievementResponse, status_code=status.HTTP_201_CREATED)
-def create_achievement(
+async def create_achievement(
     payload: AchievementCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     ach = Achievement(user_id=current_user.id, **payload.model_dump())
     db.add(ach)
-    db.commit()
-    db.refresh(ach)
+    await db.commit()
+    await db.refresh(ach)
     return ach
 
 
 @router.put("/{ach_id}", response_model=AchievementResponse)
-def update_achievement(
+async def update_achievement(
     ach_id: str,
     payload: AchievementUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    ach = db.query(Achievement).filter(Achievement.id == ach_id, Achievement.user_id == current_user.id).first()
+    result = await db.execute(
+        select(Achievement).where(Achievement.id == ach_id, Achievement.user_id == current_user.id)
+    )
+    ach = result.scalars().first()
     if not ach:
         raise HTTPException(status_code=404, detail="Achievement not found")
 
     for key, value in payload.model_dump(exclude_unset=True).items():
         setattr(ach, key, value)
 
-    db.commit()
-    db.refresh(ach)
+    await db.commit()
+    await db.refresh(ach)
     return ach
 
 
 @router.delete("/{ach_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_achievement(
+async def delete_achievement(
     ach_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    ach = db.query(Achievement).filter(Achievement.id == ach_id, Achievement.user_id == current_user.id).first()
+    result = await db.execute(
+        select(Achievement).where(Achievement.id == ach_id, Achievement.user_id == current_user.id)
+    )
+    ach = result.scalars().first()
     if not ach:
         raise HTTPException(status_code=404, detail="Achievement not found")
-    db.delete(ach)
-    db.commit()
+    await db.delete(ach)
+    await db.commit()
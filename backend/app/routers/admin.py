@@ -0,0 +1,45 @@
+"""
+Admin Router.
+Operational views for tuning the guardrail validator and the LaTeX compile pool,
+and on-demand artifact garbage collection.
+"""
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models.user import User
+from app.schemas.schemas import ArtifactGCResult, CompilePoolStats, GuardrailStats
+from app.auth.auth import get_current_admin
+from app.services.guardrail_telemetry import get_guardrail_stats
+from app.services.latex_compiler import get_compile_stats
+from app.services.compile_queue import backlog
+from app.services.artifact_gc import collect_garbage
+
+router = APIRouter()
+
+
+@router.get("/guardrail/stats", response_model=GuardrailStats)
+def guardrail_stats(
+    limit: int = Query(20, ge=1, le=200),
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db),
+):
+    """Retry rates, exhausted generations and the most frequent violating terms."""
+    return get_guardrail_stats(db, limit=limit)
+
+
+@router.get("/compile/stats", response_model=CompilePoolStats)
+def compile_stats(current_user: User = Depends(get_current_admin)):
+    """Compile queue depth, busy workers, rejections and recent per-job timings."""
+    stats = get_compile_stats()
+    stats.backlog_depth = backlog()
+    return stats
+
+
+@router.post("/artifacts/gc", response_model=ArtifactGCResult)
+def artifacts_gc(
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db),
+):
+    """Run an artifact garbage collection pass now instead of waiting for the next interval."""
+    return collect_garbage(db)
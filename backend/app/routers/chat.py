@@ -2,9 +2,12 @@
 Chat Router for interactive AI resume refinement.
 """
 import json
+import time
+import uuid
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.database import get_db
 from app.models.user import User
 from app.models.skill import Skill
@@ -12,6 +15,10 @@ from app.models.generated_resume import GeneratedResume
 from app.schemas.schemas import ChatRequest, ChatResponse
 from app.auth.auth import get_current_user
 from app.services.chat_refiner import refine_resume
+from app.services.guardrail_telemetry import record_attempt
+from app.services.compile_queue import mark_stale, publish_status, schedule_idle_compile
+from app.services.latex_preflight import repair
+from app.services.llm_client import track_usage
 
 router = APIRouter()
 
@@ -37,26 +44,48 @@ def refine(
     # Get user's authorized skills
     user_skills = db.query(Skill).filter(Skill.user_id == current_user.id).all()
     authorized_skills = [s.name for s in user_skills]
+    # Category labels appear in the deterministically rendered skills section
+    authorized_skills.extend({s.category for s in user_skills if s.category})
 
     # Process refinement
     chat_history = [{"role": m.role, "content": m.content} for m in payload.history]
 
+    started = time.perf_counter()
     try:
-        reply, updated_latex, validation_passed, validation_errors = refine_resume(
-            message=payload.message,
-            current_latex=resume.latex_output,
-            authorized_skills=authorized_skills,
-            chat_history=chat_history,
-        )
+        with track_usage() as usage:
+            reply, updated_latex, validation_passed, validation_errors = refine_resume(
+                message=payload.message,
+                current_latex=resume.latex_output,
+                authorized_skills=authorized_skills,
+                chat_history=chat_history,
+            )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Refinement failed: {str(e)}")
 
-    # If valid update, save the new version
+    record_attempt(
+        db, str(uuid.uuid4()), current_user.id, "refine", 1,
+        passed=validation_passed,
+        violations=validation_errors,
+        template_id=resume.template_id,
+        resume_id=resume.id,
+        latency_ms=(time.perf_counter() - started) * 1000,
+        usage=usage,
+    )
+
+    # If valid update, save the new version; its PDF compiles once the chat goes idle
+    changed = False
     if updated_latex and validation_passed:
-        resume.latex_output = updated_latex
-        resume.version += 1
-        db.commit()
-        db.refresh(resume)
+        if settings.LATEX_PREFLIGHT:
+            updated_latex, _ = repair(updated_latex)
+        changed = updated_latex != resume.latex_output
+        if changed:
+            resume.latex_output = updated_latex
+            resume.version += 1
+            mark_stale(resume)
+    db.commit()
+    if changed:
+        publish_status(resume)
+        schedule_idle_compile(resume.id)
 
     return ChatResponse(
         reply=reply,
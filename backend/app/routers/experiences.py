@@ -1,76 +1,85 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_async_db
 from app.models.user import User
 from app.models.experience import Experience
 from app.schemas.schemas import ExperienceCreate, ExperienceUpdate, ExperienceResponse
-from app.auth.auth import get_current_user
+from app.auth.auth import get_current_user_async
+from app.services.resume_generator import bump_profile_revision
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[ExperienceResponse])
-def list_experiences(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+async def list_experiences(
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    return db.query(Experience).filter(Experience.user_id == current_user.id).all()
+    result = await db.execute(select(Experience).where(Experience.user_id == current_user.id))
+    return result.scalars().all()
 
 
 @router.post("/", response_model=ExperienceResponse, status_code=status.HTTP_201_CREATED)
-def create_experience(
+async def create_experience(
     payload: ExperienceCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     exp = Experience(user_id=current_user.id, **payload.model_dump())
     db.add(exp)
-    db.commit()
-    db.refresh(exp)
+    await db.execute(bump_profile_revision(current_user.id))
+    await db.commit()
+    await db.refresh(exp)
     return exp
 
 
 @router.get("/{exp_id}", response_model=ExperienceResponse)
-def get_experience(
+async def get_experience(
     exp_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    exp = db.query(Experience).filter(Experience.id == exp_id, Experience.user_id == current_user.id).first()
+    result = await db.execute(select(Experience).where(Experience.id == exp_id, Experience.user_id == current_user.id))
+    exp = result.scalars().first()
     if not exp:
         raise HTTPException(status_code=404, detail="Experience not found")
     return exp
 
 
 @router.put("/{exp_id}", response_model=ExperienceResponse)
-def update_experience(
+async def update_experience(
     exp_id: str,
     payload: ExperienceUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    exp = db.query(Experience).filter(Experience.id == exp_id, Experience.user_id == current_user.id).first()
+    result = await db.execute(select(Experience).where(Experience.id == exp_id, Experience.user_id == current_user.id))
+    exp = result.scalars().first()
     if not exp:
         raise HTTPException(status_code=404, detail="Experience not found")
 
     for key, value in payload.model_dump(exclude_unset=True).items():
         setattr(exp, key, value)
 
-    db.commit()
-    db.refresh(exp)
+    await db.execute(bump_profile_revision(current_user.id))
+    await db.commit()
+    await db.refresh(exp)
     return exp
 
 
 @router.delete("/{exp_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_experience(
+async def delete_experience(
     exp_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    exp = db.query(Experience).filter(Experience.id == exp_id, Experience.user_id == current_user.id).first()
+    result = await db.execute(select(Experience).where(Experience.id == exp_id, Experience.user_id == current_user.id))
+    exp = result.scalars().first()
     if not exp:
         raise HTTPException(status_code=404, detail="Experience not found")
-    db.delete(exp)
-    db.commit()
+    await db.delete(exp)
+    await db.execute(bump_profile_revision(current_user.id))
+    await db.commit()
@@ -0,0 +1,22 @@
+"""
+Preview Router.
+Instant HTML previews of LaTeX for the template editor and chat refinement,
+without a pdflatex round trip.
+"""
+from fastapi import APIRouter, Depends
+
+from app.models.user import User
+from app.schemas.schemas import LatexPreviewRequest, LatexPreviewResponse
+from app.auth.auth import get_current_user
+from app.services.latex_preview import render_preview
+
+router = APIRouter()
+
+
+@router.post("/", response_model=LatexPreviewResponse)
+def preview_latex(
+    payload: LatexPreviewRequest,
+    current_user: User = Depends(get_current_user),
+):
+    """Render a LaTeX document or fragment to HTML. The PDF download remains the exact output."""
+    return render_preview(payload.latex_content)
@@ -1,76 +1,85 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_async_db
 from app.models.user import User
 from app.models.project import Project
 from app.schemas.schemas import ProjectCreate, ProjectUpdate, ProjectResponse
-from app.auth.auth import get_current_user
+from app.auth.auth import get_current_user_async
+from app.services.resume_generator import bump_profile_revision
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[ProjectResponse])
-def list_projects(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+async def list_projects(
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    return db.query(Project).filter(Project.user_id == current_user.id).all()
+    result = await db.execute(select(Project).where(Project.user_id == current_user.id))
+    return result.scalars().all()
 
 
 @router.post("/", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
-def create_project(
+async def create_project(
     payload: ProjectCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     project = Project(user_id=current_user.id, **payload.model_dump())
     db.add(project)
-    db.commit()
-    db.refresh(project)
+    await db.execute(bump_profile_revision(current_user.id))
+    await db.commit()
+    await db.refresh(project)
     return project
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
-def get_project(
+async def get_project(
     project_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    project = db.query(Project).filter(Project.id == project_id, Project.user_id == current_user.id).first()
+    result = await db.execute(select(Project).where(Project.id == project_id, Project.user_id == current_user.id))
+    project = result.scalars().first()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     return project
 
 
 @router.put("/{project_id}", response_model=ProjectResponse)
-def update_project(
+async def update_project(
     project_id: str,
     payload: ProjectUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    project = db.query(Project).filter(Project.id == project_id, Project.user_id == current_user.id).first()
+    result = await db.execute(select(Project).where(Project.id == project_id, Project.user_id == current_user.id))
+    project = result.scalars().first()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
     for key, value in payload.model_dump(exclude_unset=True).items():
         setattr(project, key, value)
 
-    db.commit()
-    db.refresh(project)
+    await db.execute(bump_profile_revision(current_user.id))
+    await db.commit()
+    await db.refresh(project)
     return project
 
 
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_project(
+async def delete_project(
     project_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    project = db.query(Project).filter(Project.id == project_id, Project.user_id == current_user.id).first()
+    result = await db.execute(select(Project).where(Project.id == project_id, Project.user_id == current_user.id))
+    project = result.scalars().first()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    db.delete(project)
-    db.commit()
+    await db.delete(project)
+    await db.execute(bump_profile_revision(current_user.id))
+    await db.commit()
@@ -1,16 +1,23 @@
 """
 Resume Generation Router.
 Orchestrates the full pipeline: JD analysis → skill matching → project ranking →
-content generation → guardrail validation → LaTeX compilation → storage.
+content generation → guardrail validation → storage → queued LaTeX compilation.
 """
+import os
 import json
 import logging
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import FileResponse
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.config import settings
+from app.database import get_async_db, get_db
 from app.models.user import User
 from app.models.skill import Skill
 from app.models.project import Project
@@ -18,21 +25,71 @@ from app.models.experience import Experience
 from app.models.resume_template import ResumeTemplate
 from app.models.generated_resume import GeneratedResume
 from app.schemas.schemas import (
-    ResumeGenerateRequest, ResumeResponse, MatchScoreBreakdown,
+    ResumeGenerateRequest, ResumeRetemplateRequest, ResumeResponse, MatchScoreBreakdown,
+    JDAnalysis, ProjectRanking, CompileStatusResponse,
 )
-from app.auth.auth import get_current_user
+from app.auth.auth import get_current_user, get_current_user_async
 from app.services.jd_analyzer import analyze_job_description
 from app.services.skill_matcher import match_skills
 from app.services.project_ranker import rank_projects
-from app.services.resume_generator import generate_resume_content, fill_template
-from app.services.guardrail_validator import validate_resume
-from app.services.latex_compiler import compile_latex
+from app.services.resume_generator import (
+    generate_resume_content, get_compiled_template, get_profile_context, render_template, rerender_resume,
+    GenerationAborted,
+    RESUME_SECTIONS, PROSE_SECTIONS, PLACEHOLDER_ALIASES,
+)
+from app.services.section_renderers import render_sections, has_renderer, RenderContext
+from app.services.guardrail_validator import validate_sections
+from app.services.compile_queue import (
+    enqueue_compile, ensure_capacity, mark_pending, mark_stale, publish_status, schedule_idle_compile,
+    compile_on_demand, event_version, next_event, status_event,
+    ACTIVE_STATUSES, COMPILE_STALE, UPCOMING_STATUSES,
+)
+from app.services.llm_client import LLMUsage, track_usage
+from app.services.guardrail_telemetry import record_attempt, finalize_generation
+from app.services.speculative_generation import run_speculative
+from app.services import pdf_cache
+from app.services.artifact_store import get_artifact_store
+from app.services.artifact_download import artifact_response
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 MAX_REGENERATION_ATTEMPTS = 3
 
+# Comment frames sent while waiting, so proxies keep the event stream open
+SSE_KEEPALIVE_SECONDS = 15
+# An event stream ends after this long; EventSource reconnects and gets the current status
+SSE_MAX_STREAM_SECONDS = 300
+
+
+def _ranked_project_data(project_rankings: List[ProjectRanking], user_projects: List[Project]) -> List[Dict[str, Any]]:
+    """Build ranked project data for the generator from the top rankings."""
+    ranked_project_data = []
+    for ranking in project_rankings[:5]:
+        proj = next((p for p in user_projects if p.id == ranking.project_id), None)
+        if proj:
+            ranked_project_data.append({
+                "title": proj.title,
+                "description": proj.description,
+                "technologies": proj.technologies,
+                "impact": proj.impact,
+            })
+    return ranked_project_data
+
+
+def _authorized_terms(
+    user_skills: List[Skill],
+    user_projects: List[Project],
+    user_experiences: List[Experience],
+) -> List[str]:
+    """Prepare authorization list (skills + projects + companies)."""
+    authorized_terms = [s.name for s in user_skills]
+    authorized_terms.extend([p.title for p in user_projects])
+    authorized_terms.extend([e.company for e in user_experiences])
+    authorized_terms.extend([e.role for e in user_experiences])
+    authorized_terms.extend({s.category for s in user_skills if s.category})
+    return authorized_terms
+
 
 @router.post("/generate", response_model=ResumeResponse)
 def generate_resume(
@@ -47,9 +104,13 @@ def generate_resume(
     3. Rank projects by relevance
     4. Generate content for placeholders
     5. Validate against guardrails
-    6. Compile LaTeX to PDF
-    7. Store the generated resume
+    6. Score the match
+    7. Store the generated resume and queue its PDF compile
+
+    Answers 503 with Retry-After when the compile backlog is full, before any LLM call.
     """
+    ensure_capacity()
+
     # Get user's template
     template = db.query(ResumeTemplate).filter(
         ResumeTemplate.id == payload.template_id,
@@ -58,6 +119,13 @@ def generate_resume(
     if not template:
         raise HTTPException(status_code=404, detail="Template not found")
 
+    compiled_template = get_compiled_template(template)
+    if compiled_template.unknown_placeholders:
+        logger.warning(
+            f"Template {template.id} has placeholders generation cannot fill: "
+            f"{compiled_template.unknown_placeholders}"
+        )
+
     # Get user's data
     user_skills = db.query(Skill).filter(Skill.user_id == current_user.id).all()
     user_projects = db.query(Project).filter(Project.user_id == current_user.id).all()
@@ -80,69 +148,151 @@ def generate_resume(
     # Step 3: Rank projects
     project_rankings = rank_projects(user_projects, jd_analysis, skill_match.matched_skills)
 
-    # Build ranked project data for the generator
-    ranked_project_data = []
-    for ranking in project_rankings[:5]:
-        proj = next((p for p in user_projects if p.id == ranking.project_id), None)
-        if proj:
-            ranked_project_data.append({
-                "title": proj.title,
-                "description": proj.description,
-                "technologies": proj.technologies,
-                "impact": proj.impact,
-            })
+    ranked_project_data = _ranked_project_data(project_rankings, user_projects)
+    authorized_terms = _authorized_terms(user_skills, user_projects, user_experiences)
+    profile = get_profile_context(current_user, user_skills, user_projects, user_experiences)
 
-    # Step 4 & 5: Generate content with retry on validation failure
+    # Step 4 & 5: Generate content, validate each section, and regenerate only
+    # the sections that failed (with their violations fed back as a repair hint)
     latex_output = None
+    section_violations = {}
+    generation_id = str(uuid.uuid4())
+
+    # Structured sections (e.g. skills) render straight from the database;
+    # only PROSE_SECTIONS go through the LLM and the guardrail
+    content = render_sections(RESUME_SECTIONS, RenderContext(
+        user=current_user,
+        skills=user_skills,
+        matched_skills=skill_match.matched_skills,
+    ))
+
+    # Optional speculative fan-out: first candidate that passes the guardrail wins.
+    # If none passes, the closest candidate seeds the targeted repair loop below.
+    if payload.speculative:
+        winner, candidates = run_speculative(
+            current_user.id,
+            generate=lambda temperature: {
+                k.lower(): v for k, v in generate_resume_content(
+                    job_description=payload.job_description,
+                    matched_skills=skill_match.matched_skills,
+                    ranked_projects=ranked_project_data,
+                    experiences=user_experiences,
+                    domain=jd_analysis.domain,
+                    seniority=jd_analysis.seniority,
+                    temperature=temperature,
+                    profile=profile,
+                ).items()
+            },
+            validate=lambda candidate: validate_sections(
+                {name: candidate.get(name, "") for name in PROSE_SECTIONS},
+                authorized_terms,
+            ),
+            temperatures=settings.speculative_temperatures,
+        )
+        for candidate in candidates:
+            record_attempt(
+                db, generation_id, current_user.id, "speculative", candidate.index + 1,
+                passed=candidate.passed,
+                violations=[term for terms in candidate.violations.values() for term in terms],
+                template_id=template.id,
+                latency_ms=candidate.latency_ms,
+                error=candidate.error,
+                usage=candidate.usage,
+            )
+        if winner:
+            content.update(winner.content)
+            latex_output = render_template(compiled_template, content, current_user)
+        else:
+            usable = [c for c in candidates if c.content is not None and c.error is None]
+            if usable:
+                closest = min(usable, key=lambda c: c.violation_count)
+                content.update(closest.content)
+                section_violations = closest.violations
+
     for attempt in range(MAX_REGENERATION_ATTEMPTS):
+        if latex_output is not None:
+            break
+        attempt_started = time.perf_counter()
+        usage = LLMUsage()
         try:
-            content = generate_resume_content(
-                job_description=payload.job_description,
-                matched_skills=skill_match.matched_skills,
-                ranked_projects=ranked_project_data,
-                experiences=user_experiences,
-                domain=jd_analysis.domain,
-                seniority=jd_analysis.seniority,
+            pending_sections = list(section_violations) or PROSE_SECTIONS
+            aborted = {}
+            with track_usage() as usage:
+                try:
+                    generated = generate_resume_content(
+                        job_description=payload.job_description,
+                        matched_skills=skill_match.matched_skills,
+                        ranked_projects=ranked_project_data,
+                        experiences=user_experiences,
+                        domain=jd_analysis.domain,
+                        seniority=jd_analysis.seniority,
+                        sections=pending_sections,
+                        repair_violations=section_violations,
+                        profile=profile,
+                        authorized_terms=authorized_terms,
+                    )
+                except GenerationAborted as e:
+                    # Cancelled mid-stream: keep sections that finished cleanly, repair the rest now
+                    generated, aborted = e.completed, e.violations
+            generated = {k.lower(): v for k, v in generated.items()}
+            content.update(generated)
+
+            # Guardrail validation, per section
+            checked_sections = [name for name in pending_sections if name in generated]
+            section_violations = validate_sections(
+                {name: content.get(name, "") for name in checked_sections},
+                authorized_terms,
             )
+            section_violations.update(aborted)
+
+            latency_ms = (time.perf_counter() - attempt_started) * 1000
+            for name in checked_sections + list(aborted):
+                record_attempt(
+                    db, generation_id, current_user.id, "generate", attempt + 1,
+                    passed=name not in section_violations,
+                    violations=section_violations.get(name),
+                    section=name,
+                    template_id=template.id,
+                    latency_ms=latency_ms,
+                    usage=usage,
+                )
 
-            filled_latex = fill_template(template.latex_content, content, current_user)
-
-            # Prepare authorization list (skills + projects + companies)
-            authorized_terms = user_skill_names.copy()
-            authorized_terms.extend([p.title for p in user_projects])
-            authorized_terms.extend([e.company for e in user_experiences])
-            authorized_terms.extend([e.role for e in user_experiences])
-
-            # Guardrail validation
-            is_valid, violations = validate_resume(filled_latex, authorized_terms)
+            # Sections an aborted stream never reached are regenerated too
+            for name in pending_sections:
+                if name not in generated:
+                    section_violations.setdefault(name, [])
 
-            if is_valid:
-                latex_output = filled_latex
+            if not section_violations:
+                latex_output = render_template(compiled_template, content, current_user)
                 break
             else:
                 logger.warning(
-                    f"Attempt {attempt + 1}: Guardrail violations: {violations}. Regenerating..."
+                    f"Attempt {attempt + 1}: Guardrail violations: {section_violations}. "
+                    f"Regenerating sections {list(section_violations)}..."
                 )
 
         except Exception as e:
             logger.error(f"Generation attempt {attempt + 1} failed: {e}")
+            record_attempt(
+                db, generation_id, current_user.id, "generate", attempt + 1,
+                passed=False,
+                template_id=template.id,
+                latency_ms=(time.perf_counter() - attempt_started) * 1000,
+                error=str(e),
+                usage=usage,
+            )
             if attempt == MAX_REGENERATION_ATTEMPTS - 1:
+                db.commit()
                 raise HTTPException(status_code=500, detail=f"Resume generation failed after {MAX_REGENERATION_ATTEMPTS} attempts")
 
     if latex_output is None:
+        db.commit()
         raise HTTPException(
             status_code=500,
             detail="Resume generation failed guardrail validation after all attempts"
         )
 
-    # Step 6: Compile LaTeX to PDF
-    pdf_path = None
-    try:
-        pdf_path = compile_latex(latex_output)
-    except Exception as e:
-        logger.warning(f"LaTeX compilation failed: {e}. Storing LaTeX without PDF.")
-
-    # Step 7: Calculate comprehensive match score
+    # Step 6: Calculate comprehensive match score
     # score = (required_skill_match * 0.5) + (project_relevance * 0.3) + (keyword_alignment * 0.2)
     avg_project_relevance = 0.0
     if project_rankings:
@@ -174,7 +324,6 @@ def generate_resume(
         template_id=payload.template_id,
         job_description=payload.job_description,
         latex_output=latex_output,
-        pdf_path=pdf_path,
         match_score=round(total_score, 1),
         matched_skills=json.dumps(skill_match.matched_skills),
         missing_skills=json.dumps(skill_match.missing_skills),
@@ -189,37 +338,48 @@ def generate_resume(
                 "total_score": round(total_score, 1),
             },
         }),
+        # Kept apart from the output so it can be re-templated or spliced without the LLM
+        section_content=json.dumps(content),
         version=existing_count + 1,
     )
+    # Step 7: Queue LaTeX compilation; the PDF is announced on /{id}/events when ready
+    mark_pending(generated)
     db.add(generated)
+    db.flush()
+    finalize_generation(db, generation_id, generated.id, "\n".join(str(v) for v in content.values()))
     db.commit()
     db.refresh(generated)
+    enqueue_compile(generated.id)
 
     return generated
 
 
 @router.get("/", response_model=List[ResumeResponse])
-def list_resumes(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+async def list_resumes(
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """List all generated resumes for the current user."""
-    return db.query(GeneratedResume).filter(
-        GeneratedResume.user_id == current_user.id
-    ).order_by(GeneratedResume.created_at.desc()).all()
+    result = await db.execute(
+        select(GeneratedResume).where(
+            GeneratedResume.user_id == current_user.id
+        ).order_by(GeneratedResume.created_at.desc())
+    )
+    return result.scalars().all()
 
 
 @router.get("/{resume_id}", response_model=ResumeResponse)
-def get_resume(
+async def get_resume(
     resume_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get a specific generated resume."""
-    resume = db.query(GeneratedResume).filter(
+    result = await db.execute(select(GeneratedResume).where(
         GeneratedResume.id == resume_id,
         GeneratedResume.user_id == current_user.id,
-    ).first()
+    ))
+    resume = result.scalars().first()
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
     return resume
@@ -230,37 +390,131 @@ from app.auth.auth import get_current_user, get_current_user_pdf
 @router.get("/{resume_id}/pdf")
 def download_pdf(
     resume_id: str,
+    request: Request,
+    v: Optional[str] = None,
     current_user: User = Depends(get_current_user_pdf),
     db: Session = Depends(get_db),
 ):
-    """Download the PDF for a generated resume."""
+    """
+    Download the PDF for a generated resume.
+    Supports conditional and range requests. Pass the resume's `pdf_path` as `v`
+    for a content-addressed URL the browser may cache indefinitely. A resume
+    edited since its last compile is compiled first, waiting up to
+    LATEX_ON_DEMAND_WAIT_SECONDS before answering 409.
+    """
     resume = db.query(GeneratedResume).filter(
         GeneratedResume.id == resume_id,
         GeneratedResume.user_id == current_user.id,
     ).first()
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
+    if resume.compile_status == COMPILE_STALE:
+        # Edited since the last compile: compile now and wait for it
+        compile_on_demand(resume.id, db, settings.LATEX_ON_DEMAND_WAIT_SECONDS)
+        db.refresh(resume)
+    if resume.compile_status in ACTIVE_STATUSES:
+        raise HTTPException(status_code=409, detail="PDF is still compiling")
     if not resume.pdf_path or not resume.pdf_path.endswith(".pdf"):
         raise HTTPException(status_code=404, detail="PDF not available for this resume")
+    filename = f"resume_v{resume.version}.pdf"
+
+    if not pdf_cache.is_artifact_key(resume.pdf_path):
+        # Compiled before the artifact store existed; still a file on this node
+        if not os.path.exists(resume.pdf_path):
+            raise HTTPException(status_code=404, detail="PDF not available for this resume")
+        return FileResponse(resume.pdf_path, media_type="application/pdf", filename=filename)
 
-    return FileResponse(
-        resume.pdf_path,
+    artifacts = get_artifact_store()
+    info = artifacts.stat(resume.pdf_path)
+    if info is None:
+        raise HTTPException(status_code=404, detail="PDF not available for this resume")
+    return artifact_response(
+        request, artifacts, info,
         media_type="application/pdf",
-        filename=f"resume_v{resume.version}.pdf",
+        filename=filename,
+        immutable=v == resume.pdf_path,
     )
 
 
-@router.get("/{resume_id}/analysis", response_model=MatchScoreBreakdown)
-def get_analysis(
+@router.get("/{resume_id}/compile", response_model=CompileStatusResponse)
+async def get_compile_status(
     resume_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Compile status of a resume's PDF."""
+    result = await db.execute(select(GeneratedResume).where(
+        GeneratedResume.id == resume_id,
+        GeneratedResume.user_id == current_user.id,
+    ))
+    resume = result.scalars().first()
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    return status_event(resume)
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.get("/{resume_id}/events")
+def compile_events(
+    resume_id: str,
+    request: Request,
+    current_user: User = Depends(get_current_user_pdf),
     db: Session = Depends(get_db),
 ):
-    """Get the full match score analysis for a generated resume."""
+    """
+    Server-sent events for a resume's compile: one `compile` event per status
+    change, ending with the event that reports the PDF ready or failed. A stale
+    resume's stream stays open for its idle or on-demand compile. Streams wait on
+    the event loop rather than a worker thread, end when the client disconnects,
+    and close after SSE_MAX_STREAM_SECONDS for the client to reconnect.
+    Authenticates with `?token=` like the PDF download, since EventSource cannot set headers.
+    """
     resume = db.query(GeneratedResume).filter(
         GeneratedResume.id == resume_id,
         GeneratedResume.user_id == current_user.id,
     ).first()
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    seen = event_version(resume_id)
+    current = status_event(resume)
+
+    async def stream():
+        yield _sse("compile", current)
+        if current["status"] not in UPCOMING_STATUSES:
+            return
+        version = seen
+        deadline = time.monotonic() + SSE_MAX_STREAM_SECONDS
+        while not await request.is_disconnected():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            update = await next_event(resume_id, version, timeout=min(SSE_KEEPALIVE_SECONDS, remaining))
+            if update is None:
+                yield ": keep-alive\n\n"
+                continue
+            version, event = update
+            yield _sse("compile", event)
+            if event["status"] not in UPCOMING_STATUSES:
+                return
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@router.get("/{resume_id}/analysis", response_model=MatchScoreBreakdown)
+async def get_analysis(
+    resume_id: str,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Get the full match score analysis for a generated resume."""
+    result = await db.execute(select(GeneratedResume).where(
+        GeneratedResume.id == resume_id,
+        GeneratedResume.user_id == current_user.id,
+    ))
+    resume = result.scalars().first()
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
 
@@ -272,7 +526,6 @@ def get_analysis(
     skill_match = metadata.get("skill_match", {})
     rankings = metadata.get("project_rankings", [])
 
-    from app.schemas.schemas import ProjectRanking
     return MatchScoreBreakdown(
         required_skill_match=breakdown.get("required_skill_match", 0),
         project_relevance=breakdown.get("project_relevance", 0),
@@ -285,18 +538,214 @@ def get_analysis(
     )
 
 
-@router.delete("/{resume_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_resume(
+@router.post("/{resume_id}/sections/{section_name}/regenerate", response_model=ResumeResponse)
+def regenerate_section(
     resume_id: str,
+    section_name: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    """Delete a generated resume."""
+    """
+    Regenerate one section of a stored resume without rerunning the pipeline.
+    Reuses the stored JD analysis and rankings, generates and validates only this
+    section, and splices the result into the stored LaTeX in place of the old one.
+    The PDF is marked stale and recompiled once editing goes idle or it is downloaded.
+    """
+    resume = db.query(GeneratedResume).filter(
+        GeneratedResume.id == resume_id,
+        GeneratedResume.user_id == current_user.id,
+    ).first()
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+
+    name = PLACEHOLDER_ALIASES.get(section_name.lower(), section_name.lower())
+    if name not in RESUME_SECTIONS:
+        raise HTTPException(status_code=404, detail=f"Unknown section '{section_name}'")
+
+    metadata = json.loads(resume.metadata_json) if resume.metadata_json else {}
+    stored_sections = json.loads(resume.section_content) if resume.section_content else {}
+    previous = stored_sections.get(name)
+    if not previous or "jd_analysis" not in metadata:
+        raise HTTPException(status_code=409, detail="Section content not available for this resume; regenerate it in full")
+    # The old section is replaced in place, so it must still be identifiable
+    if resume.latex_output.count(previous) != 1:
+        raise HTTPException(status_code=409, detail=f"Section '{name}' was edited since generation; regenerate the resume in full")
+
+    jd_analysis = JDAnalysis(**metadata["jd_analysis"])
+    matched_skills = metadata.get("skill_match", {}).get("matched_skills", [])
+    project_rankings = [ProjectRanking(**r) for r in metadata.get("project_rankings", [])]
+
+    user_skills = db.query(Skill).filter(Skill.user_id == current_user.id).all()
+    user_projects = db.query(Project).filter(Project.user_id == current_user.id).all()
+    user_experiences = db.query(Experience).filter(Experience.user_id == current_user.id).all()
+
+    section_content = None
+    generation_id = str(uuid.uuid4())
+
+    if has_renderer(name):
+        # Structured sections come straight from the database, no LLM involved
+        section_content = render_sections([name], RenderContext(
+            user=current_user,
+            skills=user_skills,
+            matched_skills=matched_skills,
+        )).get(name)
+        if section_content is None:
+            raise HTTPException(status_code=400, detail=f"No profile data to render section '{name}'")
+    else:
+        authorized_terms = _authorized_terms(user_skills, user_projects, user_experiences)
+        ranked_project_data = _ranked_project_data(project_rankings, user_projects)
+        profile = get_profile_context(current_user, user_skills, user_projects, user_experiences)
+        violations = {}
+        for attempt in range(MAX_REGENERATION_ATTEMPTS):
+            attempt_started = time.perf_counter()
+            usage = LLMUsage()
+            try:
+                candidate = None
+                with track_usage() as usage:
+                    try:
+                        generated = generate_resume_content(
+                            job_description=resume.job_description,
+                            matched_skills=matched_skills,
+                            ranked_projects=ranked_project_data,
+                            experiences=user_experiences,
+                            domain=jd_analysis.domain,
+                            seniority=jd_analysis.seniority,
+                            sections=[name],
+                            repair_violations=violations,
+                            profile=profile,
+                            authorized_terms=authorized_terms,
+                        )
+                        candidate = {k.lower(): v for k, v in generated.items()}.get(name, "")
+                    except GenerationAborted as e:
+                        violations = e.violations
+                if candidate is not None:
+                    violations = validate_sections({name: candidate}, authorized_terms)
+                record_attempt(
+                    db, generation_id, current_user.id, "section", attempt + 1,
+                    passed=not violations,
+                    violations=violations.get(name),
+                    section=name,
+                    template_id=resume.template_id,
+                    resume_id=resume.id,
+                    latency_ms=(time.perf_counter() - attempt_started) * 1000,
+                    usage=usage,
+                )
+                if not violations:
+                    section_content = candidate
+                    break
+                logger.warning(f"Attempt {attempt + 1}: Guardrail violations in section '{name}': {violations[name]}")
+            except Exception as e:
+                logger.error(f"Section regeneration attempt {attempt + 1} failed: {e}")
+                record_attempt(
+                    db, generation_id, current_user.id, "section", attempt + 1,
+                    passed=False,
+                    section=name,
+                    template_id=resume.template_id,
+                    resume_id=resume.id,
+                    latency_ms=(time.perf_counter() - attempt_started) * 1000,
+                    error=str(e),
+                    usage=usage,
+                )
+
+        if section_content is None:
+            db.commit()
+            raise HTTPException(
+                status_code=500,
+                detail=f"Section '{name}' failed guardrail validation after {MAX_REGENERATION_ATTEMPTS} attempts",
+            )
+
+    resume.latex_output = resume.latex_output.replace(previous, str(section_content))
+    stored_sections[name] = section_content
+    resume.section_content = json.dumps(stored_sections)
+    resume.version += 1
+    mark_stale(resume)
+    finalize_generation(db, generation_id, resume.id, str(section_content))
+    db.commit()
+    db.refresh(resume)
+    publish_status(resume)
+    schedule_idle_compile(resume.id)
+
+    return resume
+
+
+@router.post("/{resume_id}/retemplate", response_model=ResumeResponse)
+def retemplate_resume(
+    resume_id: str,
+    payload: ResumeRetemplateRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Render an existing resume's stored section content into another template.
+    No LLM call: a template fill and a compile, stored as a new resume version.
+    """
     resume = db.query(GeneratedResume).filter(
         GeneratedResume.id == resume_id,
         GeneratedResume.user_id == current_user.id,
     ).first()
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
-    db.delete(resume)
+
+    template = db.query(ResumeTemplate).filter(
+        ResumeTemplate.id == payload.template_id,
+        ResumeTemplate.user_id == current_user.id,
+    ).first()
+    if not template:
+        raise HTTPException(status_code=404, detail="Template not found")
+
+    ensure_capacity()
+    latex_output = rerender_resume(resume, get_compiled_template(template), current_user)
+    if latex_output is None:
+        raise HTTPException(
+            status_code=409,
+            detail="Section content not available or edited since generation; regenerate the resume instead",
+        )
+
+    existing_count = db.query(GeneratedResume).filter(
+        GeneratedResume.user_id == current_user.id,
+        GeneratedResume.template_id == template.id,
+    ).count()
+
+    retemplated = GeneratedResume(
+        user_id=current_user.id,
+        template_id=template.id,
+        job_description=resume.job_description,
+        latex_output=latex_output,
+        match_score=resume.match_score,
+        matched_skills=resume.matched_skills,
+        missing_skills=resume.missing_skills,
+        metadata_json=resume.metadata_json,
+        section_content=resume.section_content,
+        version=existing_count + 1,
+    )
+    mark_pending(retemplated)
+    db.add(retemplated)
     db.commit()
+    db.refresh(retemplated)
+    enqueue_compile(retemplated.id)
+
+    return retemplated
+
+
+@router.delete("/{resume_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_resume(
+    resume_id: str,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Delete a generated resume."""
+    result = await db.execute(select(GeneratedResume).where(
+        GeneratedResume.id == resume_id,
+        GeneratedResume.user_id == current_user.id,
+    ))
+    resume = result.scalars().first()
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    pdf_path = resume.pdf_path
+    await db.delete(resume)
+    await db.commit()
+    # Cached PDFs can be shared by identical resumes; only the last reference removes the file
+    if pdf_path and pdf_path.endswith(".pdf"):
+        result = await db.execute(select(GeneratedResume.id).where(GeneratedResume.pdf_path == pdf_path).limit(1))
+        if result.first() is None:
+            await run_in_threadpool(pdf_cache.discard_path, pdf_path)
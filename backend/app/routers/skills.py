@@ -1,48 +1,53 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_async_db
 from app.models.user import User
 from app.models.skill import Skill
 from app.schemas.schemas import SkillCreate, SkillUpdate, SkillResponse
-from app.auth.auth import get_current_user
+from app.auth.auth import get_current_user_async
+from app.services.resume_generator import bump_profile_revision
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[SkillResponse])
-def list_skills(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+async def list_skills(
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """List all skills for the current user."""
-    return db.query(Skill).filter(Skill.user_id == current_user.id).all()
+    result = await db.execute(select(Skill).where(Skill.user_id == current_user.id))
+    return result.scalars().all()
 
 
 @router.post("/", response_model=SkillResponse, status_code=status.HTTP_201_CREATED)
-def create_skill(
+async def create_skill(
     payload: SkillCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Add a new skill to the current user's profile."""
     skill = Skill(user_id=current_user.id, **payload.model_dump())
     db.add(skill)
-    db.commit()
-    db.refresh(skill)
+    await db.execute(bump_profile_revision(current_user.id))
+    await db.commit()
+    await db.refresh(skill)
     return skill
 
 
 @router.put("/{skill_id}", response_model=SkillResponse)
-def update_skill(
+async def update_skill(
     skill_id: str,
     payload: SkillUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Update an existing skill."""
-    skill = db.query(Skill).filter(Skill.id == skill_id, Skill.user_id == current_user.id).first()
+    result = await db.execute(select(Skill).where(Skill.id == skill_id, Skill.user_id == current_user.id))
+    skill = result.scalars().first()
     if not skill:
         raise HTTPException(status_code=404, detail="Skill not found")
 
@@ -50,20 +55,23 @@ def update_skill(
     for key, value in update_data.items():
         setattr(skill, key, value)
 
-    db.commit()
-    db.refresh(skill)
+    await db.execute(bump_profile_revision(current_user.id))
+    await db.commit()
+    await db.refresh(skill)
     return skill
 
 
 @router.delete("/{skill_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_skill(
+async def delete_skill(
     skill_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Delete a skill."""
-    skill = db.query(Skill).filter(Skill.id == skill_id, Skill.user_id == current_user.id).first()
+    result = await db.execute(select(Skill).where(Skill.id == skill_id, Skill.user_id == current_user.id))
+    skill = result.scalars().first()
     if not skill:
         raise HTTPException(status_code=404, detail="Skill not found")
-    db.delete(skill)
-    db.commit()
+    await db.delete(skill)
+    await db.execute(bump_profile_revision(current_user.id))
+    await db.commit()
@@ -1,39 +1,92 @@
 import json
-import re
+import logging
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_async_db
 from app.models.user import User
 from app.models.resume_template import ResumeTemplate
+from app.models.generated_resume import GeneratedResume
 from app.schemas.schemas import TemplateCreate, TemplateUpdate, TemplateResponse
-from app.auth.auth import get_current_user
+from app.auth.auth import get_current_user_async
+from app.services.latex_lexer import find_placeholders
+from app.services.resume_generator import CompiledTemplate, get_compiled_template, rerender_resume
+from app.services.latex_compiler import precompile_format, PRIORITY_BATCH
+from app.services.compile_queue import enqueue_compile, ensure_capacity, mark_pending
 
+logger = logging.getLogger(__name__)
 router = APIRouter()
 
-PLACEHOLDER_PATTERN = re.compile(r"%%([A-Z_]+)%%")
-
 
 def detect_placeholders(latex_content: str) -> str:
-    """Detect %%PLACEHOLDER%% patterns in LaTeX content."""
-    found = list(set(PLACEHOLDER_PATTERN.findall(latex_content)))
+    """Detect %%PLACEHOLDER%%, {{placeholder}} and [[placeholder]] markers in LaTeX content."""
+    found = list(dict.fromkeys(p.key.upper() for p in find_placeholders(latex_content)))
     return json.dumps(found)
 
 
+def _template_response(tmpl: ResumeTemplate) -> TemplateResponse:
+    """Serialize a template, reporting placeholders generation cannot fill."""
+    response = TemplateResponse.model_validate(tmpl)
+    response.unknown_placeholders = get_compiled_template(tmpl).unknown_placeholders
+    return response
+
+
+def _rerender_resumes(
+    db: Session,
+    tmpl: ResumeTemplate,
+    previous: CompiledTemplate,
+    current_user: User,
+) -> List[str]:
+    """
+    Re-render every resume generated from this template's previous revision and queue its recompile.
+    Sync so async endpoints can run it with AsyncSession.run_sync.
+    """
+    compiled = get_compiled_template(tmpl)
+    resumes = db.query(GeneratedResume).filter(
+        GeneratedResume.template_id == tmpl.id,
+        GeneratedResume.user_id == current_user.id,
+        GeneratedResume.section_content.isnot(None),
+    ).all()
+
+    rerendered = []
+    for resume in resumes:
+        latex_output = rerender_resume(resume, compiled, current_user, rendered_from=previous)
+        if latex_output is None:
+            logger.info(f"Resume {resume.id} was edited since generation; not re-rendering")
+            continue
+        if latex_output == resume.latex_output:
+            continue
+        resume.latex_output = latex_output
+        mark_pending(resume)
+        resume.version += 1
+        rerendered.append(resume.id)
+
+    db.commit()
+    for resume_id in rerendered:
+        enqueue_compile(resume_id, PRIORITY_BATCH)
+    return rerendered
+
+
 @router.get("/", response_model=List[TemplateResponse])
-def list_templates(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+async def list_templates(
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    return db.query(ResumeTemplate).filter(ResumeTemplate.user_id == current_user.id).all()
+    result = await db.execute(select(ResumeTemplate).where(ResumeTemplate.user_id == current_user.id))
+    templates = result.scalars().all()
+    return [_template_response(t) for t in templates]
 
 
 @router.post("/", response_model=TemplateResponse, status_code=status.HTTP_201_CREATED)
-def create_template(
+async def create_template(
     payload: TemplateCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     placeholders = detect_placeholders(payload.latex_content)
     template = ResumeTemplate(
@@ -43,59 +96,89 @@ def create_template(
         placeholders=placeholders,
     )
     db.add(template)
-    db.commit()
-    db.refresh(template)
-    return template
+    await db.commit()
+    await db.refresh(template)
+    # Dump the preamble's TeX format off the request path so the first compile can load it
+    background_tasks.add_task(precompile_format, template.latex_content)
+    return _template_response(template)
 
 
 @router.get("/{template_id}", response_model=TemplateResponse)
-def get_template(
+async def get_template(
     template_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    tmpl = db.query(ResumeTemplate).filter(
+    result = await db.execute(select(ResumeTemplate).where(
         ResumeTemplate.id == template_id, ResumeTemplate.user_id == current_user.id
-    ).first()
+    ))
+    tmpl = result.scalars().first()
     if not tmpl:
         raise HTTPException(status_code=404, detail="Template not found")
-    return tmpl
+    return _template_response(tmpl)
 
 
 @router.put("/{template_id}", response_model=TemplateResponse)
-def update_template(
+async def update_template(
     template_id: str,
     payload: TemplateUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    background_tasks: BackgroundTasks,
+    rerender: bool = False,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    tmpl = db.query(ResumeTemplate).filter(
+    """
+    Update a template. With `?rerender=true`, resumes generated from it are re-rendered
+    from their stored section content (no LLM call) and recompiled; resumes edited
+    since generation are left as they are.
+    """
+    result = await db.execute(select(ResumeTemplate).where(
         ResumeTemplate.id == template_id, ResumeTemplate.user_id == current_user.id
-    ).first()
+    ))
+    tmpl = result.scalars().first()
     if not tmpl:
         raise HTTPException(status_code=404, detail="Template not found")
 
+    if rerender and payload.latex_content is not None:
+        ensure_capacity()
+
+    previous = get_compiled_template(tmpl)
     if payload.name is not None:
         tmpl.name = payload.name
     if payload.latex_content is not None:
         tmpl.latex_content = payload.latex_content
         tmpl.placeholders = detect_placeholders(payload.latex_content)
 
-    db.commit()
-    db.refresh(tmpl)
-    return tmpl
+    await db.commit()
+    await db.refresh(tmpl)
+
+    if payload.latex_content is not None:
+        if rerender:
+            # Re-rendered resumes compile right away; give them the new format first
+            await run_in_threadpool(precompile_format, tmpl.latex_content)
+        else:
+            background_tasks.add_task(precompile_format, tmpl.latex_content)
+
+    rerendered = []
+    if rerender and payload.latex_content is not None:
+        rerendered = await db.run_sync(_rerender_resumes, tmpl, previous, current_user)
+
+    response = _template_response(tmpl)
+    response.rerendered_resumes = rerendered
+    return response
 
 
 @router.delete("/{template_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_template(
+async def delete_template(
     template_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    tmpl = db.query(ResumeTemplate).filter(
+    result = await db.execute(select(ResumeTemplate).where(
         ResumeTemplate.id == template_id, ResumeTemplate.user_id == current_user.id
-    ).first()
+    ))
+    tmpl = result.scalars().first()
     if not tmpl:
         raise HTTPException(status_code=404, detail="Template not found")
-    db.delete(tmpl)
-    db.commit()
+    await db.delete(tmpl)
+    await db.commit()
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime, date
 
 
@@ -174,6 +174,8 @@ class TemplateResponse(BaseModel):
     name: str
     latex_content: str
     placeholders: Optional[str]
+    unknown_placeholders: List[str] = []
+    rerendered_resumes: List[str] = []  # Resume ids re-rendered by this update
     created_at: datetime
     updated_at: datetime
 
@@ -185,6 +187,11 @@ class TemplateResponse(BaseModel):
 class ResumeGenerateRequest(BaseModel):
     template_id: str
     job_description: str
+    speculative: bool = False  # Race several candidates; first guardrail-passing one wins
+
+
+class ResumeRetemplateRequest(BaseModel):
+    template_id: str
 
 
 class ResumeResponse(BaseModel):
@@ -197,6 +204,9 @@ class ResumeResponse(BaseModel):
     matched_skills: Optional[str]
     missing_skills: Optional[str]
     metadata_json: Optional[str]
+    section_content: Optional[str] = None
+    compile_report: Optional[str] = None  # JSON CompileReport of the last compile
+    compile_status: Optional[str] = None  # pending, compiling, ready, failed
     version: int
     created_at: datetime
 
@@ -204,6 +214,38 @@ class ResumeResponse(BaseModel):
         from_attributes = True
 
 
+class CompileStatusResponse(BaseModel):
+    resume_id: str
+    status: Optional[str]
+    attempts: int = 0
+    pdf_ready: bool = False
+    error: Optional[str] = None
+
+
+class LatexLogError(BaseModel):
+    message: str
+    line: Optional[int] = None  # Source line reported by TeX
+    column: Optional[int] = None  # Only known for preflight errors
+
+
+class CompileReport(BaseModel):
+    succeeded: bool
+    runs: int  # pdflatex passes until references settled
+    pages: Optional[int] = None
+    errors: List[LatexLogError] = []
+    warnings: List[str] = []
+    overfull_boxes: List[str] = []
+
+
+class LatexPreviewRequest(BaseModel):
+    latex_content: str = Field(..., max_length=200_000)
+
+
+class LatexPreviewResponse(BaseModel):
+    html: str
+    unsupported: List[str] = []  # Commands and environments the preview left out
+
+
 # ─── JD Analysis Schemas ────────────────────────────────────────
 class JDAnalysis(BaseModel):
     required_skills: List[str]
@@ -256,3 +298,76 @@ class ChatResponse(BaseModel):
     updated_latex: Optional[str] = None
     validation_passed: bool
     validation_errors: List[str] = []
+
+
+class RefineReply(BaseModel):
+    """Structured reply the refinement model is asked to return."""
+    reply: str
+    updated_latex: Optional[str] = None
+    changes_made: bool = False
+
+
+# ─── Admin Schemas ──────────────────────────────────────────────
+class TermViolationCount(BaseModel):
+    term: str
+    count: int
+    accepted_count: int  # Times the term survived into the accepted content
+
+
+class TemplateRetryStats(BaseModel):
+    template_id: Optional[str]
+    generations: int
+    retried: int
+    retry_rate: float
+
+
+class GuardrailStats(BaseModel):
+    total_generations: int
+    total_attempts: int
+    retry_rate: float
+    exhausted_generations: int
+    exhaustion_rate: float
+    avg_attempt_latency_ms: float
+    total_retry_latency_ms: float
+    total_prompt_tokens: int = 0
+    total_cached_tokens: int = 0
+    prompt_cache_hit_rate: float = 0.0  # Share of prompt tokens served from the provider cache
+    top_violating_terms: List[TermViolationCount]
+    retry_rate_by_template: List[TemplateRetryStats]
+
+
+class CompileJobTiming(BaseModel):
+    job_id: str
+    worker: int
+    backend: str
+    priority: str
+    queue_wait_ms: float
+    compile_ms: float
+    runs: int
+    succeeded: bool
+
+
+class CompilePoolStats(BaseModel):
+    workers: int
+    busy_workers: int
+    queue_depth: int  # Compiles waiting for a free worker
+    queue_limit: int
+    backlog_depth: int = 0  # Resumes queued for background compilation
+    completed_jobs: int
+    rejected_jobs: int = 0  # Turned away with 503 because the wait queue was full
+    sandbox_available: Optional[bool] = None  # None until the first probe
+    avg_queue_wait_ms: float
+    avg_compile_ms: float
+    avg_queue_wait_ms_by_priority: Dict[str, float] = {}
+    cache_hits: int = 0  # Compiles served from the content-addressed PDF cache
+    cache_misses: int = 0
+    cache_entries: int = 0
+    cache_bytes: int = 0
+    recent_jobs: List[CompileJobTiming]
+
+
+class ArtifactGCResult(BaseModel):
+    legacy_files: int = 0  # Unreferenced files left in LATEX_OUTPUT_DIR by older versions
+    scratch_dirs: int = 0  # Abandoned scratch directories and staged PDFs
+    expired_pdfs: int = 0  # Unreferenced cached PDFs past LATEX_ARTIFACT_RETENTION_DAYS
+    evicted_pdfs: int = 0  # Unreferenced cached PDFs evicted to fit LATEX_PDF_CACHE_MAX_MB
@@ -0,0 +1,135 @@
+"""
+Artifact Download Service.
+Serves stored artifacts over HTTP without reading them whole: responses stream
+from the artifact store, carry ETag and Last-Modified, answer conditional
+requests with 304 and single byte ranges with 206.
+
+A URL that names the artifact's content (e.g. `?v=<artifact key>`) never changes
+meaning, so its response may be cached as immutable; anything else is cached
+but revalidated, which costs a 304 when nothing changed.
+"""
+import logging
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional, Tuple
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+from app.services.artifact_store import ArtifactInfo, ArtifactStore
+
+logger = logging.getLogger(__name__)
+
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+class RangeNotSatisfiable(Exception):
+    """The requested byte range lies beyond the end of the artifact."""
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """If-None-Match uses weak comparison: W/ prefixes are ignored."""
+    if header.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == bare for candidate in header.split(","))
+
+
+def _not_modified(request: Request, info: ArtifactInfo) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # When both are sent, If-None-Match decides (RFC 9110 13.2.2)
+        return _etag_matches(if_none_match, info.etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(info.modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _range_applies(request: Request, info: ArtifactInfo) -> bool:
+    """If-Range: resume a partial download only if the artifact is unchanged."""
+    if_range = request.headers.get("if-range")
+    if if_range is None:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith('"'):
+        return if_range == info.etag  # Strong comparison
+    if if_range.startswith("W/"):
+        return False
+    try:
+        return int(info.modified) == int(parsedate_to_datetime(if_range).timestamp())
+    except (TypeError, ValueError):
+        return False
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    The (start, end) byte offsets, end inclusive, of a single-range `Range` header.
+    None means serve the whole artifact (no usable range, or several ranges).
+
+    Raises:
+        RangeNotSatisfiable: If the range starts beyond the end of the artifact
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, dash, last = spec.strip().partition("-")
+    if not dash:
+        return None
+    try:
+        if not first:
+            suffix = int(last)  # "bytes=-N": the last N bytes
+            if suffix <= 0:
+                raise RangeNotSatisfiable()
+            return max(0, size - suffix), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if last and end < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    return start, min(end, size - 1)
+
+
+def artifact_response(
+    request: Request,
+    artifacts: ArtifactStore,
+    info: ArtifactInfo,
+    media_type: str,
+    filename: str,
+    immutable: bool = False,
+) -> Response:
+    """A 200, 206, 304 or 416 response for a stored artifact, honouring the request's conditionals."""
+    headers = {
+        "ETag": info.etag,
+        "Last-Modified": formatdate(info.modified, usegmt=True),
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+    }
+    if _not_modified(request, info):
+        return Response(status_code=304, headers=headers)
+
+    headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    range_header = request.headers.get("range")
+    if range_header and _range_applies(request, info):
+        try:
+            byte_range = parse_range(range_header, info.size)
+        except RangeNotSatisfiable:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{info.size}"})
+        if byte_range is not None:
+            start, end = byte_range
+            length = end - start + 1
+            headers["Content-Range"] = f"bytes {start}-{end}/{info.size}"
+            headers["Content-Length"] = str(length)
+            return StreamingResponse(
+                artifacts.iter_bytes(info.key, start, length),
+                status_code=206,
+                media_type=media_type,
+                headers=headers,
+            )
+
+    headers["Content-Length"] = str(info.size)
+    return StreamingResponse(artifacts.iter_bytes(info.key), media_type=media_type, headers=headers)
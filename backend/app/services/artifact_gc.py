@@ -0,0 +1,139 @@
+"""
+Artifact GC Service.
+Keeps LATEX_OUTPUT_DIR bounded. A periodic pass deletes:
+- files older versions compiled straight into the output directory (`.tex`,
+  `.pdf`, aux files) that no GeneratedResume points at;
+- scratch directories and staged PDFs left behind by a crashed compile;
+- cached PDFs no resume references, once unused for LATEX_ARTIFACT_RETENTION_DAYS
+  or when the cache outgrows LATEX_PDF_CACHE_MAX_MB.
+"""
+import os
+import time
+import shutil
+import logging
+import threading
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.schemas.schemas import ArtifactGCResult
+from app.services import pdf_cache
+from app.services.latex_compiler import output_root, sandbox_scratch_root, scratch_root, staging_dir
+
+logger = logging.getLogger(__name__)
+
+# Extensions pdflatex used to leave in the output directory itself
+_LEGACY_EXTENSIONS = (".pdf", ".tex", ".aux", ".log", ".out")
+
+# A scratch directory this old belongs to no running compile
+_SCRATCH_MAX_AGE_SECONDS = 3600
+
+_stop = threading.Event()
+_thread: Optional[threading.Thread] = None
+
+
+def _collect_legacy_files(db: Session) -> int:
+    """Unreferenced compile output in the top level of the output directory."""
+    cutoff = time.time() - settings.LATEX_PDF_CACHE_MIN_AGE_SECONDS
+    candidates = []
+    try:
+        entries = list(os.scandir(output_root()))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        if not entry.is_file() or not entry.name.endswith(_LEGACY_EXTENSIONS):
+            continue
+        try:
+            if entry.stat().st_mtime < cutoff:
+                candidates.append(entry.path)
+        except FileNotFoundError:
+            continue
+    referenced = pdf_cache.referenced_paths(db, candidates)
+    deleted = 0
+    for path in candidates:
+        if path in referenced:
+            continue
+        try:
+            os.remove(path)
+            deleted += 1
+        except FileNotFoundError:
+            pass
+    return deleted
+
+
+def _collect_scratch() -> int:
+    """Job directories and staged PDFs no running compile can still own."""
+    cutoff = time.time() - _SCRATCH_MAX_AGE_SECONDS
+    stale: List[str] = []
+    # Each scratch root holds <worker>/<job>; `.workers` is the per-worker layout it replaced
+    for root in (scratch_root(), sandbox_scratch_root(), os.path.join(output_root(), ".workers")):
+        if not os.path.isdir(root):
+            continue
+        for worker in os.scandir(root):
+            if not worker.is_dir():
+                continue
+            for job in os.scandir(worker.path):
+                try:
+                    if job.stat(follow_symlinks=False).st_mtime < cutoff:
+                        stale.append(job.path)
+                except FileNotFoundError:
+                    continue
+    if os.path.isdir(staging_dir()):
+        for entry in os.scandir(staging_dir()):
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    stale.append(entry.path)
+            except FileNotFoundError:
+                continue
+
+    for path in stale:
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+    return len(stale)
+
+
+def collect_garbage(db: Session) -> ArtifactGCResult:
+    """Run one garbage collection pass over the compile artifacts."""
+    result = ArtifactGCResult(
+        legacy_files=_collect_legacy_files(db),
+        scratch_dirs=_collect_scratch(),
+        expired_pdfs=pdf_cache.expire(db),
+        evicted_pdfs=pdf_cache.evict(db),
+    )
+    if any(result.model_dump().values()):
+        logger.info(f"Artifact GC: {result.model_dump()}")
+    return result
+
+
+def _run() -> None:
+    while not _stop.wait(settings.LATEX_GC_INTERVAL_SECONDS):
+        db = SessionLocal()
+        try:
+            collect_garbage(db)
+        except Exception as e:
+            logger.error(f"Artifact GC failed: {e}")
+        finally:
+            db.close()
+
+
+def start_gc() -> None:
+    """Start the periodic collector; the first pass runs one interval after startup."""
+    global _thread
+    if settings.LATEX_GC_INTERVAL_SECONDS <= 0 or (_thread is not None and _thread.is_alive()):
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_run, name="artifact-gc", daemon=True)
+    _thread.start()
+
+
+def stop_gc() -> None:
+    global _thread
+    _stop.set()
+    if _thread is not None:
+        _thread.join(timeout=5)
+        _thread = None
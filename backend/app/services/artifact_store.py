@@ -0,0 +1,385 @@
+"""
+Artifact Store Service.
+Where compiled PDFs and their compile reports live once they leave the compile
+worker. Keys are flat, content-addressed names (`<hash>.pdf`, `<hash>.json`);
+GeneratedResume.pdf_path holds the key, so the API node serving a download does
+not need the file on its own disk.
+
+Two implementations:
+- LocalArtifactStore: files under LATEX_OUTPUT_DIR/pdf, sharded by the first two
+  characters of the key. Last use is tracked in the access time, so the
+  modification time (and with it ETag and Last-Modified) stays stable.
+- S3ArtifactStore: any S3-compatible object store (AWS S3, MinIO, R2, ...),
+  spoken to over httpx with SigV4 signing. Object stores cannot record last use
+  cheaply, so eviction there falls back to upload time; bucket lifecycle rules
+  are the better tool for retention.
+"""
+import os
+import hmac
+import time
+import hashlib
+import logging
+import posixpath
+import threading
+import xml.etree.ElementTree as ET
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterator, Optional
+from urllib.parse import quote, urlsplit
+import httpx
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bytes per chunk when streaming an artifact
+CHUNK_SIZE = 64 * 1024
+
+_EMPTY_SHA256 = hashlib.sha256(b"").hexdigest()
+_S3_NS = "{http://s3.amazonaws.com/doc/2006-03-01/}"
+
+
+@dataclass
+class ArtifactInfo:
+    key: str
+    size: int
+    modified: float  # When the artifact was written
+    last_used: float  # Drives least-recently-used eviction
+    etag: str  # Quoted, changes whenever the stored bytes do
+
+
+class ArtifactStore(ABC):
+    """Interface shared by the artifact stores."""
+
+    @abstractmethod
+    def put_file(self, key: str, path: str) -> None:
+        """Move a local file into the store under `key`."""
+
+    @abstractmethod
+    def put_bytes(self, key: str, data: bytes) -> None:
+        ...
+
+    @abstractmethod
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    def stat(self, key: str) -> Optional[ArtifactInfo]:
+        ...
+
+    @abstractmethod
+    def iter_bytes(self, key: str, start: int = 0, length: Optional[int] = None) -> Iterator[bytes]:
+        """Stream `length` bytes from `start` (the rest of the artifact when None)."""
+
+    @abstractmethod
+    def touch(self, key: str) -> bool:
+        """Mark an artifact used now; False if it does not exist."""
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        """Delete an artifact; False if it was already gone."""
+
+    @abstractmethod
+    def list(self) -> Iterator[ArtifactInfo]:
+        ...
+
+
+def _check_key(key: str) -> str:
+    if not key or "/" in key or "\\" in key or key.startswith("."):
+        raise ValueError(f"Invalid artifact key: {key!r}")
+    return key
+
+
+class LocalArtifactStore(ArtifactStore):
+    def __init__(self, root: str) -> None:
+        self.root = root
+
+    def path(self, key: str) -> str:
+        """Sharded by the first two characters to keep directories small."""
+        _check_key(key)
+        return os.path.join(self.root, key[:2], key)
+
+    def put_file(self, key: str, path: str) -> None:
+        target = self.path(key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(path, target)
+
+    def put_bytes(self, key: str, data: bytes) -> None:
+        target = self.path(key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        partial = f"{target}.{threading.get_ident()}.tmp"
+        with open(partial, "wb") as f:
+            f.write(data)
+        os.replace(partial, target)
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self.path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _info(self, key: str, st: os.stat_result) -> ArtifactInfo:
+        return ArtifactInfo(
+            key=key,
+            size=st.st_size,
+            modified=st.st_mtime,
+            last_used=max(st.st_atime, st.st_mtime),
+            etag=f'"{st.st_size:x}-{st.st_mtime_ns:x}"',
+        )
+
+    def stat(self, key: str) -> Optional[ArtifactInfo]:
+        try:
+            return self._info(key, os.stat(self.path(key)))
+        except FileNotFoundError:
+            return None
+
+    def iter_bytes(self, key: str, start: int = 0, length: Optional[int] = None) -> Iterator[bytes]:
+        with open(self.path(key), "rb") as f:
+            f.seek(start)
+            remaining = length
+            while remaining is None or remaining > 0:
+                chunk = f.read(CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    def touch(self, key: str) -> bool:
+        path = self.path(key)
+        try:
+            os.utime(path, ns=(time.time_ns(), os.stat(path).st_mtime_ns))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def delete(self, key: str) -> bool:
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def list(self) -> Iterator[ArtifactInfo]:
+        for root, _, files in os.walk(self.root):
+            for name in files:
+                if name.endswith(".tmp"):
+                    continue
+                try:
+                    st = os.stat(os.path.join(root, name))
+                except FileNotFoundError:
+                    continue
+                yield self._info(name, st)
+
+
+def _hmac(key: bytes, message: str) -> bytes:
+    return hmac.new(key, message.encode("utf-8"), hashlib.sha256).digest()
+
+
+def sign_v4(
+    method: str,
+    url: str,
+    headers: Dict[str, str],
+    payload_hash: str,
+    access_key: str,
+    secret_key: str,
+    region: str,
+    now: Optional[datetime] = None,
+) -> Dict[str, str]:
+    """
+    AWS Signature Version 4 headers for an S3 request. Every header passed in is
+    signed, together with host, x-amz-date and x-amz-content-sha256.
+    """
+    now = now or datetime.now(timezone.utc)
+    amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+    date = amz_date[:8]
+    parts = urlsplit(url)
+
+    signed = {k.lower(): " ".join(v.split()) for k, v in headers.items()}
+    signed["host"] = parts.netloc
+    signed["x-amz-date"] = amz_date
+    signed["x-amz-content-sha256"] = payload_hash
+    names = sorted(signed)
+
+    query = []
+    for pair in parts.query.split("&") if parts.query else []:
+        name, _, value = pair.partition("=")
+        query.append((quote(name, safe="-_.~"), quote(value, safe="-_.~")))
+    canonical_request = "\n".join([
+        method,
+        quote(parts.path or "/", safe="/-_.~"),
+        "&".join(f"{k}={v}" for k, v in sorted(query)),
+        "".join(f"{name}:{signed[name]}\n" for name in names),
+        ";".join(names),
+        payload_hash,
+    ])
+    scope = f"{date}/{region}/s3/aws4_request"
+    string_to_sign = "\n".join([
+        "AWS4-HMAC-SHA256", amz_date, scope, hashlib.sha256(canonical_request.encode("utf-8")).hexdigest(),
+    ])
+    signing_key = _hmac(_hmac(_hmac(_hmac(f"AWS4{secret_key}".encode("utf-8"), date), region), "s3"), "aws4_request")
+    signature = hmac.new(signing_key, string_to_sign.encode("utf-8"), hashlib.sha256).hexdigest()
+
+    result = {name: signed[name] for name in names if name != "host"}
+    result["authorization"] = (
+        f"AWS4-HMAC-SHA256 Credential={access_key}/{scope}, "
+        f"SignedHeaders={';'.join(names)}, Signature={signature}"
+    )
+    return result
+
+
+class S3ArtifactStore(ArtifactStore):
+    """Objects under `prefix` in one bucket, addressed path-style ({endpoint}/{bucket}/{key})."""
+
+    def __init__(
+        self,
+        endpoint_url: str,
+        bucket: str,
+        access_key: str,
+        secret_key: str,
+        region: str = "us-east-1",
+        prefix: str = "",
+        transport: Optional[httpx.BaseTransport] = None,
+    ) -> None:
+        self.endpoint_url = endpoint_url.rstrip("/")
+        self.bucket = bucket
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+        self.prefix = prefix
+        self._client = httpx.Client(transport=transport, timeout=30.0)
+
+    def _url(self, key: Optional[str] = None, query: str = "") -> str:
+        url = f"{self.endpoint_url}/{self.bucket}"
+        if key is not None:
+            url += "/" + quote(self.prefix + _check_key(key), safe="/-_.~")
+        return f"{url}?{query}" if query else url
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        content: bytes = b"",
+        headers: Optional[Dict[str, str]] = None,
+        stream: bool = False,
+    ) -> httpx.Response:
+        headers = headers or {}
+        payload_hash = hashlib.sha256(content).hexdigest() if content else _EMPTY_SHA256
+        headers = {**headers, **sign_v4(
+            method, url, headers, payload_hash, self.access_key, self.secret_key, self.region,
+        )}
+        request = self._client.build_request(method, url, content=content or None, headers=headers)
+        return self._client.send(request, stream=stream)
+
+    @staticmethod
+    def _raise_for_status(response: httpx.Response, action: str) -> None:
+        if response.status_code >= 300:
+            raise OSError(f"S3 {action} failed with HTTP {response.status_code}: {response.text[:200]}")
+
+    def put_bytes(self, key: str, data: bytes) -> None:
+        response = self._request("PUT", self._url(key), content=data)
+        self._raise_for_status(response, f"PUT {key}")
+
+    def put_file(self, key: str, path: str) -> None:
+        with open(path, "rb") as f:
+            self.put_bytes(key, f.read())
+        os.remove(path)
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        response = self._request("GET", self._url(key))
+        if response.status_code == 404:
+            return None
+        self._raise_for_status(response, f"GET {key}")
+        return response.content
+
+    def stat(self, key: str) -> Optional[ArtifactInfo]:
+        response = self._request("HEAD", self._url(key))
+        if response.status_code == 404:
+            return None
+        self._raise_for_status(response, f"HEAD {key}")
+        modified = parsedate_to_datetime(response.headers["last-modified"]).timestamp()
+        return ArtifactInfo(
+            key=key,
+            size=int(response.headers["content-length"]),
+            modified=modified,
+            last_used=modified,
+            etag=response.headers.get("etag", f'"{key}"'),
+        )
+
+    def iter_bytes(self, key: str, start: int = 0, length: Optional[int] = None) -> Iterator[bytes]:
+        headers = {}
+        if start or length is not None:
+            end = "" if length is None else str(start + length - 1)
+            headers["range"] = f"bytes={start}-{end}"
+        response = self._request("GET", self._url(key), headers=headers, stream=True)
+        try:
+            self._raise_for_status(response, f"GET {key}")
+            yield from response.iter_bytes(CHUNK_SIZE)
+        finally:
+            response.close()
+
+    def touch(self, key: str) -> bool:
+        # Rewriting an object to bump its timestamp would cost a copy; existence is what callers need
+        return self.stat(key) is not None
+
+    def delete(self, key: str) -> bool:
+        # S3 answers 204 whether or not the object existed
+        response = self._request("DELETE", self._url(key))
+        self._raise_for_status(response, f"DELETE {key}")
+        return True
+
+    def list(self) -> Iterator[ArtifactInfo]:
+        token = None
+        while True:
+            query = "list-type=2&prefix=" + quote(self.prefix, safe="")
+            if token:
+                query += "&continuation-token=" + quote(token, safe="")
+            response = self._request("GET", self._url(query=query))
+            self._raise_for_status(response, "list")
+            root = ET.fromstring(response.content)
+            for item in root.iter(f"{_S3_NS}Contents"):
+                key = item.findtext(f"{_S3_NS}Key", "")[len(self.prefix):]
+                modified = datetime.fromisoformat(
+                    item.findtext(f"{_S3_NS}LastModified", "").replace("Z", "+00:00")
+                ).timestamp()
+                yield ArtifactInfo(
+                    key=key,
+                    size=int(item.findtext(f"{_S3_NS}Size", "0")),
+                    modified=modified,
+                    last_used=modified,
+                    etag=item.findtext(f"{_S3_NS}ETag", f'"{key}"'),
+                )
+            if root.findtext(f"{_S3_NS}IsTruncated") != "true":
+                return
+            token = root.findtext(f"{_S3_NS}NextContinuationToken")
+
+    def close(self) -> None:
+        self._client.close()
+
+
+def local_root() -> str:
+    return os.path.join(os.path.abspath(settings.LATEX_OUTPUT_DIR), "pdf")
+
+
+_s3_store: Optional[S3ArtifactStore] = None
+_s3_lock = threading.Lock()
+
+
+def get_artifact_store() -> ArtifactStore:
+    """The store selected by ARTIFACT_STORE ("local" or "s3")."""
+    global _s3_store
+    if settings.ARTIFACT_STORE == "s3":
+        with _s3_lock:
+            if _s3_store is None:
+                _s3_store = S3ArtifactStore(
+                    endpoint_url=settings.ARTIFACT_S3_ENDPOINT_URL,
+                    bucket=settings.ARTIFACT_S3_BUCKET,
+                    access_key=settings.ARTIFACT_S3_ACCESS_KEY,
+                    secret_key=settings.ARTIFACT_S3_SECRET_KEY,
+                    region=settings.ARTIFACT_S3_REGION,
+                    prefix=settings.ARTIFACT_S3_PREFIX,
+                )
+            return _s3_store
+    return LocalArtifactStore(local_root())
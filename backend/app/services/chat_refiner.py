@@ -3,12 +3,12 @@ Chat Refiner Service.
 Handles interactive AI refinement of generated resumes.
 Enforces skill constraints and re-validates after every modification.
 """
-import json
 import logging
-import re
 from typing import List, Dict, Tuple, Optional
+from app.schemas.schemas import RefineReply
 from app.services.llm_client import call_llm_with_history
-from app.services.guardrail_validator import validate_resume
+from app.services.structured_output import parse_model, response_format, StructuredOutputError
+from app.services.guardrail_validator import validate_resume_incremental
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +22,7 @@ CRITICAL RULES:
 5. You can improve wording, restructure bullet points, adjust emphasis, and enhance descriptions.
 6. Always return the full updated LaTeX content when making changes.
 
-When making changes, return your response as JSON:
+Always return your response as JSON:
 {
   "reply": "Your explanation of what you changed",
   "updated_latex": "The full updated LaTeX content (or null if no changes)",
@@ -36,28 +36,6 @@ Current resume LaTeX:
 {current_latex}"""
 
 
-def clean_llm_json(text: str) -> str:
-    """Strip markdown markers and whitespace, or extract JSON block from text."""
-    text = text.strip()
-    # 1. Try to extract from markdown code blocks
-    if "```" in text:
-        try:
-            # Match the first code block
-            match = re.search(r"```(?:json)?\s*(.*?)\s*```", text, re.DOTALL)
-            if match:
-                return match.group(1).strip()
-        except Exception:
-            pass
-
-    # 2. Try to find the first { and last }
-    first_brace = text.find("{")
-    last_brace = text.rfind("}")
-    if first_brace != -1 and last_brace != -1 and last_brace > first_brace:
-        return text[first_brace:last_brace+1].strip()
-
-    return text.strip()
-
-
 def refine_resume(
     message: str,
     current_latex: str,
@@ -89,25 +67,26 @@ def refine_resume(
         system_prompt=system_prompt,
         messages=messages,
         temperature=0.3,
+        response_format=response_format("refine_reply", RefineReply),
     )
 
     # Parse the response
     try:
-        cleaned_response = clean_llm_json(response)
-        data = json.loads(cleaned_response)
-        reply = data.get("reply", response)
-        updated_latex = data.get("updated_latex")
-        changes_made = data.get("changes_made", False)
-    except Exception:
+        data = parse_model(response, RefineReply)
+    except StructuredOutputError:
         # If response isn't JSON, treat it as a plain text reply
         return response, None, True, []
+    reply = data.reply
+    updated_latex = data.updated_latex
+    changes_made = data.changes_made
 
     # If changes were made, validate the updated content
     validation_errors = []
     validation_passed = True
 
     if updated_latex and changes_made:
-        is_valid, violations = validate_resume(updated_latex, authorized_skills, strict=True)
+        # Sections unchanged since earlier turns reuse their cached extraction
+        is_valid, violations = validate_resume_incremental(updated_latex, authorized_skills, strict=True)
         if not is_valid:
             validation_passed = False
             validation_errors = violations
@@ -0,0 +1,414 @@
+"""
+Compile Queue Service.
+Compiles generated resumes in the background so requests return as soon as the
+LaTeX is validated and stored. The queue is persisted through
+GeneratedResume.compile_status: jobs still pending or compiling when the process
+stops are picked up again on startup. Infrastructure failures are retried with
+exponential backoff; a document that compiles without producing a PDF fails
+immediately, since rerunning it would give the same result. Jobs are served
+interactive first, and new work is refused once LATEX_COMPILE_BACKLOG_LIMIT
+jobs are waiting.
+
+Edits to an existing resume (chat refinements, regenerated sections) compile
+lazily: the resume is marked stale, and compiles only when its PDF is
+requested or once editing has been idle for LATEX_IDLE_COMPILE_SECONDS. Every
+edit pushes the idle timer back, so a burst of refinements costs one compile
+of the latest version.
+"""
+import time
+import queue
+import asyncio
+import logging
+import itertools
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models.generated_resume import GeneratedResume
+from app.schemas.schemas import CompileReport
+from app.services.latex_compiler import (
+    compile_document, get_compile_pool, CompileQueueFull, PRIORITY_BATCH, PRIORITY_INTERACTIVE,
+)
+
+logger = logging.getLogger(__name__)
+
+COMPILE_PENDING = "pending"
+COMPILE_RUNNING = "compiling"
+COMPILE_READY = "ready"
+COMPILE_FAILED = "failed"
+COMPILE_STALE = "stale"  # LaTeX changed since the PDF; compiled on demand or when editing goes idle
+
+ACTIVE_STATUSES = (COMPILE_PENDING, COMPILE_RUNNING)
+TERMINAL_STATUSES = (COMPILE_READY, COMPILE_FAILED)
+UPCOMING_STATUSES = ACTIVE_STATUSES + (COMPILE_STALE,)  # A new PDF is on its way without further requests
+
+_jobs: "queue.PriorityQueue[Tuple[int, int, str]]" = queue.PriorityQueue()
+_arrivals = itertools.count()
+_workers: List[threading.Thread] = []
+_workers_lock = threading.Lock()
+
+# Latest status event per resume, versioned so waiters can tell a new event from an old one
+_events: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+_events_cond = threading.Condition()
+# Event-stream subscribers waiting on an event loop, woken when their resume publishes
+_subscribers: Dict[str, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]]] = {}
+
+# Pending idle compiles of stale resumes, restarted by every edit
+_idle_timers: Dict[str, threading.Timer] = {}
+_idle_lock = threading.Lock()
+
+
+def mark_pending(resume: GeneratedResume) -> None:
+    """Queue a resume for compilation; call `enqueue_compile` once it is committed."""
+    resume.compile_status = COMPILE_PENDING
+    resume.compile_attempts = 0
+    resume.compile_error = None
+    resume.pdf_path = None
+    resume.compile_report = None
+
+
+def mark_stale(resume: GeneratedResume) -> None:
+    """
+    Record that the LaTeX changed without compiling it. The previous PDF and report
+    stay until a compile replaces them; a queued or running compile of the old
+    LaTeX is discarded. Publish the change with `publish_status` once committed.
+    """
+    resume.compile_status = COMPILE_STALE
+    resume.compile_attempts = 0
+    resume.compile_error = None
+
+
+def publish_status(resume: GeneratedResume) -> None:
+    """Tell event stream subscribers about a status change made outside the queue."""
+    _publish(resume)
+
+
+def schedule_idle_compile(resume_id: str) -> None:
+    """(Re)start the resume's idle timer; when it fires the latest LaTeX is compiled."""
+    delay = settings.LATEX_IDLE_COMPILE_SECONDS
+    if delay <= 0:
+        return  # Compile only when the PDF is requested
+    with _idle_lock:
+        previous = _idle_timers.get(resume_id)
+        if previous is not None:
+            previous.cancel()
+        timer = threading.Timer(delay, _compile_when_idle, args=(resume_id,))
+        timer.daemon = True
+        _idle_timers[resume_id] = timer
+        timer.start()
+
+
+def _cancel_idle_compile(resume_id: str) -> None:
+    with _idle_lock:
+        timer = _idle_timers.pop(resume_id, None)
+    if timer is not None and timer is not threading.current_thread():
+        timer.cancel()
+
+
+def _compile_when_idle(resume_id: str) -> None:
+    with _idle_lock:
+        if _idle_timers.get(resume_id) is not threading.current_thread():
+            return  # Pushed back by a later edit
+    try:
+        request_compile(resume_id, priority=PRIORITY_BATCH)
+    except Exception as e:
+        logger.error(f"Idle compile of resume {resume_id} could not be queued: {e}")
+
+
+def request_compile(
+    resume_id: str,
+    db: Optional[Session] = None,
+    priority: int = PRIORITY_INTERACTIVE,
+) -> Optional[str]:
+    """
+    Queue the compile of a stale resume now. Returns the resume's compile status
+    afterwards, or None if it no longer exists. The status flips from stale in a
+    single UPDATE, so a download racing the idle timer queues one compile.
+    """
+    _cancel_idle_compile(resume_id)
+    own_session = db is None
+    db = db or SessionLocal()
+    try:
+        claimed = db.query(GeneratedResume).filter(
+            GeneratedResume.id == resume_id,
+            GeneratedResume.compile_status == COMPILE_STALE,
+        ).update({
+            GeneratedResume.compile_status: COMPILE_PENDING,
+            GeneratedResume.compile_attempts: 0,
+            GeneratedResume.compile_error: None,
+        }, synchronize_session=False)
+        db.commit()
+        resume = db.query(GeneratedResume).filter(GeneratedResume.id == resume_id).first()
+        if resume is None:
+            return None
+        db.refresh(resume)
+        if claimed:
+            _publish(resume)
+            enqueue_compile(resume_id, priority)
+        return resume.compile_status
+    finally:
+        if own_session:
+            db.close()
+
+
+def compile_on_demand(resume_id: str, db: Session, timeout: float) -> Optional[str]:
+    """
+    Compile a stale resume whose PDF was just requested, waiting up to `timeout`
+    seconds for the result. Returns the status it reached, which is still
+    pending or compiling if the wait timed out.
+    """
+    seen = event_version(resume_id)
+    status = request_compile(resume_id, db)
+    deadline = time.monotonic() + timeout
+    while status in ACTIVE_STATUSES:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        update = wait_for_event(resume_id, seen, remaining)
+        if update is None:
+            break
+        seen, event = update
+        status = event["status"]
+    return status
+
+
+def enqueue_compile(resume_id: str, priority: int = PRIORITY_INTERACTIVE) -> None:
+    _ensure_workers()
+    _jobs.put((priority, next(_arrivals), resume_id))
+
+
+def backlog() -> int:
+    """Jobs waiting to be picked up by a queue worker."""
+    return _jobs.qsize()
+
+
+def ensure_capacity() -> None:
+    """
+    Refuse new compile work while the backlog is full, so callers can answer 503
+    before spending anything on a resume that would wait too long for its PDF.
+    """
+    depth = backlog()
+    if depth >= settings.LATEX_COMPILE_BACKLOG_LIMIT:
+        raise CompileQueueFull(get_compile_pool().retry_after(depth))
+
+
+def _ensure_workers() -> None:
+    with _workers_lock:
+        _workers[:] = [t for t in _workers if t.is_alive()]
+        for index in range(len(_workers), max(1, settings.LATEX_WORKERS)):
+            worker = threading.Thread(target=_work, name=f"compile-queue-{index}", daemon=True)
+            worker.start()
+            _workers.append(worker)
+
+
+def _work() -> None:
+    while True:
+        priority, _, resume_id = _jobs.get()
+        try:
+            run_compile_job(resume_id, priority=priority)
+        except Exception as e:
+            logger.error(f"Compile job for resume {resume_id} crashed: {e}")
+        finally:
+            _jobs.task_done()
+
+
+def _retry_later(resume_id: str, delay: float, priority: int) -> None:
+    timer = threading.Timer(delay, enqueue_compile, args=(resume_id, priority))
+    timer.daemon = True
+    timer.start()
+
+
+def status_event(resume: GeneratedResume) -> Dict[str, Any]:
+    return {
+        "resume_id": resume.id,
+        "status": resume.compile_status,
+        "attempts": resume.compile_attempts or 0,
+        "pdf_ready": resume.compile_status == COMPILE_READY and bool(resume.pdf_path) and resume.pdf_path.endswith(".pdf"),
+        "error": resume.compile_error,
+    }
+
+
+def _publish(resume: GeneratedResume) -> None:
+    with _events_cond:
+        version = _events.get(resume.id, (0, {}))[0] + 1
+        _events[resume.id] = (version, status_event(resume))
+        _events_cond.notify_all()
+        for loop, wakeup in _subscribers.get(resume.id, ()):
+            try:
+                loop.call_soon_threadsafe(wakeup.set)
+            except RuntimeError:
+                pass  # Its loop has closed; the subscriber is gone
+
+
+def event_version(resume_id: str) -> int:
+    with _events_cond:
+        return _events.get(resume_id, (0, {}))[0]
+
+
+def wait_for_event(resume_id: str, seen: int, timeout: float) -> Optional[Tuple[int, Dict[str, Any]]]:
+    """Block until a status event newer than `seen` is published, or return None on timeout."""
+    with _events_cond:
+        if not _events_cond.wait_for(lambda: _events.get(resume_id, (0, {}))[0] > seen, timeout=timeout):
+            return None
+        return _events[resume_id]
+
+
+async def next_event(resume_id: str, seen: int, timeout: float) -> Optional[Tuple[int, Dict[str, Any]]]:
+    """`wait_for_event` for the event loop: waits without holding a worker thread."""
+    subscriber = (asyncio.get_running_loop(), asyncio.Event())
+    with _events_cond:
+        latest = _events.get(resume_id, (0, {}))
+        if latest[0] > seen:
+            return latest
+        _subscribers.setdefault(resume_id, set()).add(subscriber)
+    try:
+        await asyncio.wait_for(subscriber[1].wait(), timeout)
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        with _events_cond:
+            waiting = _subscribers.get(resume_id)
+            if waiting is not None:
+                waiting.discard(subscriber)
+                if not waiting:
+                    del _subscribers[resume_id]
+    with _events_cond:
+        latest = _events.get(resume_id, (0, {}))
+        return latest if latest[0] > seen else None
+
+
+def _write_job(
+    db: Session,
+    resume_id: str,
+    source: str,
+    attempts: int,
+    statuses: Tuple[str, ...],
+    values: Dict[Any, Any],
+) -> bool:
+    """
+    Write a compile job's state in one conditional UPDATE, applied only while the row
+    still holds the LaTeX the job compiles, in one of `statuses`, at attempt number
+    `attempts`. False means the job was superseded: the resume was edited, re-queued
+    or claimed by another worker meanwhile, and that change wins.
+    """
+    updated = db.query(GeneratedResume).filter(
+        GeneratedResume.id == resume_id,
+        GeneratedResume.latex_output == source,
+        GeneratedResume.compile_status.in_(statuses),
+        func.coalesce(GeneratedResume.compile_attempts, 0) == attempts,
+    ).update(values, synchronize_session=False)
+    db.commit()
+    return bool(updated)
+
+
+def run_compile_job(
+    resume_id: str,
+    db: Optional[Session] = None,
+    priority: int = PRIORITY_INTERACTIVE,
+) -> Optional[str]:
+    """
+    Compile one queued resume and record the outcome. Returns the final status,
+    or None when the job no longer applies (resume deleted, already compiled,
+    or superseded by an edit or another worker).
+    """
+    own_session = db is None
+    db = db or SessionLocal()
+    try:
+        resume = db.query(GeneratedResume).filter(GeneratedResume.id == resume_id).first()
+        if resume is None or resume.compile_status != COMPILE_PENDING:
+            return None
+        latex_output = resume.latex_output
+        attempt = (resume.compile_attempts or 0) + 1
+        running = (COMPILE_RUNNING,)
+
+        def write(values: Dict[Any, Any]) -> bool:
+            if not _write_job(db, resume_id, latex_output, attempt, running, values):
+                return False
+            db.refresh(resume)
+            _publish(resume)
+            return True
+
+        # Claim the job: of two workers reading the same pending row, only one UPDATE matches
+        if not _write_job(db, resume_id, latex_output, attempt - 1, (COMPILE_PENDING,), {
+            GeneratedResume.compile_status: COMPILE_RUNNING,
+            GeneratedResume.compile_attempts: attempt,
+        }):
+            return None
+        db.refresh(resume)
+        _publish(resume)
+
+        try:
+            result = compile_document(latex_output, priority)
+        except CompileQueueFull as e:
+            # Overload is not the document's fault; wait it out without using an attempt
+            if not write({
+                GeneratedResume.compile_status: COMPILE_PENDING,
+                GeneratedResume.compile_attempts: attempt - 1,
+            }):
+                return None
+            _retry_later(resume_id, e.retry_after, priority)
+            return COMPILE_PENDING
+        except Exception as e:
+            if attempt <= settings.LATEX_COMPILE_RETRIES:
+                logger.warning(f"Compile of resume {resume_id} failed (attempt {attempt}): {e}; retrying")
+                if not write({
+                    GeneratedResume.compile_status: COMPILE_PENDING,
+                    GeneratedResume.compile_error: str(e),
+                }):
+                    return None
+                delay = settings.LATEX_COMPILE_RETRY_BACKOFF_SECONDS * (2 ** (attempt - 1))
+                _retry_later(resume_id, delay, priority)
+                return COMPILE_PENDING
+            logger.error(f"Compile of resume {resume_id} failed after {attempt} attempts: {e}")
+            if not write({
+                GeneratedResume.compile_status: COMPILE_FAILED,
+                GeneratedResume.compile_error: str(e),
+            }):
+                return None
+            return COMPILE_FAILED
+
+        status = COMPILE_READY if result.succeeded else COMPILE_FAILED
+        if not write({
+            GeneratedResume.pdf_path: result.path,
+            GeneratedResume.compile_report: result.report.model_dump_json() if result.report else None,
+            GeneratedResume.compile_status: status,
+            GeneratedResume.compile_error: None if result.succeeded else _failure_message(result.report),
+        }):
+            return None  # Edited meanwhile; the edit queued its own job
+        return status
+    finally:
+        if own_session:
+            db.close()
+
+
+def _failure_message(report: Optional[CompileReport]) -> str:
+    if report and report.runs == 0 and report.errors:
+        error = report.errors[0]
+        where = f" (line {error.line})" if error.line else ""
+        return f"LaTeX preflight failed: {error.message}{where}"
+    return "LaTeX compilation produced no PDF"
+
+
+def recover_pending_jobs() -> int:
+    """
+    Re-queue jobs left pending or mid-compile by a previous process. Interrupted
+    compiles go back to pending first, since workers only claim pending jobs.
+    """
+    db = SessionLocal()
+    try:
+        db.query(GeneratedResume).filter(GeneratedResume.compile_status == COMPILE_RUNNING).update(
+            {GeneratedResume.compile_status: COMPILE_PENDING}, synchronize_session=False,
+        )
+        db.commit()
+        rows = db.query(GeneratedResume.id).filter(
+            GeneratedResume.compile_status.in_(ACTIVE_STATUSES)
+        ).all()
+    finally:
+        db.close()
+    for (resume_id,) in rows:
+        enqueue_compile(resume_id)
+    if rows:
+        logger.info(f"Re-queued {len(rows)} unfinished compile jobs")
+    return len(rows)
@@ -0,0 +1,170 @@
+"""
+Guardrail Telemetry Service.
+Records every validation attempt (section, violations, latency) and aggregates
+retry causes so the validator can be tuned and wasted LLM calls reduced.
+"""
+import re
+import logging
+from typing import List, Optional
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from app.models.guardrail_attempt import GuardrailAttempt
+from app.models.guardrail_violation import GuardrailViolation
+from app.schemas.schemas import GuardrailStats, TermViolationCount, TemplateRetryStats
+from app.services.guardrail_validator import _normalize
+from app.services.llm_client import LLMUsage
+
+logger = logging.getLogger(__name__)
+
+# Alphanumeric neighbours mean a term sits inside a longer word ("go" in "good")
+_WORD_BOUNDARY = r"(?<![a-z0-9]){}(?![a-z0-9])"
+
+
+def _mentions(normalized_content: str, term: str) -> bool:
+    """Whether a term appears in normalized content as a whole word or phrase."""
+    normalized_term = _normalize(term)
+    if not normalized_term:
+        return False
+    return re.search(_WORD_BOUNDARY.format(re.escape(normalized_term)), normalized_content) is not None
+
+
+def record_attempt(
+    db: Session,
+    generation_id: str,
+    user_id: str,
+    source: str,
+    attempt_number: int,
+    passed: bool,
+    violations: Optional[List[str]] = None,
+    section: Optional[str] = None,
+    template_id: Optional[str] = None,
+    resume_id: Optional[str] = None,
+    latency_ms: Optional[float] = None,
+    error: Optional[str] = None,
+    usage: Optional[LLMUsage] = None,
+) -> GuardrailAttempt:
+    """
+    Add one guardrail attempt (and its violations) to the session.
+    The caller commits, together with the resume it is generating.
+    """
+    attempt = GuardrailAttempt(
+        generation_id=generation_id,
+        user_id=user_id,
+        template_id=template_id,
+        resume_id=resume_id,
+        source=source,
+        attempt_number=attempt_number,
+        section=section,
+        passed=passed,
+        error=error[:1000] if error else None,
+        latency_ms=round(latency_ms, 1) if latency_ms is not None else None,
+        prompt_tokens=usage.prompt_tokens if usage else None,
+        cached_tokens=usage.cached_tokens if usage else None,
+    )
+    attempt.violations = [GuardrailViolation(term=term[:255]) for term in (violations or [])]
+    db.add(attempt)
+    return attempt
+
+
+def finalize_generation(
+    db: Session,
+    generation_id: str,
+    resume_id: Optional[str],
+    accepted_content: str,
+) -> None:
+    """
+    Link a generation's attempts to the stored resume and flag violations whose
+    term still appears in the accepted content (a likely validator false positive).
+    """
+    attempts = db.query(GuardrailAttempt).filter(GuardrailAttempt.generation_id == generation_id).all()
+    normalized_content = _normalize(accepted_content)
+    for attempt in attempts:
+        attempt.resume_id = resume_id
+        for violation in attempt.violations:
+            violation.accepted = _mentions(normalized_content, violation.term)
+
+
+def get_guardrail_stats(db: Session, limit: int = 20) -> GuardrailStats:
+    """Aggregate attempt history into retry, exhaustion and top-violation counters, in SQL."""
+    # Per generation: template, distinct attempt numbers, and how many of them had a failing row
+    generations = db.query(
+        GuardrailAttempt.generation_id,
+        func.max(GuardrailAttempt.template_id).label("template_id"),
+        func.count(func.distinct(GuardrailAttempt.attempt_number)).label("attempts"),
+        func.count(func.distinct(
+            case((GuardrailAttempt.passed.is_(False), GuardrailAttempt.attempt_number))
+        )).label("failed"),
+    ).filter(GuardrailAttempt.source == "generate").group_by(GuardrailAttempt.generation_id).subquery()
+    retried = case((generations.c.attempts > 1, 1), else_=0)
+    # A generation is exhausted when every one of its attempts had a failing row
+    exhausted = case((generations.c.attempts == generations.c.failed, 1), else_=0)
+
+    total_generations, total_attempts, retried_count, exhausted_count = db.query(
+        func.count(generations.c.generation_id),
+        func.coalesce(func.sum(generations.c.attempts), 0),
+        func.coalesce(func.sum(retried), 0),
+        func.coalesce(func.sum(exhausted), 0),
+    ).one()
+
+    by_template = db.query(
+        generations.c.template_id,
+        func.count(generations.c.generation_id),
+        func.sum(retried),
+    ).group_by(generations.c.template_id).all()
+
+    # Section rows of one attempt share its latency, so count each attempt once
+    attempt_latency = db.query(
+        GuardrailAttempt.attempt_number,
+        func.max(GuardrailAttempt.latency_ms).label("latency_ms"),
+    ).filter(
+        GuardrailAttempt.source == "generate", GuardrailAttempt.latency_ms.isnot(None),
+    ).group_by(GuardrailAttempt.generation_id, GuardrailAttempt.attempt_number).subquery()
+    avg_latency, retry_latency = db.query(
+        func.avg(attempt_latency.c.latency_ms),
+        func.sum(case((attempt_latency.c.attempt_number > 1, attempt_latency.c.latency_ms), else_=0)),
+    ).one()
+
+    # Token usage across every source; section rows of one attempt share its usage too
+    attempt_usage = db.query(
+        func.max(GuardrailAttempt.prompt_tokens).label("prompt_tokens"),
+        func.max(func.coalesce(GuardrailAttempt.cached_tokens, 0)).label("cached_tokens"),
+    ).filter(GuardrailAttempt.prompt_tokens.isnot(None)).group_by(
+        GuardrailAttempt.generation_id, GuardrailAttempt.source, GuardrailAttempt.attempt_number,
+    ).subquery()
+    prompt_tokens, cached_tokens = db.query(
+        func.coalesce(func.sum(attempt_usage.c.prompt_tokens), 0),
+        func.coalesce(func.sum(attempt_usage.c.cached_tokens), 0),
+    ).one()
+
+    top_terms = db.query(
+        GuardrailViolation.term,
+        func.count(GuardrailViolation.id),
+        func.sum(case((GuardrailViolation.accepted.is_(True), 1), else_=0)),
+    ).group_by(GuardrailViolation.term).order_by(func.count(GuardrailViolation.id).desc()).limit(limit).all()
+
+    return GuardrailStats(
+        total_generations=total_generations,
+        total_attempts=int(total_attempts),
+        retry_rate=round(int(retried_count) / total_generations, 3) if total_generations else 0.0,
+        exhausted_generations=int(exhausted_count),
+        exhaustion_rate=round(int(exhausted_count) / total_generations, 3) if total_generations else 0.0,
+        avg_attempt_latency_ms=round(float(avg_latency), 1) if avg_latency is not None else 0.0,
+        total_retry_latency_ms=round(float(retry_latency or 0), 1),
+        total_prompt_tokens=int(prompt_tokens),
+        total_cached_tokens=int(cached_tokens),
+        prompt_cache_hit_rate=round(int(cached_tokens) / int(prompt_tokens), 3) if prompt_tokens else 0.0,
+        top_violating_terms=[
+            TermViolationCount(term=term, count=count, accepted_count=int(accepted or 0))
+            for term, count, accepted in top_terms
+        ],
+        retry_rate_by_template=[
+            TemplateRetryStats(
+                template_id=template_id,
+                generations=count,
+                retried=int(retried_generations or 0),
+                retry_rate=round(int(retried_generations or 0) / count, 3),
+            )
+            for template_id, count, retried_generations in by_template
+        ],
+    )
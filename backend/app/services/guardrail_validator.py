@@ -5,7 +5,10 @@ This is the final line of defense against AI hallucination.
 """
 import re
 import logging
-from typing import List, Tuple, Set
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Tuple, Set
+from app.services.latex_lexer import iter_text_runs, split_sections
 
 logger = logging.getLogger(__name__)
 
@@ -15,47 +18,67 @@ def _normalize(skill: str) -> str:
     return skill.lower().strip().replace("-", " ").replace("_", " ").replace(".", "").replace(",", "")
 
 
+# Pattern: "Skills: Python, Java, React" or "Technologies: ..."
+_SKILL_LINE_PATTERN = re.compile(
+    r'(?:skills?|technologies?|tools?|frameworks?|languages?|platforms?)\s*[:\-|]\s*([^\n]+)',
+    re.IGNORECASE
+)
+_LIST_DELIMITERS = re.compile(r'[,;|/]')
+_ITEM_DELIMITERS = re.compile(r'[,;|]')
+
+
 def _extract_technologies_from_latex(latex_content: str) -> Set[str]:
     """
     Extract technology/skill mentions from LaTeX content.
-    Uses multiple strategies to catch different formatting patterns.
+    Uses multiple strategies to catch different formatting patterns, all fed
+    from a single lexer pass over the document.
     """
-    extracted = set()
+    lines: Dict[int, List[str]] = defaultdict(list)
+    items: Dict[int, List[str]] = defaultdict(list)
+    bold: Dict[int, List[str]] = defaultdict(list)
 
-    # Remove LaTeX commands but keep their text content
-    clean = re.sub(r'\\[a-zA-Z]+\{([^}]*)\}', r'\1', latex_content)
-    clean = re.sub(r'\\[a-zA-Z]+', ' ', clean)
-    clean = re.sub(r'[{}\\%$&~^]', ' ', clean)
+    for run in iter_text_runs(latex_content):
+        lines[run.line].append(run.text)
+        if run.item is not None:
+            items[run.item].append(run.text)
+        for name, group_id in run.groups:
+            if name == "textbf":
+                bold[group_id].append(run.text)
 
-    # Strategy 1: Extract from common skill listing patterns
-    # Pattern: "Skills: Python, Java, React" or "Technologies: ..."
-    skill_section_pattern = re.compile(
-        r'(?:skills?|technologies?|tools?|frameworks?|languages?|platforms?)\s*[:\-|]\s*([^\n]+)',
-        re.IGNORECASE
+    return _extract_from_runs(
+        ["".join(parts) for parts in lines.values()],
+        ["".join(parts) for parts in items.values()],
+        ["".join(parts) for parts in bold.values()],
     )
-    for match in skill_section_pattern.findall(clean):
-        items = re.split(r'[,;|/]', match)
-        for item in items:
-            cleaned = item.strip()
-            if cleaned and len(cleaned) > 1 and len(cleaned) < 50:
-                extracted.add(_normalize(cleaned))
+
+
+def _extract_from_runs(lines: List[str], items: List[str], bold: List[str]) -> Set[str]:
+    """Apply the extraction strategies to pre-assembled lines, items and bold terms."""
+    extracted = set()
+
+    # Strategy 1: Extract from common skill listing patterns
+    for line in lines:
+        for match in _SKILL_LINE_PATTERN.findall(line):
+            for item in _LIST_DELIMITERS.split(match):
+                cleaned = item.strip()
+                if cleaned and len(cleaned) > 1 and len(cleaned) < 50:
+                    extracted.add(_normalize(cleaned))
 
     # Strategy 2: Extract from itemized lists
-    item_pattern = re.compile(r'\\?item\s+(.+?)(?:\n|$)')
-    for match in item_pattern.findall(latex_content):
-        clean_match = re.sub(r'\\[a-zA-Z]+\{([^}]*)\}', r'\1', match)
-        clean_match = re.sub(r'[{}\\]', '', clean_match).strip()
-        if clean_match and len(clean_match) < 50:
+    for item in items:
+        clean_item = item.strip()
+        if clean_item and len(clean_item) < 50:
             # Split by common delimiters
-            for part in re.split(r'[,;|]', clean_match):
+            for part in _ITEM_DELIMITERS.split(clean_item):
                 part = part.strip()
                 if part and len(part) > 1:
                     extracted.add(_normalize(part))
 
     # Strategy 3: Extract bold/emphasized terms (often skills)
-    bold_pattern = re.compile(r'\\textbf\{([^}]+)\}')
-    for match in bold_pattern.findall(latex_content):
-        extracted.add(_normalize(match))
+    for term in bold:
+        term = term.strip()
+        if term:
+            extracted.add(_normalize(term))
 
     return extracted
 
@@ -83,22 +106,8 @@ _COMMON_WORDS = {
 }
 
 
-def validate_resume(
-    generated_latex: str,
-    authorized_terms: List[str],
-    strict: bool = True,
-) -> Tuple[bool, List[str]]:
-    """
-    Validate that generated resume content only contains authorized professional entities.
-
-    Args:
-        generated_latex: The generated LaTeX resume content
-        authorized_terms: List of all skills, project titles, and company names from user's database
-        strict: If True, reject on ANY unauthorized skill
-    """
-    extracted = _extract_technologies_from_latex(generated_latex)
-    normalized_auth_terms = {_normalize(s) for s in authorized_terms}
-
+def _find_violations(extracted: Set[str], normalized_auth_terms: Set[str]) -> List[str]:
+    """Return the extracted terms that are not covered by the authorized set."""
     violations = []
 
     for tech in extracted:
@@ -133,6 +142,119 @@ def validate_resume(
         if not is_authorized:
             violations.append(tech)
 
+    return violations
+
+
+def validate_resume(
+    generated_latex: str,
+    authorized_terms: List[str],
+    strict: bool = True,
+) -> Tuple[bool, List[str]]:
+    """
+    Validate that generated resume content only contains authorized professional entities.
+
+    Args:
+        generated_latex: The generated LaTeX resume content
+        authorized_terms: List of all skills, project titles, and company names from user's database
+        strict: If True, reject on ANY unauthorized skill
+    """
+    extracted = _extract_technologies_from_latex(generated_latex)
+    normalized_auth_terms = {_normalize(s) for s in authorized_terms}
+
+    violations = _find_violations(extracted, normalized_auth_terms)
+
+    is_valid = len(violations) == 0 if strict else len(violations) <= 3
+
+    if violations:
+        logger.warning(f"Guardrail validation found {len(violations)} violations: {violations}")
+
+    return is_valid, violations
+
+
+def validate_sections(
+    sections: Dict[str, str],
+    authorized_terms: List[str],
+    strict: bool = True,
+) -> Dict[str, List[str]]:
+    """
+    Validate each generated section on its own, before it is placed in a template.
+
+    Args:
+        sections: Mapping of section name to generated LaTeX content
+        authorized_terms: List of all skills, project titles, and company names from user's database
+        strict: If True, reject a section on ANY unauthorized skill
+
+    Returns:
+        Mapping of failing section name to its violations (empty if all sections pass)
+    """
+    normalized_auth_terms = {_normalize(s) for s in authorized_terms}
+
+    failures = {}
+    for name, latex in sections.items():
+        violations = _find_violations(_extract_technologies_from_latex(latex or ""), normalized_auth_terms)
+        is_valid = len(violations) == 0 if strict else len(violations) <= 3
+        if not is_valid:
+            failures[name] = violations
+
+    if failures:
+        logger.warning(f"Guardrail validation failed for sections {sorted(failures)}: {failures}")
+
+    return failures
+
+
+_ITEM_START = re.compile(r"\\item\b")
+_ITEM_END = re.compile(r"\\item\b|\\end\{")
+
+
+def completed_prefix(partial_latex: str) -> str:
+    """
+    Longest prefix of a partially generated section made of complete lines and list items.
+    Extraction works per line, item and bold group, so any violation found in this
+    prefix is one the finished section would have too.
+    """
+    line_end = partial_latex.rfind("\\\\")
+    cut = max(partial_latex.rfind("\n") + 1, line_end + 2 if line_end != -1 else 0)
+    items = list(_ITEM_START.finditer(partial_latex, 0, cut))
+    if items:
+        # The last item is complete once the next \item or \end follows it within the cut
+        end = _ITEM_END.search(partial_latex, items[-1].end())
+        if end is None or partial_latex[cut:end.start()].strip():
+            cut = items[-1].start()
+    return partial_latex[:cut]
+
+
+@lru_cache(maxsize=2048)
+def _extract_section(section_latex: str) -> FrozenSet[str]:
+    """Cached extraction for one section chunk, shared across chat turns."""
+    return frozenset(_extract_technologies_from_latex(section_latex))
+
+
+def validate_resume_incremental(
+    updated_latex: str,
+    authorized_terms: List[str],
+    strict: bool = True,
+) -> Tuple[bool, List[str]]:
+    """
+    Validate a resume section by section, reusing cached extraction.
+
+    Every section is checked against the current authorized terms, since a term may
+    have been removed from the profile since the section was last accepted. Sections
+    unchanged since an earlier chat turn hit the extraction cache, so a turn that
+    rewords one bullet only extracts that section again.
+
+    Args:
+        updated_latex: The new LaTeX resume content
+        authorized_terms: List of all skills, project titles, and company names from user's database
+        strict: If True, reject on ANY unauthorized skill
+    """
+    normalized_auth_terms = {_normalize(s) for s in authorized_terms}
+
+    violations = []
+    for section in split_sections(updated_latex):
+        for term in _find_violations(_extract_section(section), normalized_auth_terms):
+            if term not in violations:
+                violations.append(term)
+
     is_valid = len(violations) == 0 if strict else len(violations) <= 3
 
     if violations:
@@ -2,10 +2,9 @@
 JD (Job Description) Analyzer Service.
 Extracts structured information from job descriptions using LLM.
 """
-import json
 import logging
-from typing import Dict, Any
 from app.services.llm_client import call_llm
+from app.services.structured_output import loads, response_format, StructuredOutputError
 from app.schemas.schemas import JDAnalysis
 
 logger = logging.getLogger(__name__)
@@ -46,11 +45,11 @@ def analyze_job_description(job_description: str) -> JDAnalysis:
         system_prompt=JD_ANALYSIS_PROMPT,
         user_prompt=f"Analyze this job description:\n\n{job_description}",
         temperature=0.1,
-        response_format={"type": "json_object"},
+        response_format=response_format("jd_analysis", JDAnalysis),
     )
 
     try:
-        data = json.loads(response)
+        data = loads(response)
         return JDAnalysis(
             required_skills=[s.lower().strip() for s in data.get("required_skills", [])],
             preferred_skills=[s.lower().strip() for s in data.get("preferred_skills", [])],
@@ -58,6 +57,6 @@ def analyze_job_description(job_description: str) -> JDAnalysis:
             domain=data.get("domain", "General"),
             seniority=data.get("seniority", "Mid-Level"),
         )
-    except (json.JSONDecodeError, KeyError) as e:
+    except (StructuredOutputError, AttributeError) as e:
         logger.error(f"Failed to parse JD analysis response: {e}")
         raise ValueError(f"Failed to analyze job description: {e}")
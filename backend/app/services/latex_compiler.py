@@ -2,131 +2,610 @@
 LaTeX Compiler Service.
 Compiles LaTeX to PDF using Docker sandbox or local pdflatex.
 Shell escape is ALWAYS disabled for security.
+
+Compiles run on a bounded pool of warm workers. Each worker owns a long-lived
+shell (inside the sandbox container, or local), so a pass costs one pdflatex
+start instead of a `docker info` probe plus a `docker exec` or process spawn
+per pass. Every job compiles in a fresh scratch directory, on tmpfs when the
+host has one, and only the finished PDF leaves it; the directory is removed
+when the job ends.
 """
 import os
+import math
+import time
 import uuid
-import subprocess
-import logging
-import tempfile
+import heapq
+import queue
+import itertools
+import shlex
 import shutil
+import logging
+import threading
+import posixpath
+import subprocess
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, List, Optional, Tuple
 from app.config import settings
+from app.schemas.schemas import CompileJobTiming, CompilePoolStats, CompileReport
+from app.services import latex_formats, latex_log, latex_preflight, pdf_cache
 
 logger = logging.getLogger(__name__)
 
+# Timing history kept for the admin stats endpoint
+_RECENT_JOBS = 100
+
+# Extra time allowed for a pass beyond the in-shell `timeout` before the session is killed
+_SESSION_GRACE_SECONDS = 5
+
+# Memory-backed filesystem for scratch directories, when the host has one
+_TMPFS = "/dev/shm"
+
+
+@dataclass
+class CompileTiming:
+    job_id: str
+    worker: int
+    backend: str  # "docker", "local" or "none" when no PDF was produced
+    priority: int
+    queue_wait_ms: float
+    compile_ms: float
+    runs: int
+    succeeded: bool
+
+
+# Admission priorities; lower values are served first
+PRIORITY_INTERACTIVE = 0  # A user is waiting on this PDF
+PRIORITY_BATCH = 1  # Re-renders and other bulk work
+
+PRIORITY_NAMES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_BATCH: "batch"}
+
+
+class CompileQueueFull(RuntimeError):
+    """Too many compiles are already waiting; retry after `retry_after` seconds."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__(f"LaTeX compile queue is full; retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+@dataclass
+class CompileResult:
+    path: Optional[str]  # The PDF (an artifact key once stored), or None when no PDF could be produced
+    report: Optional[CompileReport] = None
+
+    @property
+    def succeeded(self) -> bool:
+        return bool(self.path) and self.path.endswith(".pdf")
+
+
+class _SandboxProbe:
+    """Caches whether the sandbox container is running, for LATEX_SANDBOX_PROBE_TTL_SECONDS."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._available: Optional[bool] = None
+        self._checked_at = 0.0
+
+    @property
+    def cached(self) -> Optional[bool]:
+        return self._available
+
+    def available(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            if self._available is None or now - self._checked_at >= settings.LATEX_SANDBOX_PROBE_TTL_SECONDS:
+                self._available = self._probe()
+                self._checked_at = now
+            return self._available
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._available = False
+            self._checked_at = time.monotonic()
+
+    @staticmethod
+    def _probe() -> bool:
+        try:
+            result = subprocess.run(
+                ["docker", "inspect", "-f", "{{.State.Running}}", settings.LATEX_SANDBOX_CONTAINER],
+                capture_output=True, text=True, timeout=5,
+            )
+        except (subprocess.TimeoutExpired, FileNotFoundError) as e:
+            logger.info(f"Docker sandbox unavailable: {e}. Will use local pdflatex.")
+            return False
+        return result.returncode == 0 and result.stdout.strip() == "true"
+
+
+_sandbox = _SandboxProbe()
+
+
+class _ShellSession:
+    """A long-lived shell that runs compile commands without a process spawn per pass."""
+
+    def __init__(self, argv: List[str]) -> None:
+        self.argv = argv
+        self._proc: Optional[subprocess.Popen] = None
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue()
+
+    def _start(self) -> None:
+        self._proc = subprocess.Popen(
+            self.argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+        )
+        self._lines = queue.Queue()
+        threading.Thread(target=self._pump, args=(self._proc, self._lines), daemon=True).start()
+
+    @staticmethod
+    def _pump(proc: subprocess.Popen, lines: "queue.Queue[Optional[str]]") -> None:
+        for line in proc.stdout:
+            lines.put(line)
+        lines.put(None)
+
+    def run(self, command: str, timeout: float) -> int:
+        """Run one shell command and return its exit status."""
+        if self._proc is None or self._proc.poll() is not None:
+            self._start()
+        marker = f"__compile_done_{uuid.uuid4().hex}__"
+        try:
+            self._proc.stdin.write(f"{command}; echo {marker} $?\n")
+            self._proc.stdin.flush()
+        except OSError as e:
+            self.close()
+            raise RuntimeError(f"Compile shell is not accepting commands: {e}") from e
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.close()
+                raise subprocess.TimeoutExpired(command, timeout)
+            try:
+                line = self._lines.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if line is None:
+                self.close()
+                raise RuntimeError("Compile shell exited")
+            if line.startswith(marker):
+                return int(line.split()[1])
 
-def compile_latex(latex_content: str) -> str:
+    def close(self) -> None:
+        if self._proc is None:
+            return
+        if self._proc.poll() is None:
+            self._proc.kill()
+        self._proc.wait()
+        self._proc = None
+
+
+def output_root() -> str:
+    return os.path.abspath(settings.LATEX_OUTPUT_DIR)
+
+
+def scratch_root() -> str:
     """
-    Compile LaTeX content to PDF.
-    Attempts Docker compilation first, falls back to local pdflatex.
+    Where local compiles run: LATEX_SCRATCH_DIR if set, else tmpfs (/dev/shm)
+    when writable, else a directory beside the long-term output.
+    """
+    if settings.LATEX_SCRATCH_DIR:
+        return os.path.abspath(settings.LATEX_SCRATCH_DIR)
+    if os.path.isdir(_TMPFS) and os.access(_TMPFS, os.W_OK):
+        return os.path.join(_TMPFS, "resume-latex")
+    return os.path.join(output_root(), ".scratch", "local")
 
-    Args:
-        latex_content: Complete LaTeX document content
 
-    Returns:
-        Path to the generated PDF file
+def sandbox_scratch_root() -> str:
+    """Scratch for the sandbox backend, which only sees the output volume."""
+    return os.path.join(output_root(), ".scratch", "sandbox")
 
-    Raises:
-        RuntimeError: If compilation fails
+
+def staging_dir() -> str:
+    """Finished PDFs land here first, on the output filesystem, so the move into the cache is atomic."""
+    return os.path.join(output_root(), ".staging")
+
+
+class CompileWorker:
+    """One warm compile slot: reusable shell sessions, and a fresh scratch directory per job."""
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self._docker: Optional[_ShellSession] = None
+        self._local: Optional[_ShellSession] = None
+
+    @property
+    def name(self) -> str:
+        return f"w{self.index}"
+
+    def _job_dir(self, backend: str, job_id: str) -> Tuple[str, str]:
+        """Create an empty scratch directory for one job; returns (host path, path seen by the backend)."""
+        if backend == "docker":
+            host = os.path.join(sandbox_scratch_root(), self.name, job_id)
+            seen = posixpath.join(settings.LATEX_SANDBOX_OUTPUT_DIR, ".scratch", "sandbox", self.name, job_id)
+        else:
+            host = seen = os.path.join(scratch_root(), self.name, job_id)
+        os.makedirs(host)
+        return host, seen
+
+    def _session(self, backend: str) -> Optional[_ShellSession]:
+        if backend == "docker":
+            if not _sandbox.available():
+                return None
+            if self._docker is None:
+                self._docker = _ShellSession(["docker", "exec", "-i", settings.LATEX_SANDBOX_CONTAINER, "sh"])
+            return self._docker
+        if self._local is None:
+            if not shutil.which("pdflatex"):
+                logger.warning("pdflatex not found locally")
+                return None
+            self._local = _ShellSession(["sh"])
+        return self._local
+
+    def _pdflatex_command(self, workdir: str, job_id: str, fmt: Optional[str] = None, ini: bool = False) -> str:
+        args = [
+            "timeout", str(settings.LATEX_TIMEOUT_SECONDS),
+            "pdflatex",
+            "--no-shell-escape",
+            "-interaction=nonstopmode",
+            f"-output-directory={workdir}",
+        ]
+        if ini:
+            args += ["-ini", f"-jobname={job_id}", "&pdflatex", "mylatexformat.ltx"]
+        elif fmt:
+            args.append(f"-fmt={fmt}")
+        args.append(f"{job_id}.tex")
+        return f"cd {shlex.quote(workdir)} && {shlex.join(args)} </dev/null >/dev/null 2>&1"
+
+    def _run_passes(self, session: _ShellSession, host_dir: str, workdir: str, job_id: str, fmt: Optional[str] = None) -> int:
+        """Run pdflatex until the log stops asking for a rerun, at most LATEX_MAX_RUNS times."""
+        command = self._pdflatex_command(workdir, job_id, fmt=fmt)
+        runs = 0
+        while runs < settings.LATEX_MAX_RUNS:
+            session.run(command, timeout=settings.LATEX_TIMEOUT_SECONDS + _SESSION_GRACE_SECONDS)
+            runs += 1
+            if not latex_log.needs_rerun(self._read_log(host_dir, job_id)):
+                break
+        return runs
+
+    @staticmethod
+    def _link_format(key: str, host_dir: str, backend: str) -> None:
+        """Make a dumped format visible to pdflatex from the job's scratch directory."""
+        target = os.path.join(host_dir, f"{key}.fmt")
+        try:
+            os.link(latex_formats.format_path(key), target)
+        except OSError:
+            if backend == "local":
+                # tmpfs scratch is another filesystem; a symlink avoids copying the format
+                os.symlink(latex_formats.format_path(key), target)
+            else:
+                shutil.copyfile(latex_formats.format_path(key), target)
+
+    def compile(self, job_id: str, latex_content: str) -> Tuple[CompileResult, str]:
+        """
+        Compile in a scratch directory of its own and stage the PDF on the output filesystem.
+
+        Returns:
+            (result, backend). The result path is None when no PDF could be
+            produced; the scratch directories are removed either way.
+        """
+        job_dirs: List[str] = []
+        report = None
+        runs = 0
+        try:
+            for backend in ("docker", "local"):
+                session = self._session(backend)
+                if session is None:
+                    continue
+                host_dir, workdir = self._job_dir(backend, job_id)
+                job_dirs.append(host_dir)
+                pdf_filepath = os.path.join(host_dir, f"{job_id}.pdf")
+                with open(os.path.join(host_dir, f"{job_id}.tex"), "w", encoding="utf-8") as f:
+                    f.write(latex_content)
+                try:
+                    fmt = latex_formats.lookup_format(latex_content, backend)
+                    if fmt:
+                        self._link_format(fmt, host_dir, backend)
+                        runs += self._run_passes(session, host_dir, workdir, job_id, fmt=fmt)
+                        if not os.path.exists(pdf_filepath) and latex_log.format_load_failed(
+                            self._read_log(host_dir, job_id)
+                        ):
+                            # Stale or broken format: drop it and compile the full preamble.
+                            # Errors in the document body keep the format other resumes share.
+                            latex_formats.discard_format(fmt)
+                            runs += self._run_passes(session, host_dir, workdir, job_id)
+                    else:
+                        runs += self._run_passes(session, host_dir, workdir, job_id)
+                except (subprocess.TimeoutExpired, RuntimeError) as e:
+                    logger.warning(f"{backend} LaTeX compilation failed on worker {self.name}: {e}")
+                    if backend == "docker":
+                        _sandbox.invalidate()
+                    continue
+                log_text = self._read_log(host_dir, job_id)
+                if os.path.exists(pdf_filepath):
+                    os.makedirs(staging_dir(), exist_ok=True)
+                    staged_path = os.path.join(staging_dir(), f"{job_id}.pdf")
+                    shutil.move(pdf_filepath, staged_path)
+                    logger.info(f"{backend} LaTeX compilation successful in {runs} run(s)")
+                    return CompileResult(staged_path, latex_log.parse_log(log_text, runs, succeeded=True)), backend
+                logger.warning(f"{backend} compilation did not produce PDF. log: {log_text[-500:]}")
+                report = latex_log.parse_log(log_text, runs, succeeded=False)
+            return CompileResult(None, report or latex_log.parse_log("", runs, succeeded=False)), "none"
+        finally:
+            for job_dir in job_dirs:
+                shutil.rmtree(job_dir, ignore_errors=True)
+
+    def dump_format(self, preamble: str) -> List[str]:
+        """Dump a format for `preamble` with every available backend; returns the new keys."""
+        dumped = []
+        for backend in ("docker", "local"):
+            key = latex_formats.format_key(preamble, backend)
+            if os.path.exists(latex_formats.format_path(key)):
+                continue
+            session = self._session(backend)
+            if session is None:
+                continue
+            host_dir, workdir = self._job_dir(backend, key)
+            try:
+                with open(os.path.join(host_dir, f"{key}.tex"), "w", encoding="utf-8") as f:
+                    f.write(latex_formats.dump_source(preamble))
+                command = self._pdflatex_command(workdir, key, ini=True)
+                try:
+                    session.run(command, timeout=settings.LATEX_TIMEOUT_SECONDS + _SESSION_GRACE_SECONDS)
+                except (subprocess.TimeoutExpired, RuntimeError) as e:
+                    logger.warning(f"{backend} format dump failed on worker {self.name}: {e}")
+                    continue
+                fmt_file = os.path.join(host_dir, f"{key}.fmt")
+                if not os.path.exists(fmt_file):
+                    logger.warning(f"{backend} format dump produced no format. log: {self._read_log(host_dir, key)[-500:]}")
+                    continue
+                os.makedirs(latex_formats.formats_dir(), exist_ok=True)
+                # Copy across filesystems under a temporary name, so compiles never load a partial format
+                partial = f"{latex_formats.format_path(key)}.{self.name}.tmp"
+                shutil.move(fmt_file, partial)
+                os.replace(partial, latex_formats.format_path(key))
+            finally:
+                shutil.rmtree(host_dir, ignore_errors=True)
+            dumped.append(key)
+            logger.info(f"Dumped LaTeX format {key}")
+        return dumped
+
+    @staticmethod
+    def _read_log(host_dir: str, job_id: str) -> str:
+        log_path = os.path.join(host_dir, f"{job_id}.log")
+        if not os.path.exists(log_path):
+            return ""
+        with open(log_path, encoding="utf-8", errors="replace") as f:
+            return f.read()
+
+    def close(self) -> None:
+        for session in (self._docker, self._local):
+            if session is not None:
+                session.close()
+
+
+class CompilePool:
     """
-    job_id = str(uuid.uuid4())
-    output_dir = os.path.abspath(settings.LATEX_OUTPUT_DIR)
-    os.makedirs(output_dir, exist_ok=True)
+    A bounded set of warm workers behind an admission controller.
 
-    # Write LaTeX to a temp file
-    tex_filename = f"{job_id}.tex"
-    tex_filepath = os.path.join(output_dir, tex_filename)
-    pdf_filepath = os.path.join(output_dir, f"{job_id}.pdf")
+    Callers wait for a free worker in priority order (interactive before batch,
+    FIFO within a priority). When LATEX_COMPILE_QUEUE_LIMIT callers are already
+    waiting, new ones are rejected at once with CompileQueueFull.
+    """
 
-    with open(tex_filepath, "w", encoding="utf-8") as f:
-        f.write(latex_content)
+    def __init__(self, size: int) -> None:
+        self.size = max(1, size)
+        self._workers = [CompileWorker(index) for index in range(self.size)]
+        self._idle = list(reversed(self._workers))
+        self._cond = threading.Condition()
+        self._waiters: List[Tuple[int, int]] = []  # Heap of (priority, arrival)
+        self._arrivals = itertools.count()
+        self._busy = 0
+        self._completed = 0
+        self._rejected = 0
+        self._recent: Deque[CompileTiming] = deque(maxlen=_RECENT_JOBS)
 
-    try:
-        # Try Docker compilation first
-        result = _compile_with_docker(tex_filepath, output_dir, job_id)
-        if result:
-            return result
+    def _avg_compile_ms(self) -> float:
+        return sum(t.compile_ms for t in self._recent) / len(self._recent) if self._recent else 1000.0
 
-        # Fallback to local pdflatex
-        result = _compile_locally(tex_filepath, output_dir, job_id)
-        if result:
+    def retry_after(self, backlog: int = 0) -> int:
+        """Seconds until a job queued behind `backlog` others would likely start."""
+        with self._cond:
+            ahead = len(self._waiters) + backlog
+            return max(1, math.ceil((ahead / self.size + 1) * self._avg_compile_ms() / 1000))
+
+    def _acquire(self, priority: int, bounded: bool = True) -> CompileWorker:
+        with self._cond:
+            if self._idle and not self._waiters:
+                self._busy += 1
+                return self._idle.pop()
+            if bounded and len(self._waiters) >= settings.LATEX_COMPILE_QUEUE_LIMIT:
+                self._rejected += 1
+                ahead = len(self._waiters)
+                raise CompileQueueFull(max(1, math.ceil((ahead / self.size + 1) * self._avg_compile_ms() / 1000)))
+            ticket = (priority, next(self._arrivals))
+            heapq.heappush(self._waiters, ticket)
+            self._cond.wait_for(lambda: bool(self._idle) and self._waiters[0] == ticket)
+            heapq.heappop(self._waiters)
+            self._busy += 1
+            worker = self._idle.pop()
+            self._cond.notify_all()  # The next waiter may take another idle worker
+            return worker
+
+    def _release(self, worker: CompileWorker, timing: Optional[CompileTiming] = None) -> None:
+        with self._cond:
+            self._busy -= 1
+            if timing is not None:
+                self._completed += 1
+                self._recent.append(timing)
+            self._idle.append(worker)
+            self._cond.notify_all()
+
+    def compile(self, latex_content: str, priority: int = PRIORITY_INTERACTIVE) -> CompileResult:
+        job_id = str(uuid.uuid4())
+        queued = time.perf_counter()
+        worker = self._acquire(priority)
+        started = time.perf_counter()
+
+        result, backend = None, "none"
+        try:
+            result, backend = worker.compile(job_id, latex_content)
             return result
+        finally:
+            timing = CompileTiming(
+                job_id=job_id,
+                worker=worker.index,
+                backend=backend,
+                priority=priority,
+                queue_wait_ms=(started - queued) * 1000,
+                compile_ms=(time.perf_counter() - started) * 1000,
+                runs=result.report.runs if result and result.report else 0,
+                succeeded=bool(result and result.succeeded),
+            )
+            self._release(worker, timing)
+            logger.info(
+                f"Compile {job_id} on {worker.name} via {backend}: "
+                f"waited {timing.queue_wait_ms:.0f} ms, compiled in {timing.compile_ms:.0f} ms"
+            )
 
-        raise RuntimeError("LaTeX compilation failed with both Docker and local methods")
+    def dump_format(self, preamble: str) -> List[str]:
+        worker = self._acquire(PRIORITY_BATCH, bounded=False)
+        try:
+            return worker.dump_format(preamble)
+        finally:
+            self._release(worker)
 
-    finally:
-        # Clean up auxiliary files
-        for ext in [".aux", ".log", ".out", ".toc", ".nav", ".snm"]:
-            aux_file = os.path.join(output_dir, f"{job_id}{ext}")
-            if os.path.exists(aux_file):
-                os.remove(aux_file)
+    def stats(self) -> CompilePoolStats:
+        with self._cond:
+            recent = list(self._recent)
+            waiting, busy = len(self._waiters), self._busy
+            completed, rejected = self._completed, self._rejected
+        hits, misses = pdf_cache.cache_counters()
+        entries, size = pdf_cache.cache_usage()
 
+        def avg(values: List[float]) -> float:
+            return round(sum(values) / len(values), 1) if values else 0.0
 
-def _compile_with_docker(tex_filepath: str, output_dir: str, job_id: str) -> str:
-    """Try to compile LaTeX using the Docker sandbox container."""
-    try:
-        # Check if Docker is available
-        subprocess.run(["docker", "info"], capture_output=True, check=True, timeout=5)
-
-        # Run pdflatex in the latex-sandbox container
-        result = subprocess.run(
-            [
-                "docker", "exec", "latex-sandbox",
-                "pdflatex",
-                "--no-shell-escape",
-                "-interaction=nonstopmode",
-                f"-output-directory=/output",
-                f"/output/{job_id}.tex",
+        return CompilePoolStats(
+            workers=self.size,
+            busy_workers=busy,
+            queue_depth=waiting,
+            queue_limit=settings.LATEX_COMPILE_QUEUE_LIMIT,
+            completed_jobs=completed,
+            rejected_jobs=rejected,
+            sandbox_available=_sandbox.cached,
+            avg_queue_wait_ms=avg([t.queue_wait_ms for t in recent]),
+            avg_compile_ms=avg([t.compile_ms for t in recent]),
+            avg_queue_wait_ms_by_priority={
+                name: avg([t.queue_wait_ms for t in recent if t.priority == priority])
+                for priority, name in PRIORITY_NAMES.items()
+            },
+            cache_hits=hits,
+            cache_misses=misses,
+            cache_entries=entries,
+            cache_bytes=size,
+            recent_jobs=[
+                CompileJobTiming(
+                    job_id=t.job_id,
+                    worker=t.worker,
+                    backend=t.backend,
+                    priority=PRIORITY_NAMES.get(t.priority, str(t.priority)),
+                    queue_wait_ms=round(t.queue_wait_ms, 1),
+                    compile_ms=round(t.compile_ms, 1),
+                    runs=t.runs,
+                    succeeded=t.succeeded,
+                )
+                for t in reversed(recent)
             ],
-            capture_output=True,
-            text=True,
-            timeout=settings.LATEX_TIMEOUT_SECONDS,
         )
 
-        pdf_path = os.path.join(output_dir, f"{job_id}.pdf")
-        if os.path.exists(pdf_path):
-            logger.info(f"Docker LaTeX compilation successful: {pdf_path}")
-            return pdf_path
+    def close(self) -> None:
+        for worker in self._workers:
+            worker.close()
 
-        logger.warning(f"Docker compilation did not produce PDF. stderr: {result.stderr[:500]}")
-        return ""
 
-    except (subprocess.TimeoutExpired, FileNotFoundError, subprocess.CalledProcessError) as e:
-        logger.info(f"Docker compilation unavailable: {e}. Will try local fallback.")
-        return ""
+_pool: Optional[CompilePool] = None
+_pool_lock = threading.Lock()
 
 
-def _compile_locally(tex_filepath: str, output_dir: str, job_id: str) -> str:
-    """Compile LaTeX using local pdflatex installation (fallback)."""
-    try:
-        pdflatex_cmd = shutil.which("pdflatex")
-        if not pdflatex_cmd:
-            logger.warning("pdflatex not found locally")
-            # Return the tex file path so the user at least gets the LaTeX source
-            return tex_filepath
+def get_compile_pool() -> CompilePool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = CompilePool(settings.LATEX_WORKERS)
+        return _pool
+
+
+def shutdown_compile_pool() -> None:
+    """Close every worker's shells; the next compile starts a fresh pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
 
-        for run in range(settings.LATEX_MAX_RUNS):
-            result = subprocess.run(
-                [
-                    pdflatex_cmd,
-                    "--no-shell-escape",
-                    "-interaction=nonstopmode",
-                    f"-output-directory={output_dir}",
-                    tex_filepath,
-                ],
-                capture_output=True,
-                text=True,
-                timeout=settings.LATEX_TIMEOUT_SECONDS,
-            )
 
-        pdf_path = os.path.join(output_dir, f"{job_id}.pdf")
-        if os.path.exists(pdf_path):
-            logger.info(f"Local LaTeX compilation successful: {pdf_path}")
-            return pdf_path
+def compile_document(latex_content: str, priority: int = PRIORITY_INTERACTIVE) -> CompileResult:
+    """
+    Compile LaTeX content to PDF.
+    Attempts Docker compilation first, falls back to local pdflatex.
+    Byte-identical sources are served from the content-addressed PDF cache
+    without compiling, and sources the preflight linter finds structurally
+    broken are refused without running pdflatex.
+
+    Args:
+        latex_content: Complete LaTeX document content
+        priority: PRIORITY_INTERACTIVE or PRIORITY_BATCH, for admission to the pool
+
+    Returns:
+        The PDF's artifact key (None if no PDF could be produced) and the
+        compile report parsed from the pdflatex log (with runs=0 when the
+        preflight refused the document)
+
+    Raises:
+        CompileQueueFull: If LATEX_COMPILE_QUEUE_LIMIT compiles are already waiting
+    """
+    cached = pdf_cache.lookup(latex_content)
+    if cached:
+        logger.info(f"PDF cache hit: {cached}")
+        return CompileResult(cached, pdf_cache.load_report(cached))
+    if settings.LATEX_PREFLIGHT:
+        issues = latex_preflight.lint(latex_content)
+        if latex_preflight.errors(issues):
+            logger.info(f"Preflight refused compile: {len(latex_preflight.errors(issues))} error(s)")
+            return CompileResult(None, latex_preflight.preflight_report(issues))
+    result = get_compile_pool().compile(latex_content, priority)
+    if result.succeeded:
+        result.path = pdf_cache.store(latex_content, result.path, result.report)
+    return result
+
+
+def compile_latex(latex_content: str) -> Optional[str]:
+    """Compile LaTeX content and return only the PDF's artifact key."""
+    return compile_document(latex_content).path
+
+
+def precompile_format(latex_content: str) -> List[str]:
+    """
+    Dump a precompiled format for a template's preamble so later compiles load it.
+    Returns the keys of newly dumped formats; templates whose preamble carries
+    placeholders are skipped, as their rendered preambles all differ.
+    """
+    if not settings.LATEX_PRECOMPILED_FORMATS:
+        return []
+    preamble = latex_formats.dumpable_preamble(latex_content)
+    if preamble is None:
+        return []
+    try:
+        return get_compile_pool().dump_format(preamble)
+    except OSError as e:
+        logger.warning(f"Could not dump LaTeX format: {e}")
+        return []
 
-        logger.error(f"Local compilation failed. stdout: {result.stdout[:500]}")
-        # Return tex file as fallback
-        return tex_filepath
 
-    except (subprocess.TimeoutExpired, FileNotFoundError) as e:
-        logger.error(f"Local LaTeX compilation failed: {e}")
-        return tex_filepath
+def get_compile_stats() -> CompilePoolStats:
+    """Queue depth, worker usage and recent per-job timings."""
+    return get_compile_pool().stats()
@@ -0,0 +1,78 @@
+"""
+LaTeX Format Service.
+Precompiled TeX formats (`.fmt`, mylatexformat-style) for template preambles.
+Loading a dumped format skips re-parsing the document class, packages and macro
+definitions, which is most of pdflatex's runtime for a one-page resume.
+Formats are keyed by a hash of the preamble and the compile backend, since a
+format only loads in the TeX build that dumped it.
+"""
+import os
+import hashlib
+import logging
+from typing import Optional
+from app.config import settings
+from app.services.latex_lexer import find_placeholders
+
+logger = logging.getLogger(__name__)
+
+_BEGIN_DOCUMENT = "\\begin{document}"
+
+# Bump to invalidate every dumped format, e.g. when the dump command changes
+_FORMAT_VERSION = "1"
+
+
+def split_preamble(latex_content: str) -> Optional[str]:
+    """The preamble of a full document, or None if it has no \\begin{document}."""
+    index = latex_content.find(_BEGIN_DOCUMENT)
+    if index <= 0:
+        return None
+    return latex_content[:index]
+
+
+def format_key(preamble: str, backend: str) -> str:
+    digest = hashlib.sha256(f"{_FORMAT_VERSION}\0{backend}\0{preamble}".encode("utf-8")).hexdigest()
+    return f"fmt-{digest[:24]}-{backend}"
+
+
+def formats_dir() -> str:
+    return os.path.join(os.path.abspath(settings.LATEX_OUTPUT_DIR), ".formats")
+
+
+def format_path(key: str) -> str:
+    return os.path.join(formats_dir(), f"{key}.fmt")
+
+
+def lookup_format(latex_content: str, backend: str) -> Optional[str]:
+    """Key of a dumped format matching the document's preamble, if one exists."""
+    if not settings.LATEX_PRECOMPILED_FORMATS:
+        return None
+    preamble = split_preamble(latex_content)
+    if preamble is None:
+        return None
+    key = format_key(preamble, backend)
+    return key if os.path.exists(format_path(key)) else None
+
+
+def dumpable_preamble(latex_content: str) -> Optional[str]:
+    """
+    The template preamble to dump, or None when it cannot be shared.
+    A preamble with placeholders differs per resume, so no format would match it.
+    """
+    preamble = split_preamble(latex_content)
+    if preamble is None or find_placeholders(preamble):
+        return None
+    return preamble
+
+
+def dump_source(preamble: str) -> str:
+    """Source mylatexformat dumps: the preamble and an empty body."""
+    return f"{preamble}{_BEGIN_DOCUMENT}\n\\end{{document}}\n"
+
+
+def discard_format(key: str) -> None:
+    """Drop a format that failed to load (stale TeX build or broken dump)."""
+    try:
+        os.remove(format_path(key))
+        logger.warning(f"Discarded stale LaTeX format {key}")
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,210 @@
+"""
+LaTeX Lexer Service.
+Single-pass tokenizer for the subset of LaTeX used in resume templates.
+Shared by the guardrail validator, template filling and placeholder detection
+so the document is scanned once instead of once per regex strategy.
+"""
+import re
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+
+# One alternation, tried left to right at each position. Placeholders come first
+# so %%KEY%% is not read as a comment and {{key}} / [[key]] are not read as groups.
+_TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<placeholder>
+        %%\s*(?P<pct>[A-Za-z0-9_]+)\s*%%
+      | \{\{\s*(?P<brace>[A-Za-z0-9_]+)\s*\}\}
+      | \[\[\s*(?P<bracket>[A-Za-z0-9_]+)\s*\]\]
+    )
+    | (?P<comment>%[^\n]*)
+    | (?P<command>\\(?:[A-Za-z@]+\*?|[\s\S])?)
+    | (?P<open>\{)
+    | (?P<close>\})
+    | (?P<option>\[[^\[\]{}\n]*\])
+    | (?P<newline>\n)
+    | (?P<special>[&~^$])
+    | (?P<text>[^\\{}%\n&~^$\[]+|\[)
+    """,
+    re.VERBOSE,
+)
+
+# Zero-width split points before \section / \subsection at the start of a line
+_SECTION_BOUNDARY = re.compile(r"^(?=[ \t]*\\(?:sub)*section\*?[{\[])", re.MULTILINE)
+
+_PLACEHOLDER_SYNTAX = {"pct": "%%", "brace": "{{", "bracket": "[["}
+
+# Escaped characters that render as themselves
+_ESCAPED_CHARS = {"&", "%", "$", "#", "_", "{", "}"}
+
+# Letter commands that render as a delimiter or word rather than a plain break
+_SYMBOL_COMMANDS = {
+    "textbar": "|",
+    "textbullet": "|",
+    "bullet": "|",
+    "cdot": "|",
+    "LaTeX": "LaTeX",
+    "TeX": "TeX",
+}
+
+# Commands that close the current \\item even without a line break
+_ITEM_BREAKING_COMMANDS = {
+    "begin", "end", "par", "section", "section*", "subsection", "subsection*",
+}
+
+# Commands whose arguments are never rendered as prose
+_NON_TEXT_COMMANDS = {
+    "begin", "end", "documentclass", "usepackage", "label", "ref", "pageref",
+    "url", "includegraphics", "vspace", "hspace", "setlength", "addtolength",
+    "newcommand", "renewcommand", "definecolor", "color", "pagestyle",
+    "thispagestyle", "input", "include", "bibliographystyle", "titleformat",
+    "titlespacing", "setlist",
+}
+
+# Individual non-prose arguments, as (command, argument index)
+_NON_TEXT_ARGS = {("href", 0), ("textcolor", 0), ("colorbox", 0)}
+
+
+@dataclass(frozen=True)
+class Token:
+    kind: str
+    value: str
+    start: int
+    end: int
+    line: int
+    key: Optional[str] = None
+    syntax: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class TextRun:
+    """Rendered text with the context it appeared in."""
+    text: str
+    start: int
+    line: int
+    item: Optional[int]
+    groups: Tuple[Tuple[str, int], ...]
+
+    def within(self, command: str) -> bool:
+        return any(name == command for name, _ in self.groups)
+
+
+def tokenize(latex_content: str) -> Iterator[Token]:
+    """Yield tokens for the whole document in a single left-to-right scan."""
+    line = 1
+    for match in _TOKEN_PATTERN.finditer(latex_content):
+        kind = match.lastgroup
+        value = match.group()
+        if kind == "placeholder":
+            group = next(g for g in _PLACEHOLDER_SYNTAX if match.group(g) is not None)
+            yield Token(kind, value, match.start(), match.end(), line,
+                        key=match.group(group), syntax=_PLACEHOLDER_SYNTAX[group])
+        else:
+            yield Token(kind, value, match.start(), match.end(), line)
+        if kind == "newline":
+            line += 1
+        elif "\n" in value:
+            line += value.count("\n")
+
+
+def find_placeholders(latex_content: str) -> List[Token]:
+    """Return placeholder tokens across the %%KEY%%, {{key}} and [[key]] syntaxes."""
+    return [tok for tok in tokenize(latex_content) if tok.kind == "placeholder"]
+
+
+def split_sections(latex_content: str) -> List[str]:
+    """
+    Split a document into contiguous chunks at each \\section or \\subsection.
+    Joining the chunks gives back the original document.
+    """
+    return _SECTION_BOUNDARY.split(latex_content)
+
+
+def iter_text_runs(latex_content: str) -> Iterator[TextRun]:
+    """
+    Yield the rendered text of a document with its context.
+
+    Each run carries a logical line index (source newlines and \\\\ both break
+    lines), the index of the enclosing \\item if any, and the stack of command
+    groups it sits in, e.g. (("textbf", 3),). Arguments of structural commands
+    such as \\usepackage or the URL of \\href are skipped entirely.
+    """
+    # Each open group: (command or None, argument index, group id, hidden)
+    stack: List[Tuple[Optional[str], int, int, bool]] = []
+    pending: Optional[Tuple[str, int]] = None  # command awaiting its next argument
+    line = 0
+    item: Optional[int] = None
+    item_count = 0
+    group_count = 0
+
+    def context() -> Tuple[Tuple[str, int], ...]:
+        return tuple((name, gid) for name, _, gid, _ in stack if name)
+
+    def hidden() -> bool:
+        return bool(stack) and stack[-1][3]
+
+    for tok in tokenize(latex_content):
+        kind = tok.kind
+
+        if kind == "open":
+            name, index = pending if pending else (None, 0)
+            is_hidden = hidden() or name in _NON_TEXT_COMMANDS or (name, index) in _NON_TEXT_ARGS
+            stack.append((name, index, group_count, is_hidden))
+            group_count += 1
+            pending = None
+            continue
+
+        if kind == "close":
+            if stack:
+                name, index, _, _ = stack.pop()
+                pending = (name, index + 1) if name else None
+            continue
+
+        if kind == "option" and pending:
+            continue
+
+        if kind == "comment":
+            continue
+
+        # A bare command (no argument group followed) reads as a word break
+        if pending and pending[1] == 0 and not hidden():
+            yield TextRun(" ", tok.start, line, item, context())
+        pending = None
+
+        if kind == "newline":
+            line += 1
+            item = None
+            continue
+
+        if kind == "command":
+            name = tok.value[1:]
+            if name == "item":
+                item_count += 1
+                item = item_count
+            elif name == "\\":
+                line += 1
+                item = None
+            elif name in _ITEM_BREAKING_COMMANDS:
+                item = None
+                pending = (name, 0)
+            elif name in _ESCAPED_CHARS:
+                if not hidden():
+                    yield TextRun(name, tok.start, line, item, context())
+            elif name in _SYMBOL_COMMANDS:
+                if not hidden():
+                    yield TextRun(f" {_SYMBOL_COMMANDS[name]} ", tok.start, line, item, context())
+            elif name[:1].isalpha() or name[:1] == "@":
+                pending = (name, 0)
+            elif name != "-" and not hidden():
+                yield TextRun(" ", tok.start, line, item, context())
+            continue
+
+        if hidden():
+            continue
+
+        if kind == "special":
+            yield TextRun(" ", tok.start, line, item, context())
+        elif kind == "placeholder":
+            yield TextRun(tok.key, tok.start, line, item, context())
+        else:
+            yield TextRun(tok.value, tok.start, line, item, context())
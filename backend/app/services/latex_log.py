@@ -0,0 +1,116 @@
+"""
+LaTeX Log Service.
+Reads pdflatex `.log` files: whether another pass is needed, and a structured
+report of errors, warnings, overfull boxes and page count for the compile.
+"""
+import re
+import logging
+from typing import List, Optional
+from app.schemas.schemas import CompileReport, LatexLogError
+
+logger = logging.getLogger(__name__)
+
+# TeX hard-wraps log lines at max_print_line characters
+_MAX_PRINT_LINE = 79
+
+_RERUN_MARKERS = re.compile(
+    r"Rerun to get|Label\(s\) may have changed|Please rerun LaTeX|Rerun LaTeX|"
+    r"\(rerunfilecheck\)\s+Rerun"
+)
+_WARNING = re.compile(r"^(?:LaTeX|Package [\w.-]+|Class [\w.-]+) Warning: ")
+_OVERFULL = re.compile(r"^Overfull \\[hv]box \([^)]*\).*")
+_ERROR_LINE = re.compile(r"^l\.(\d+)")
+_PAGES = re.compile(r"Output written on .*?\((\d+) pages?")
+_FORMAT_ERROR = re.compile(
+    r"can't find the format file|Fatal format file error|^---! .*\.fmt (?:was written by|doesn't match)",
+    re.MULTILINE,
+)
+
+# Cap on messages kept per category, so a runaway document cannot bloat the report
+_MAX_MESSAGES = 50
+
+
+def _unwrap(log_text: str) -> List[str]:
+    """Rejoin lines TeX split at max_print_line."""
+    lines: List[str] = []
+    carry = ""
+    for line in log_text.splitlines():
+        if len(line) == _MAX_PRINT_LINE:
+            carry += line
+            continue
+        lines.append(carry + line)
+        carry = ""
+    if carry:
+        lines.append(carry)
+    return lines
+
+
+def needs_rerun(log_text: Optional[str]) -> bool:
+    """Whether the log asks for another pass to settle references or labels."""
+    if not log_text:
+        return False
+    return bool(_RERUN_MARKERS.search("\n".join(_unwrap(log_text))))
+
+
+def format_load_failed(log_text: Optional[str]) -> bool:
+    """
+    Whether pdflatex gave up loading its precompiled format rather than failing in
+    the document. TeX opens the log only once the format is loaded, so a missing
+    log means the same as an explicit format error.
+    """
+    if not log_text or not log_text.strip():
+        return True
+    return bool(_FORMAT_ERROR.search(log_text))
+
+
+def _continuation(lines: List[str], start: int) -> str:
+    """A message with its indented or package-prefixed continuation lines."""
+    parts = [lines[start].strip()]
+    for line in lines[start + 1:start + 6]:
+        if not line.strip():
+            break
+        if not (line.startswith(" ") or line.startswith("(")):
+            break
+        parts.append(line.strip())
+    return " ".join(parts)
+
+
+def parse_log(log_text: Optional[str], runs: int, succeeded: bool) -> CompileReport:
+    """Build the structured compile report from the final pass's log."""
+    errors: List[LatexLogError] = []
+    warnings: List[str] = []
+    overfull: List[str] = []
+    pages: Optional[int] = None
+
+    lines = _unwrap(log_text or "")
+    for i, line in enumerate(lines):
+        if line.startswith("! "):
+            line_number = None
+            for following in lines[i + 1:i + 12]:
+                match = _ERROR_LINE.match(following)
+                if match:
+                    line_number = int(match.group(1))
+                    break
+            if len(errors) < _MAX_MESSAGES:
+                errors.append(LatexLogError(message=line[2:].strip(), line=line_number))
+        elif _WARNING.match(line):
+            if len(warnings) < _MAX_MESSAGES:
+                warnings.append(_continuation(lines, i))
+        elif _OVERFULL.match(line):
+            if len(overfull) < _MAX_MESSAGES:
+                overfull.append(line.strip())
+        elif line.startswith("No pages of output"):
+            pages = 0
+        else:
+            match = _PAGES.search(line)
+            if match:
+                pages = int(match.group(1))
+
+    return CompileReport(
+        succeeded=succeeded,
+        runs=runs,
+        pages=pages,
+        errors=errors,
+        warnings=warnings,
+        overfull_boxes=overfull,
+    )
@@ -0,0 +1,335 @@
+"""
+LaTeX Preflight Service.
+Lints a document (or a generated section) in one pass over the lexer's tokens
+before pdflatex sees it. Structural errors — unbalanced braces, unclosed or
+mismatched environments, a \\documentclass without \\begin{document} — fail the
+compile at once with their line and column instead of burning a pdflatex run,
+possibly up to its timeout. Characters LLM output often leaves unescaped in
+prose (&, #, _, ^, a % after a number, an unclosed $) are reported as warnings.
+
+Most issues carry a mechanical fix; `repair` applies them, so generated sections
+are corrected in place rather than regenerated or compiled only to fail.
+"""
+import logging
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+from app.schemas.schemas import CompileReport, LatexLogError
+from app.services.latex_lexer import Token, tokenize
+
+logger = logging.getLogger(__name__)
+
+ERROR = "error"  # pdflatex would fail or stall on it; the compile is refused
+WARNING = "warning"  # pdflatex recovers, but the output is wrong
+
+_MATH_ENVIRONMENTS = {
+    "math", "displaymath", "equation", "equation*", "align", "align*", "alignat", "alignat*",
+    "gather", "gather*", "multline", "multline*", "eqnarray", "eqnarray*", "flalign", "flalign*",
+}
+
+# Environments in which & is plain prose and must be escaped; unknown (custom)
+# environments may well be tables, so they are given the benefit of the doubt
+_TEXT_ENVIRONMENTS = {
+    "document", "itemize", "enumerate", "description", "center", "flushleft", "flushright",
+    "quote", "quotation", "minipage", "abstract",
+}
+
+_VERBATIM_ENVIRONMENTS = {"verbatim", "verbatim*", "lstlisting", "minted", "comment"}
+
+# Every argument of these is a definition: parameters (#1), stray \begin or \end
+# and alignment characters are legitimate there
+_DEFINITION_COMMANDS = {
+    "newcommand", "renewcommand", "providecommand", "newenvironment", "renewenvironment",
+    "def", "gdef", "edef", "xdef", "DeclareRobustCommand",
+}
+
+# Arguments read as file names, labels or URLs rather than prose, as (command, argument index)
+_RAW_ARGUMENTS = {
+    ("url", 0), ("href", 0), ("path", 0), ("includegraphics", 0), ("input", 0), ("include", 0),
+    ("label", 0), ("ref", 0), ("pageref", 0), ("eqref", 0), ("cite", 0),
+    ("documentclass", 0), ("usepackage", 0),
+}
+
+_REPAIR_PASSES = 3
+
+_SPECIAL_FIXES = {"&": "\\&", "#": "\\#", "_": "\\_", "^": "\\textasciicircum{}"}
+
+
+@dataclass(frozen=True)
+class PreflightIssue:
+    code: str
+    severity: str
+    message: str
+    offset: int
+    line: int
+    column: int
+    fix: Optional[Tuple[int, int, str]] = None  # Replace source[start:end] with the text
+
+
+@dataclass
+class _Group:
+    offset: int
+    line: int
+    env_depth: int  # Environments open when the group started
+    command: Optional[str]
+    index: int
+    raw: bool  # Definition, URL or file name: contents are not prose
+    definition: bool
+
+
+@dataclass
+class _State:
+    source: str
+    fragment: bool
+    issues: List[PreflightIssue] = field(default_factory=list)
+    groups: List[_Group] = field(default_factory=list)
+    envs: List[Tuple[str, int, int]] = field(default_factory=list)  # (name, offset, line)
+    math: Optional[Token] = None  # Opening $ of the current inline formula
+    display_math: bool = False
+
+    def add(self, code: str, severity: str, message: str, offset: int, line: int,
+            fix: Optional[Tuple[int, int, str]] = None) -> None:
+        column = offset - self.source.rfind("\n", 0, offset)
+        self.issues.append(PreflightIssue(code, severity, message, offset, line, column, fix))
+
+    @property
+    def raw(self) -> bool:
+        return bool(self.groups) and self.groups[-1].raw
+
+    @property
+    def in_definition(self) -> bool:
+        return any(g.definition for g in self.groups)
+
+    @property
+    def in_math(self) -> bool:
+        return self.math is not None or self.display_math or any(e[0] in _MATH_ENVIRONMENTS for e in self.envs)
+
+    def unwind(self, keep: int, at: int, eof: bool = False) -> None:
+        """
+        Close the environments above the first `keep`, innermost first, inserting
+        the missing \\end and closing braces at `at`. At an \\end the last one
+        popped is the environment being ended; at end of input all are missing.
+        """
+        while len(self.envs) > keep:
+            self.close_groups(len(self.envs), at)
+            name, offset, line = self.envs.pop()
+            if eof or len(self.envs) > keep:
+                separator = "\n" if eof else ""
+                self.add("unclosed_environment", ERROR, f"\\begin{{{name}}} is never ended",
+                         offset, line, fix=(at, at, f"{separator}\\end{{{name}}}"))
+        if eof:
+            self.close_groups(0, at)
+
+    def close_groups(self, depth: int, at: int) -> None:
+        """Report every open group started with at least `depth` environments open."""
+        while self.groups and self.groups[-1].env_depth >= depth:
+            group = self.groups.pop()
+            self.add("unclosed_brace", ERROR, "Opening brace is never closed",
+                     group.offset, group.line, fix=(at, at, "}"))
+
+
+def _environment_name(tokens: List[Token], i: int) -> Tuple[Optional[str], int]:
+    """The name in \\begin{name} / \\end{name} starting at tokens[i], and the index after it."""
+    j = i + 1
+    while j < len(tokens) and tokens[j].kind == "text" and not tokens[j].value.strip():
+        j += 1
+    if j + 2 < len(tokens) and tokens[j].kind == "open" and tokens[j + 1].kind == "text" \
+            and tokens[j + 2].kind == "close":
+        return tokens[j + 1].value.strip(), j + 3
+    return None, i + 1
+
+
+def lint(latex_content: str, fragment: bool = False) -> List[PreflightIssue]:
+    """
+    Find structural errors and unescaped characters in LaTeX source.
+
+    Args:
+        latex_content: A full document, or a generated section when `fragment` is set
+        fragment: The source is placed inside a document body, so every line is
+            prose and a missing \\begin{document} is expected
+    """
+    state = _State(latex_content, fragment)
+    tokens = list(tokenize(latex_content))
+    in_body = fragment
+    saw_documentclass = False
+    pending: Optional[Tuple[str, int]] = None  # Command awaiting its next argument
+    i = 0
+
+    while i < len(tokens):
+        tok = tokens[i]
+        kind = tok.kind
+        defining = state.in_definition or bool(pending and pending[0] in _DEFINITION_COMMANDS)
+        prose = in_body and not state.raw and not defining
+
+        if kind == "command":
+            name = tok.value[1:]
+            if name in ("begin", "end") and not state.in_definition:
+                env, after = _environment_name(tokens, i)
+                if env is None:
+                    i += 1
+                    continue
+                if name == "begin":
+                    if env == "document":
+                        in_body = True
+                    state.envs.append((env, tok.start, tok.line))
+                    if env in _VERBATIM_ENVIRONMENTS:
+                        closing = latex_content.find(f"\\end{{{env}}}", tokens[after - 1].end)
+                        if closing < 0:
+                            state.unwind(0, len(latex_content), eof=True)
+                            break
+                        while after < len(tokens) and tokens[after].start < closing:
+                            after += 1
+                else:
+                    match = next((k for k in range(len(state.envs) - 1, -1, -1) if state.envs[k][0] == env), None)
+                    end_of_command = tokens[after - 1].end
+                    if match is None:
+                        state.add("unmatched_end", ERROR, f"\\end{{{env}}} has no matching \\begin",
+                                  tok.start, tok.line, fix=(tok.start, end_of_command, ""))
+                    else:
+                        if state.math is not None:
+                            _unclosed_math(state)
+                        state.unwind(match, tok.start)
+                        if env == "document":
+                            state.close_groups(0, tok.start)
+                            trailing = latex_content[end_of_command:]
+                            if trailing.strip():
+                                offset = end_of_command + len(trailing) - len(trailing.lstrip())
+                                state.add("content_after_end_document", WARNING,
+                                          "Content after \\end{document} is ignored",
+                                          offset, tok.line + latex_content.count("\n", tok.start, offset),
+                                          fix=(end_of_command, len(latex_content), "\n"))
+                            break
+                pending = None
+                i = after
+                continue
+            if name == "documentclass":
+                saw_documentclass = True
+            if not state.in_definition:
+                if name in ("(", "["):
+                    state.display_math = True
+                elif name in (")", "]"):
+                    state.display_math = False
+            if pending and pending[0] in _DEFINITION_COMMANDS:
+                pending = (pending[0], pending[1] + 1)  # \def\name or \newcommand\name
+            elif name[:1].isalpha() or name[:1] == "@":
+                pending = (name, 0)
+            else:
+                pending = None
+            i += 1
+            continue
+
+        if kind == "open":
+            command, index = pending if pending else (None, 0)
+            definition = command in _DEFINITION_COMMANDS
+            raw = state.raw or definition or (command, index) in _RAW_ARGUMENTS
+            state.groups.append(_Group(tok.start, tok.line, len(state.envs), command, index, raw, definition))
+            pending = None
+        elif kind == "close":
+            if not state.groups or state.groups[-1].env_depth < len(state.envs):
+                state.add("unmatched_close_brace", ERROR, "Closing brace has no matching opening brace",
+                          tok.start, tok.line, fix=(tok.start, tok.end, ""))
+            else:
+                group = state.groups.pop()
+                pending = (group.command, group.index + 1) if group.command else None
+        elif kind == "special":
+            if tok.value == "$" and not state.in_definition:
+                if latex_content.startswith("$$", tok.start):
+                    state.display_math = not state.display_math
+                    i += 2
+                    continue
+                state.math = None if state.math is not None else tok
+            elif tok.value in ("&", "^") and prose and not state.in_math:
+                innermost = state.envs[-1][0] if state.envs else None
+                if tok.value == "^" or innermost is None or innermost in _TEXT_ENVIRONMENTS:
+                    state.add(f"unescaped_{'ampersand' if tok.value == '&' else 'caret'}", WARNING,
+                              f"Unescaped {tok.value} in text", tok.start, tok.line,
+                              fix=(tok.start, tok.end, _SPECIAL_FIXES[tok.value]))
+            pending = None
+        elif kind == "text":
+            if prose and not state.in_math:
+                for offset, char in enumerate(tok.value):
+                    if char in ("_", "#"):
+                        start = tok.start + offset
+                        state.add(f"unescaped_{'underscore' if char == '_' else 'hash'}", WARNING,
+                                  f"Unescaped {char} in text", start, tok.line,
+                                  fix=(start, start + 1, _SPECIAL_FIXES[char]))
+            if tok.value.strip() and not (pending and pending[0] in _DEFINITION_COMMANDS):
+                pending = None
+        elif kind == "comment":
+            if prose and tok.start > 0 and latex_content[tok.start - 1].isdigit():
+                state.add("unescaped_percent", WARNING, "% after a number starts a comment; probably meant \\%",
+                          tok.start, tok.line, fix=(tok.start, tok.start, "\\"))
+        elif kind == "newline":
+            # A blank line ends the paragraph, and with it any inline formula
+            j = i + 1
+            while j < len(tokens) and tokens[j].kind == "text" and not tokens[j].value.strip():
+                j += 1
+            if j < len(tokens) and tokens[j].kind == "newline" and state.math is not None:
+                _unclosed_math(state)
+        elif kind == "placeholder":
+            pending = None
+        i += 1
+    else:
+        if state.math is not None:
+            _unclosed_math(state)
+        state.unwind(0, len(latex_content), eof=True)
+
+    if saw_documentclass and not in_body and not fragment:
+        state.add("missing_begin_document", ERROR, "\\documentclass without \\begin{document}", 0, 1)
+    return state.issues
+
+
+def _unclosed_math(state: _State) -> None:
+    opener = state.math
+    state.add("unclosed_math", WARNING, "$ is never closed; a literal dollar sign needs \\$",
+              opener.start, opener.line, fix=(opener.start, opener.end, "\\$"))
+    state.math = None
+
+
+def errors(issues: List[PreflightIssue]) -> List[PreflightIssue]:
+    return [issue for issue in issues if issue.severity == ERROR]
+
+
+def apply_fixes(latex_content: str, issues: List[PreflightIssue]) -> str:
+    """Apply every fix that does not overlap an earlier one, in source order."""
+    fixes = sorted(
+        ((issue.fix, n) for n, issue in enumerate(issues) if issue.fix is not None),
+        key=lambda item: (item[0][0], item[1]),
+    )
+    parts = []
+    position = 0
+    for (start, end, replacement), _ in fixes:
+        if start < position:
+            continue
+        parts.append(latex_content[position:start])
+        parts.append(replacement)
+        position = end
+    parts.append(latex_content[position:])
+    return "".join(parts)
+
+
+def repair(latex_content: str, fragment: bool = False) -> Tuple[str, List[PreflightIssue]]:
+    """
+    Lint, apply the mechanical fixes, and return the repaired source with the issues that remain.
+    A fix can expose another issue (escaping a % uncomments the rest of the line), so this
+    repeats for a few passes.
+    """
+    issues = lint(latex_content, fragment)
+    found = len(issues)
+    for _ in range(_REPAIR_PASSES):
+        if not any(issue.fix for issue in issues):
+            break
+        latex_content = apply_fixes(latex_content, issues)
+        issues = lint(latex_content, fragment)
+    if found:
+        logger.info(f"Preflight found {found} LaTeX issue(s); {len(issues)} remain after repair")
+    return latex_content, issues
+
+
+def preflight_report(issues: List[PreflightIssue]) -> CompileReport:
+    """A failed compile report for a document refused before pdflatex ran."""
+    return CompileReport(
+        succeeded=False,
+        runs=0,
+        errors=[LatexLogError(message=i.message, line=i.line, column=i.column) for i in errors(issues)],
+        warnings=[f"{i.message} (line {i.line}, column {i.column})" for i in issues if i.severity == WARNING],
+    )
@@ -0,0 +1,664 @@
+"""
+LaTeX Preview Service.
+Renders the subset of LaTeX used in resumes — sections, lists, tabular rows,
+font commands, links, \\hfill-aligned lines and the template's own
+\\newcommand / \\newenvironment macros — to HTML in one pass over the lexer's
+tokens. The template editor and chat refinement use it to show a change in
+milliseconds; pdflatex remains the source of truth for the downloaded PDF.
+
+Everything outside the subset is dropped and reported, so callers can say the
+preview is approximate. Document text is always HTML-escaped, the only tags
+are the ones emitted here, and links are limited to http(s), mailto and tel.
+"""
+import re
+import html
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+from app.schemas.schemas import LatexPreviewResponse
+from app.services.latex_lexer import Token, tokenize
+
+logger = logging.getLogger(__name__)
+
+# Structure is threaded through the rendered HTML as NUL-delimited markers and
+# resolved by the enclosing list, table or paragraph; NUL never survives from
+# the source because all text is escaped through _text
+PAR = "\x00p\x00"
+BR = "\x00br\x00"
+ITEM = "\x00li\x00"
+LABEL_END = "\x00/label\x00"
+CELL = "\x00td\x00"
+HFILL = "\x00hfill\x00"
+BLOCK = "\x00block\x00"
+_COLSPAN = re.compile("\x00colspan:(\\d+):(\\w*)\x00")
+_MARKERS = re.compile("(\x00(?:p|br|li|/label|td|hfill)\x00)")
+
+_GROUP = "}"  # render() stop for a brace group
+
+_MAX_EXPANSIONS = 2000  # Macro expansions per document, against recursive definitions
+
+_HEADINGS = {"section": "h2", "subsection": "h3", "subsubsection": "h4", "paragraph": "h5"}
+
+_INLINE = {
+    "textbf": ("<strong>", "</strong>"),
+    "textit": ("<em>", "</em>"),
+    "textsl": ("<em>", "</em>"),
+    "emph": ("<em>", "</em>"),
+    "underline": ("<u>", "</u>"),
+    "uline": ("<u>", "</u>"),
+    "texttt": ("<code>", "</code>"),
+    "textsc": ('<span style="font-variant:small-caps">', "</span>"),
+    "textsuperscript": ("<sup>", "</sup>"),
+    "textsubscript": ("<sub>", "</sub>"),
+    "textnormal": ("", ""),
+    "textrm": ("", ""),
+    "textsf": ("", ""),
+    "textup": ("", ""),
+    "textmd": ("", ""),
+    "mbox": ("", ""),
+    "makebox": ("", ""),
+    "hbox": ("", ""),
+}
+
+_SIZES = {
+    "tiny": 0.5, "scriptsize": 0.7, "footnotesize": 0.8, "small": 0.9, "normalsize": 1.0,
+    "large": 1.2, "Large": 1.44, "LARGE": 1.73, "huge": 2.07, "Huge": 2.49,
+}
+
+# Declarations apply to the rest of the enclosing group
+_DECLARATIONS = {
+    "bfseries": ("<strong>", "</strong>"),
+    "bf": ("<strong>", "</strong>"),
+    "itshape": ("<em>", "</em>"),
+    "slshape": ("<em>", "</em>"),
+    "it": ("<em>", "</em>"),
+    "em": ("<em>", "</em>"),
+    "ttfamily": ("<code>", "</code>"),
+    "tt": ("<code>", "</code>"),
+    "scshape": ('<span style="font-variant:small-caps">', "</span>"),
+    **{name: (f'<span style="font-size:{size}em">', "</span>") for name, size in _SIZES.items()},
+}
+
+_SYMBOLS = {
+    "textbar": "|", "vert": "|", "mid": "|", "textbullet": "•", "bullet": "•", "cdot": "·",
+    "textperiodcentered": "·", "times": "×", "sim": "~", "textasciitilde": "~",
+    "textasciicircum": "^", "textbackslash": "\\", "approx": "≈", "leq": "≤", "geq": "≥",
+    "pm": "±", "infty": "∞", "to": "→", "rightarrow": "→", "leftarrow": "←",
+    "Rightarrow": "⇒", "ldots": "…", "dots": "…", "cdots": "⋯", "textendash": "–",
+    "textemdash": "—", "textregistered": "®", "texttrademark": "™", "copyright": "©",
+    "textcopyright": "©", "S": "§", "textdegree": "°", "checkmark": "✓",
+    "LaTeX": "LaTeX", "TeX": "TeX", "quad": " ", "qquad": "  ", "enspace": " ",
+    "thinspace": " ", ",": " ", " ": " ", "ss": "ß",
+}
+
+# Commands dropped with their arguments, by number of mandatory arguments
+_SKIPPED = {
+    "documentclass": 1, "usepackage": 1, "RequirePackage": 1, "vspace": 1, "setlength": 2,
+    "addtolength": 2, "pagestyle": 1, "thispagestyle": 1, "pagenumbering": 1, "definecolor": 3,
+    "color": 1, "pagecolor": 1, "titleformat": 5, "titlespacing": 4, "setlist": 1, "label": 1,
+    "hypersetup": 1, "geometry": 1, "input": 1, "include": 1, "includegraphics": 1,
+    "bibliographystyle": 1, "bibliography": 1, "addbibresource": 1, "fontsize": 2, "linespread": 1,
+    "setcounter": 2, "addtocounter": 2, "newlength": 1, "urlstyle": 1, "cline": 1, "cmidrule": 1,
+    "phantom": 1, "hphantom": 1, "vphantom": 1, "rule": 2, "enlargethispage": 1, "fancyhf": 1,
+    "fancyhead": 1, "fancyfoot": 1, "setmainfont": 1, "setsansfont": 1, "usetikzlibrary": 1,
+    "raggedright": 0, "raggedleft": 0, "centering": 0, "noindent": 0, "indent": 0, "hline": 0,
+    "toprule": 0, "midrule": 0, "bottomrule": 0, "maketitle": 0, "smallskip": 0, "medskip": 0,
+    "bigskip": 0, "vfill": 0, "clearpage": 0, "newpage": 0, "pagebreak": 0, "nopagebreak": 0,
+    "selectfont": 0, "normalfont": 0, "titlerule": 0, "sloppy": 0, "frenchspacing": 0, "nobreak": 0,
+    "protect": 0, "leavevmode": 0, "strut": 0, "relax": 0, "ignorespaces": 0, "par": 0, "today": 0,
+}
+
+_ESCAPED = set("&%$#_{}")
+
+_MACRO_DEFINITIONS = {"newcommand", "renewcommand", "providecommand", "DeclareRobustCommand"}
+_DEF_COMMANDS = {"def", "gdef", "edef", "xdef"}
+
+_LISTS = {"itemize": "ul", "enumerate": "ol", "description": "dl"}
+_ALIGNED = {"center": "center", "flushleft": "left", "flushright": "right"}
+_TABLES = {"tabular": 0, "tabular*": 1, "tabularx": 1}  # Width arguments before the column spec
+_VERBATIM = {"verbatim", "verbatim*", "lstlisting", "minted"}
+_MATH = {
+    "math", "displaymath", "equation", "equation*", "align", "align*", "gather", "gather*",
+    "multline", "multline*", "eqnarray", "eqnarray*",
+}
+
+_SAFE_SCHEMES = {"http", "https", "mailto", "tel"}
+
+
+@dataclass
+class _Context:
+    """State shared by a document's renderer and the renderers of its arguments."""
+    macros: Dict[str, Tuple[int, Optional[str], str]] = field(default_factory=dict)
+    environments: Dict[str, Tuple[int, Optional[str], str, str]] = field(default_factory=dict)
+    open_environments: List[str] = field(default_factory=list)
+    unsupported: Set[str] = field(default_factory=set)
+    expansions: int = 0
+
+
+def _text(value: str) -> str:
+    value = html.escape(value.replace("\x00", ""), quote=False)
+    return (value.replace("---", "—").replace("--", "–")
+            .replace("``", "“").replace("''", "”"))
+
+
+def _block(markup: str) -> str:
+    return f"{PAR}{BLOCK}{markup}{PAR}"
+
+
+def _wrap(content: str, open_tag: str, close_tag: str) -> str:
+    """Wrap each run of inline content, so tags never straddle a line, item, cell or block."""
+    if not open_tag:
+        return content
+    parts = _MARKERS.split(content)
+    return "".join(
+        part if _MARKERS.fullmatch(part) or part.startswith(BLOCK) or not part.strip()
+        else f"{open_tag}{part}{close_tag}"
+        for part in parts
+    )
+
+
+def _lines(content: str) -> str:
+    """Resolve line breaks and \\hfill in inline content; stray structure markers are dropped."""
+    content = _COLSPAN.sub("", content.replace(ITEM, "").replace(LABEL_END, "").replace(CELL, "&amp;"))
+    lines = content.split(BR)
+    while lines and not lines[-1].strip():
+        lines.pop()
+    out = []
+    previous_row = True
+    for line in lines:
+        if HFILL in line:
+            cells = "".join(f"<span>{cell.strip()}</span>" for cell in line.split(HFILL))
+            out.append(f'<span style="display:flex;justify-content:space-between">{cells}</span>')
+            previous_row = True
+            continue
+        if not previous_row:
+            out.append("<br>")
+        out.append(line)
+        previous_row = False
+    return "".join(out).strip()
+
+
+def _flow(content: str, paragraphs: bool = True) -> str:
+    """Resolve paragraph breaks: blocks pass through, inline runs become paragraphs."""
+    chunks = []
+    for chunk in content.split(PAR):
+        if chunk.startswith(BLOCK):
+            chunks.append(chunk[len(BLOCK):])
+            continue
+        text = _lines(chunk)
+        if text:
+            chunks.append(f"<p>{text}</p>" if paragraphs else text)
+    return "\n".join(chunks)
+
+
+def _math_text(source: str) -> str:
+    def symbol(match: re.Match) -> str:
+        return _SYMBOLS.get(match.group(1), "")
+    plain = re.sub(r"\\([A-Za-z]+|.)", symbol, source)
+    return _text(re.sub(r"[{}^_]", "", plain).strip())
+
+
+def _safe_url(url: str) -> Optional[str]:
+    url = re.sub(r"\\([#_%&$~])", r"\1", url.strip())
+    scheme = re.match(r"([A-Za-z][A-Za-z0-9+.-]*):", url)
+    if scheme is None:
+        return f"https://{url}" if url else None
+    return url if scheme.group(1).lower() in _SAFE_SCHEMES else None
+
+
+def _column_alignments(spec: str) -> List[str]:
+    spec = re.sub(r"\*\{(\d+)\}\{([^{}]*)\}", lambda m: m.group(2) * int(m.group(1)), spec)
+    spec = re.sub(r"[@!<>]\{(?:[^{}]|\{[^{}]*\})*\}", "", spec)
+    spec = re.sub(r"[pmb]\{[^{}]*\}", "l", spec)
+    return [{"l": "left", "c": "center", "r": "right", "X": "left"}[c] for c in spec if c in "lcrX"]
+
+
+def _parameters(body: str, args: List[str]) -> str:
+    # TeX tokenized the body when it was defined: \small#1 is \small, then the argument
+    body = re.sub(r"(\\[A-Za-z@]+)(?=#[1-9])", r"\1 ", body)
+    return re.sub(r"##|#([1-9])", lambda m: "#" if m.group(1) is None else (
+        args[int(m.group(1)) - 1] if int(m.group(1)) <= len(args) else ""), body)
+
+
+class _Renderer:
+    def __init__(self, source: str, context: _Context):
+        self.tokens: List[Token] = list(tokenize(source))
+        self.pos = 0
+        self.context = context
+        self.document: Optional[str] = None
+
+    # ─── Token access ───────────────────────────────────────────
+
+    def _peek(self) -> Optional[Token]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _skip_spaces(self, newline: bool = True) -> None:
+        """Skip the blanks TeX ignores between arguments: spaces and at most one line break."""
+        seen_newline = not newline
+        while self.pos < len(self.tokens):
+            tok = self.tokens[self.pos]
+            if tok.kind == "text" and not tok.value.strip():
+                self.pos += 1
+            elif tok.kind == "newline" and not seen_newline:
+                seen_newline = True
+                self.pos += 1
+            else:
+                return
+
+    def _splice(self, source: str) -> None:
+        self.tokens[self.pos:self.pos] = list(tokenize(source))
+
+    def _raw_arg(self) -> str:
+        """Source of the next argument: a brace group's contents, or a single token."""
+        self._skip_spaces()
+        tok = self._peek()
+        if tok is None:
+            return ""
+        self.pos += 1
+        if tok.kind == "open":
+            depth, parts = 1, []
+            while self.pos < len(self.tokens):
+                tok = self.tokens[self.pos]
+                self.pos += 1
+                depth += {"open": 1, "close": -1}.get(tok.kind, 0)
+                if depth == 0:
+                    break
+                parts.append(tok.value)
+            return "".join(parts)
+        if tok.kind == "text" and len(tok.value) > 1:
+            self.pos -= 1
+            self.tokens[self.pos] = Token("text", tok.value[1:], tok.start + 1, tok.end, tok.line)
+            return tok.value[0]
+        return tok.value
+
+    def _raw_optional(self, spaces: bool = True) -> Optional[str]:
+        """Source of an optional [argument], which may itself contain braces."""
+        if spaces:
+            start = self.pos
+            self._skip_spaces(newline=False)
+        tok = self._peek()
+        if tok is not None and tok.kind == "option":
+            self.pos += 1
+            return tok.value[1:-1]
+        if tok is None or tok.kind != "text" or tok.value != "[":
+            if spaces:
+                self.pos = start
+            return None
+        self.pos += 1
+        depth, parts = 0, []
+        while self.pos < len(self.tokens):
+            tok = self.tokens[self.pos]
+            self.pos += 1
+            if tok.kind == "text" and depth == 0 and "]" in tok.value:
+                before, _, after = tok.value.partition("]")
+                parts.append(before)
+                if after:
+                    self.pos -= 1
+                    self.tokens[self.pos] = Token("text", after, tok.end - len(after), tok.end, tok.line)
+                break
+            depth += {"open": 1, "close": -1}.get(tok.kind, 0)
+            parts.append(tok.value)
+        return "".join(parts)
+
+    def _skip_optionals(self) -> None:
+        while self._raw_optional() is not None:
+            pass
+
+    def _render_source(self, source: str) -> str:
+        child = _Renderer(source, self.context)
+        return child.render()
+
+    def _arg(self) -> str:
+        return self._render_source(self._raw_arg())
+
+    # ─── Rendering ──────────────────────────────────────────────
+
+    def render(self, stop: Optional[str] = None) -> str:
+        """
+        Render until `stop` — _GROUP for the close of a brace group, an environment
+        name for its \\end, None for the end of input — and consume it.
+        """
+        out = []
+        while self.pos < len(self.tokens):
+            tok = self.tokens[self.pos]
+            self.pos += 1
+            kind = tok.kind
+            if kind == "text" or kind == "option":
+                out.append(_text(tok.value))
+            elif kind == "newline":
+                out.append(PAR if self._blank_line() else " ")
+            elif kind == "comment":
+                if self._peek() is not None and self._peek().kind == "newline":
+                    self.pos += 1  # TeX drops the line end after a comment too
+            elif kind == "placeholder":
+                out.append(f'<span class="placeholder">{_text(tok.value)}</span>')
+            elif kind == "open":
+                out.append(self.render(_GROUP))
+            elif kind == "close":
+                if stop == _GROUP:
+                    return "".join(out)
+            elif kind == "special":
+                out.append(self._special(tok))
+            else:
+                name = tok.value[1:]
+                if name == "end":
+                    at = self.pos - 1
+                    env = self._raw_arg().strip()
+                    if env in self.context.environments:
+                        self._splice(self.context.environments[env][3])
+                    elif env == stop:
+                        return "".join(out)
+                    elif env in self.context.open_environments:
+                        self.pos = at  # Closes an enclosing environment; let it see the \end
+                        return "".join(out)
+                elif name in _DECLARATIONS:
+                    open_tag, close_tag = _DECLARATIONS[name]
+                    out.append(_wrap(self.render(stop), open_tag, close_tag))
+                    return "".join(out)
+                else:
+                    out.append(self._command(name))
+        return "".join(out)
+
+    def _blank_line(self) -> bool:
+        """At a line break: consume the following blank lines if there are any."""
+        start = self.pos
+        blank = False
+        while True:
+            self._skip_spaces(newline=False)
+            tok = self._peek()
+            if tok is None or tok.kind != "newline":
+                break
+            self.pos += 1
+            blank = True
+        if not blank:
+            self.pos = start
+        return blank
+
+    def _special(self, tok: Token) -> str:
+        if tok.value == "~":
+            return "&nbsp;"
+        if tok.value == "&":
+            return CELL
+        if tok.value == "^":
+            return "^"
+        # Inline or display math: rendered as its plain-text approximation
+        display = self._peek() is not None and self._peek().value == "$"
+        if display:
+            self.pos += 1
+        parts = []
+        while self.pos < len(self.tokens):
+            tok = self.tokens[self.pos]
+            self.pos += 1
+            if tok.kind == "special" and tok.value == "$":
+                if display and self._peek() is not None and self._peek().value == "$":
+                    self.pos += 1
+                break
+            parts.append(tok.value)
+        return f'<span class="math">{_math_text("".join(parts))}</span>'
+
+    def _math_until(self, closing: str) -> str:
+        parts = []
+        while self.pos < len(self.tokens):
+            tok = self.tokens[self.pos]
+            self.pos += 1
+            if tok.kind == "command" and tok.value == closing:
+                break
+            parts.append(tok.value)
+        return f'<span class="math">{_math_text("".join(parts))}</span>'
+
+    def _command(self, name: str) -> str:
+        if name in _ESCAPED:
+            return _text(name)
+        if name == "\\":
+            tok = self._peek()
+            if tok is not None and tok.kind == "text" and tok.value.startswith("*"):
+                self.tokens[self.pos] = Token("text", tok.value[1:], tok.start + 1, tok.end, tok.line)
+            self._raw_optional(spaces=False)
+            return BR
+        if name in ("newline", "linebreak"):
+            return BR
+        if name in ("(", "["):
+            return self._math_until("\\)" if name == "(" else "\\]")
+        if name in _SYMBOLS:
+            return _text(_SYMBOLS[name])
+        if name == "item":
+            label = self._raw_optional(spaces=False)
+            return ITEM if label is None else f"{ITEM}{self._render_source(label)}{LABEL_END}"
+        if name == "begin":
+            return self._environment(self._raw_arg().strip())
+        if name.rstrip("*") in _HEADINGS:
+            self._raw_optional()
+            tag = _HEADINGS[name.rstrip("*")]
+            return _block(f"<{tag}>{_lines(self._arg())}</{tag}>")
+        if name in _INLINE:
+            self._skip_optionals()
+            return _wrap(self._arg(), *_INLINE[name])
+        if name == "textcolor":
+            color = self._raw_arg().strip()
+            content = self._arg()
+            if re.fullmatch(r"[A-Za-z]+", color):
+                return _wrap(content, f'<span style="color:{color}">', "</span>")
+            return content
+        if name == "href":
+            url = _safe_url(self._raw_arg())
+            content = self._arg()
+            if url is None:
+                return content
+            return _wrap(content, f'<a href="{html.escape(url)}" target="_blank" rel="noopener noreferrer">', "</a>")
+        if name == "url":
+            raw = self._raw_arg()
+            url = _safe_url(raw)
+            text = _text(re.sub(r"\\([#_%&$~])", r"\1", raw))
+            if url is None:
+                return text
+            return f'<a href="{html.escape(url)}" target="_blank" rel="noopener noreferrer">{text}</a>'
+        if name in ("hfill", "hfil"):
+            return HFILL
+        if name.rstrip("*") == "hspace":
+            return HFILL if "fill" in self._raw_arg() else " "
+        if name == "multicolumn":
+            span = self._raw_arg().strip()
+            alignments = _column_alignments(self._raw_arg())
+            content = self._arg()
+            align = alignments[0] if alignments else ""
+            return f"\x00colspan:{span if span.isdigit() else 1}:{align}\x00{content}"
+        if name in _MACRO_DEFINITIONS:
+            self._define_macro(name)
+            return ""
+        if name in _DEF_COMMANDS:
+            self._define_def()
+            return ""
+        if name in ("newenvironment", "renewenvironment"):
+            self._define_environment()
+            return ""
+        if name in self.context.macros:
+            self._expand(name)
+            return ""
+        if name.rstrip("*") in _SKIPPED:
+            self._skip_optionals()
+            for _ in range(_SKIPPED[name.rstrip("*")]):
+                self._raw_arg()
+                self._skip_optionals()
+            return ""
+        if name and (name[0].isalpha() or name[0] == "@"):
+            self.context.unsupported.add(f"\\{name}")
+        return ""
+
+    # ─── Macros ─────────────────────────────────────────────────
+
+    def _signature(self) -> Tuple[int, Optional[str]]:
+        count = self._raw_optional()
+        default = self._raw_optional() if count else None
+        try:
+            return int(count or 0), default
+        except ValueError:
+            return 0, default
+
+    def _define_macro(self, command: str) -> None:
+        if self._peek() is not None and self._peek().value == "*":
+            self.pos += 1
+        name = self._raw_arg().strip().lstrip("\\")
+        nargs, default = self._signature()
+        body = self._raw_arg()
+        if command == "providecommand" and name in self.context.macros:
+            return
+        if name and not self._renders_natively(name):
+            self.context.macros[name] = (nargs, default, body)
+
+    def _define_def(self) -> None:
+        tok = self._peek()
+        if tok is None or tok.kind != "command":
+            return
+        self.pos += 1
+        parameters = []
+        while self._peek() is not None and self._peek().kind not in ("open", "newline"):
+            parameters.append(self.tokens[self.pos].value)
+            self.pos += 1
+        body = self._raw_arg()
+        name = tok.value[1:]
+        if not self._renders_natively(name):
+            self.context.macros[name] = ("".join(parameters).count("#"), None, body)
+
+    def _define_environment(self) -> None:
+        name = self._raw_arg().strip()
+        nargs, default = self._signature()
+        begin, end = self._raw_arg(), self._raw_arg()
+        if name and name not in _LISTS and name not in _TABLES and name not in _ALIGNED:
+            self.context.environments[name] = (nargs, default, begin, end)
+
+    @staticmethod
+    def _renders_natively(name: str) -> bool:
+        # Templates restyle \section and friends; the preview keeps its own rendering
+        return (name in _INLINE or name in _DECLARATIONS or name in _SYMBOLS
+                or name.rstrip("*") in _HEADINGS or name in ("item", "href", "url", "begin", "end"))
+
+    def _arguments(self, nargs: int, default: Optional[str]) -> List[str]:
+        args = []
+        if default is not None:
+            optional = self._raw_optional()
+            args.append(default if optional is None else optional)
+        while len(args) < nargs:
+            args.append(self._raw_arg())
+        return args
+
+    def _expand(self, name: str) -> None:
+        self.context.expansions += 1
+        if self.context.expansions > _MAX_EXPANSIONS:
+            self.context.unsupported.add(f"\\{name} (recursive)")
+            return
+        nargs, default, body = self.context.macros[name]
+        self._splice(_parameters(body, self._arguments(nargs, default)))
+
+    # ─── Environments ───────────────────────────────────────────
+
+    def _body(self, env: str) -> str:
+        self.context.open_environments.append(env)
+        try:
+            return self.render(env)
+        finally:
+            self.context.open_environments.pop()
+
+    def _environment(self, env: str) -> str:
+        if env in self.context.environments:
+            self.context.expansions += 1
+            if self.context.expansions <= _MAX_EXPANSIONS:
+                nargs, default, begin, _ = self.context.environments[env]
+                self._splice(_parameters(begin, self._arguments(nargs, default)))
+            return ""
+        if env == "document":
+            self.document = _flow(self._body(env))
+            self.pos = len(self.tokens)  # Anything after \end{document} is ignored
+            return ""
+        if env in _LISTS:
+            self._skip_optionals()
+            return self._list(_LISTS[env], self._body(env))
+        if env in _TABLES:
+            width = self._raw_arg() if _TABLES[env] else ""
+            self._raw_optional()
+            alignments = _column_alignments(self._raw_arg())
+            return self._table(alignments, self._body(env), full_width="width" in width)
+        if env in _ALIGNED:
+            return _block(f'<div style="text-align:{_ALIGNED[env]}">{_flow(self._body(env))}</div>')
+        if env in ("quote", "quotation"):
+            return _block(f"<blockquote>{_flow(self._body(env))}</blockquote>")
+        if env == "minipage":
+            self._skip_optionals()
+            width = re.fullmatch(r"\s*([\d.]+)\s*\\(?:text|line|column)width\s*", self._raw_arg())
+            style = f' style="display:inline-block;vertical-align:top;width:{float(width.group(1)) * 100:g}%"' \
+                if width else ""
+            return f"<div{style}>{_flow(self._body(env), paragraphs=False)}</div>"
+        if env in _VERBATIM or env in _MATH:
+            if env == "minted":
+                self._skip_optionals()
+                self._raw_arg()
+            raw = self._verbatim(env)
+            if env in _MATH:
+                return _block(f'<div class="math">{_math_text(raw)}</div>')
+            return _block(f"<pre>{html.escape(raw.strip(chr(10)), quote=False)}</pre>")
+        self.context.unsupported.add(f"\\begin{{{env}}}")
+        return _block(f"<div>{_flow(self._body(env))}</div>")
+
+    def _verbatim(self, env: str) -> str:
+        parts = []
+        while self.pos < len(self.tokens):
+            tok = self.tokens[self.pos]
+            self.pos += 1
+            if tok.kind == "command" and tok.value == "\\end":
+                at = self.pos
+                if self._raw_arg().strip() == env:
+                    break
+                self.pos = at
+            parts.append(tok.value)
+        return "".join(parts)
+
+    @staticmethod
+    def _list(tag: str, content: str) -> str:
+        items = []
+        for item in content.split(ITEM)[1:]:
+            label = None
+            if LABEL_END in item:
+                label, item = item.split(LABEL_END, 1)
+            body = _flow(item, paragraphs=False)
+            if tag == "dl":
+                items.append(f"<dt>{_lines(label or '')}</dt><dd>{body}</dd>")
+            elif label is not None:
+                items.append(f'<li style="list-style-type:none">{_lines(label)} {body}</li>')
+            else:
+                items.append(f"<li>{body}</li>")
+        return _block(f"<{tag}>{''.join(items)}</{tag}>")
+
+    @staticmethod
+    def _table(alignments: List[str], content: str, full_width: bool) -> str:
+        rows = [row for row in content.replace(PAR, " ").split(BR)]
+        if rows and not rows[-1].replace(CELL, "").strip():
+            rows.pop()
+        out = []
+        for row in rows:
+            cells = []
+            column = 0
+            for cell in row.split(CELL):
+                span, align = 1, alignments[column] if column < len(alignments) else ""
+                marker = _COLSPAN.search(cell)
+                if marker:
+                    span = int(marker.group(1))
+                    align = marker.group(2) or align
+                attributes = f' colspan="{span}"' if span > 1 else ""
+                if align:
+                    attributes += f' style="text-align:{align}"'
+                cells.append(f"<td{attributes}>{_flow(cell, paragraphs=False)}</td>")
+                column += span
+            out.append(f"<tr>{''.join(cells)}</tr>")
+        style = ' style="width:100%"' if full_width else ""
+        return _block(f"<table{style}>{''.join(out)}</table>")
+
+
+def render_preview(latex_content: str) -> LatexPreviewResponse:
+    """
+    Render a LaTeX document, or a fragment of one, to an HTML preview.
+    A full document renders only its body; its preamble contributes macro definitions.
+    """
+    context = _Context()
+    renderer = _Renderer(latex_content, context)
+    body = renderer.render()
+    markup = renderer.document if renderer.document is not None else _flow(body)
+    return LatexPreviewResponse(html=markup, unsupported=sorted(context.unsupported))
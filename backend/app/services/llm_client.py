@@ -3,26 +3,120 @@ Centralized LLM client with rate limiting and error handling.
 """
 import time
 import logging
-from typing import Optional, List, Dict, Any
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional, List, Dict, Any, Iterator, Tuple
 from openai import OpenAI
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+
+@dataclass
+class LLMUsage:
+    """Token usage of the LLM calls made inside a track_usage() block."""
+    calls: int = 0
+    prompt_tokens: int = 0
+    cached_tokens: int = 0  # Prompt tokens served from the provider's prefix cache
+    completion_tokens: int = 0
+
+
+# Active usage scopes; worker threads join them by running in a copied context
+_usage_scopes: ContextVar[Tuple[LLMUsage, ...]] = ContextVar("llm_usage_scopes", default=())
+_usage_lock = threading.Lock()
+
+
+@contextmanager
+def track_usage() -> Iterator[LLMUsage]:
+    """Accumulate token usage of every LLM call made in this block (scopes nest)."""
+    usage = LLMUsage()
+    token = _usage_scopes.set(_usage_scopes.get() + (usage,))
+    try:
+        yield usage
+    finally:
+        _usage_scopes.reset(token)
+
+
+def _record_usage(response: Any) -> None:
+    """Log a response's token usage and add it to the active usage scopes."""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = getattr(details, "cached_tokens", None) or 0
+    logger.info(f"LLM call successful. Tokens used: {usage.total_tokens} (cached prompt tokens: {cached})")
+    with _usage_lock:
+        for scope in _usage_scopes.get():
+            scope.calls += 1
+            scope.prompt_tokens += usage.prompt_tokens or 0
+            scope.cached_tokens += cached
+            scope.completion_tokens += usage.completion_tokens or 0
+
+
+class LLMCancelled(Exception):
+    """The LLM call's cancel scope was set before or while it ran."""
+
+
+# Cancel flag of the enclosing cancel_scope(); worker threads join it by running in a copied context
+_cancel_events: ContextVar[Optional[threading.Event]] = ContextVar("llm_cancel_event", default=None)
+
+
+@contextmanager
+def cancel_scope(cancel: threading.Event) -> Iterator[None]:
+    """
+    Abort the LLM calls made in this block once `cancel` is set: streamed calls
+    close their stream at the next chunk, calls not yet sent are never sent.
+    """
+    token = _cancel_events.set(cancel)
+    try:
+        yield
+    finally:
+        _cancel_events.reset(token)
+
+
+def cancellable() -> bool:
+    """Whether LLM calls made here run inside a cancel_scope() (and so should stream)."""
+    return _cancel_events.get() is not None
+
+
+def _check_cancelled() -> None:
+    cancel = _cancel_events.get()
+    if cancel is not None and cancel.is_set():
+        raise LLMCancelled("LLM request cancelled")
+
 # Simple in-memory rate limiter
 _request_timestamps: List[float] = []
+# Calls may come from worker threads (parallel section generation)
+_rate_limit_lock = threading.Lock()
 
 
 def _rate_limit_check():
     """Enforce rate limiting on LLM API calls."""
-    now = time.time()
     global _request_timestamps
-    # Remove timestamps older than 60 seconds
-    _request_timestamps = [ts for ts in _request_timestamps if now - ts < 60]
-    if len(_request_timestamps) >= settings.RATE_LIMIT_PER_MINUTE:
-        wait_time = 60 - (now - _request_timestamps[0])
-        raise Exception(f"LLM rate limit exceeded. Please wait {wait_time:.0f} seconds.")
-    _request_timestamps.append(now)
+    with _rate_limit_lock:
+        now = time.time()
+        # Remove timestamps older than 60 seconds
+        _request_timestamps = [ts for ts in _request_timestamps if now - ts < 60]
+        if len(_request_timestamps) >= settings.RATE_LIMIT_PER_MINUTE:
+            wait_time = 60 - (now - _request_timestamps[0])
+            raise Exception(f"LLM rate limit exceeded. Please wait {wait_time:.0f} seconds.")
+        _request_timestamps.append(now)
+
+
+# Upstream requests in flight across the whole process, whichever request or worker issues them
+_concurrency = threading.BoundedSemaphore(max(1, settings.LLM_MAX_CONCURRENCY))
+
+
+@contextmanager
+def _concurrency_slot() -> Iterator[None]:
+    """Hold one of the LLM_MAX_CONCURRENCY request slots, waiting for one to free up."""
+    _concurrency.acquire()
+    try:
+        yield
+    finally:
+        _concurrency.release()
 
 
 def get_openai_client() -> OpenAI:
@@ -70,20 +164,75 @@ def call_llm(
         kwargs["response_format"] = response_format
 
     try:
-        response = client.chat.completions.create(**kwargs)
+        with _concurrency_slot():
+            _check_cancelled()
+            response = client.chat.completions.create(**kwargs)
         content = response.choices[0].message.content
-        logger.info(f"LLM call successful. Tokens used: {response.usage.total_tokens}")
+        _record_usage(response)
         return content
     except Exception as e:
         logger.error(f"LLM API call failed: {str(e)}")
         raise
 
 
+def stream_llm(
+    system_prompt: str,
+    user_prompt: str,
+    temperature: float = 0.3,
+    max_tokens: int = 4096,
+    response_format: Optional[Dict[str, Any]] = None,
+) -> Iterator[str]:
+    """
+    Make a rate-limited streaming call, yielding content deltas as they arrive.
+    Closing the generator early closes the HTTP stream, cancelling the request upstream.
+    The stream holds a concurrency slot until it ends or is closed. Inside a
+    cancel_scope() it stops with LLMCancelled at the first chunk after the scope is set.
+    """
+    _rate_limit_check()
+
+    client = get_openai_client()
+
+    kwargs = {
+        "model": "gpt-4o",
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ],
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "stream": True,
+        # Usage arrives in a final chunk, which an aborted stream never receives
+        "extra_body": {"stream_options": {"include_usage": True}},
+    }
+
+    if response_format:
+        kwargs["response_format"] = response_format
+
+    with _concurrency_slot():
+        _check_cancelled()
+        try:
+            stream = client.chat.completions.create(**kwargs)
+        except Exception as e:
+            logger.error(f"LLM API call failed: {str(e)}")
+            raise
+
+        try:
+            for chunk in stream:
+                _check_cancelled()
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+                if getattr(chunk, "usage", None):
+                    _record_usage(chunk)
+        finally:
+            stream.response.close()
+
+
 def call_llm_with_history(
     system_prompt: str,
     messages: List[Dict[str, str]],
     temperature: float = 0.3,
     max_tokens: int = 4096,
+    response_format: Optional[Dict[str, Any]] = None,
 ) -> str:
     """
     Make a rate-limited LLM call with conversation history.
@@ -93,6 +242,7 @@ def call_llm_with_history(
         messages: List of {"role": "user"|"assistant", "content": "..."} messages
         temperature: LLM temperature
         max_tokens: Maximum response tokens
+        response_format: Optional response format specification
 
     Returns:
         The LLM response text
@@ -104,13 +254,20 @@ def call_llm_with_history(
     full_messages = [{"role": "system", "content": system_prompt}]
     full_messages.extend(messages)
 
+    kwargs = {
+        "model": "gpt-4o",
+        "messages": full_messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+    }
+    if response_format:
+        kwargs["response_format"] = response_format
+
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=full_messages,
-            temperature=temperature,
-            max_tokens=max_tokens,
-        )
+        with _concurrency_slot():
+            _check_cancelled()
+            response = client.chat.completions.create(**kwargs)
+        _record_usage(response)
         return response.choices[0].message.content
     except Exception as e:
         logger.error(f"LLM API call failed: {str(e)}")
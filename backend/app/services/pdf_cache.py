@@ -0,0 +1,256 @@
+"""
+PDF Cache Service.
+Content-addressed store for compiled PDFs, keyed by a hash of the LaTeX source
+and the compiler configuration. Byte-identical sources (a chat turn that changed
+nothing, a re-render, two users with the same template and content) share one
+file and skip compilation entirely. Bytes live in the configured artifact store;
+GeneratedResume.pdf_path holds the artifact key (`<hash>.pdf`).
+
+An entry is referenced while any GeneratedResume.pdf_path points at it. When the
+cache outgrows LATEX_PDF_CACHE_MAX_MB, unreferenced entries are evicted least
+recently used first; unreferenced entries unused for LATEX_ARTIFACT_RETENTION_DAYS
+are expired regardless of size.
+"""
+import os
+import time
+import hashlib
+import logging
+import threading
+from typing import Iterable, List, Optional, Set, Tuple
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models.generated_resume import GeneratedResume
+from app.schemas.schemas import CompileReport
+from app.services.artifact_store import get_artifact_store
+
+logger = logging.getLogger(__name__)
+
+# Bump when compiler changes alter the PDF produced for the same source
+_CACHE_VERSION = "1"
+
+_stats_lock = threading.Lock()
+_hits = 0
+_misses = 0
+_evict_lock = threading.Lock()
+_approx_bytes: Optional[int] = None  # Running total, resynced by every eviction pass
+_last_eviction = 0.0
+
+# Minimum time between eviction passes triggered by stores
+_EVICTION_INTERVAL_SECONDS = 60
+
+
+def cache_key(latex_content: str) -> str:
+    config = f"{_CACHE_VERSION}\0{settings.LATEX_MAX_RUNS}"
+    return hashlib.sha256(f"{config}\0{latex_content}".encode("utf-8")).hexdigest()
+
+
+def artifact_key(key: str) -> str:
+    return f"{key}.pdf"
+
+
+def is_artifact_key(pdf_path: Optional[str]) -> bool:
+    """Whether a pdf_path is an artifact key, rather than a local path from before the artifact store."""
+    return bool(pdf_path) and pdf_path.endswith(".pdf") and not os.path.isabs(pdf_path)
+
+
+def lookup(latex_content: str) -> Optional[str]:
+    """Artifact key of the cached PDF for this source, marking it recently used."""
+    global _hits, _misses
+    key = artifact_key(cache_key(latex_content))
+    if not get_artifact_store().touch(key):
+        with _stats_lock:
+            _misses += 1
+        return None
+    with _stats_lock:
+        _hits += 1
+    return key
+
+
+def _report_key(pdf_key: str) -> str:
+    return pdf_key[:-len(".pdf")] + ".json"
+
+
+def store(latex_content: str, pdf_path: str, report: Optional[CompileReport] = None) -> str:
+    """Move a freshly compiled PDF (and its compile report) into the cache; return its artifact key."""
+    key = artifact_key(cache_key(latex_content))
+    artifacts = get_artifact_store()
+    if report is not None:
+        artifacts.put_bytes(_report_key(key), report.model_dump_json().encode("utf-8"))
+    size = os.path.getsize(pdf_path)
+    artifacts.put_file(key, pdf_path)
+    _account(size)
+    return key
+
+
+def load_report(pdf_key: str) -> Optional[CompileReport]:
+    """The compile report stored beside a cached PDF, if any."""
+    try:
+        data = get_artifact_store().get_bytes(_report_key(pdf_key))
+        return CompileReport.model_validate_json(data) if data is not None else None
+    except (OSError, ValueError):
+        return None
+
+
+def _account(added: int) -> None:
+    global _approx_bytes, _last_eviction
+    with _stats_lock:
+        if _approx_bytes is None:
+            _approx_bytes = cache_usage()[1]
+        else:
+            _approx_bytes += added
+        due = (
+            _approx_bytes > settings.LATEX_PDF_CACHE_MAX_MB * 1024 * 1024
+            and time.monotonic() - _last_eviction >= _EVICTION_INTERVAL_SECONDS
+            and not _evict_lock.locked()
+        )
+        if due:
+            _last_eviction = time.monotonic()
+    if due:
+        threading.Thread(target=_evict_in_background, daemon=True).start()
+
+
+def _evict_in_background() -> None:
+    db = SessionLocal()
+    try:
+        evict(db)
+    except Exception as e:
+        logger.error(f"PDF cache eviction failed: {e}")
+    finally:
+        db.close()
+
+
+def _entries() -> List[Tuple[float, int, str]]:
+    """(last used, size, key) for every cached PDF."""
+    return [
+        (info.last_used, info.size, info.key)
+        for info in get_artifact_store().list()
+        if info.key.endswith(".pdf")
+    ]
+
+
+def _resync(total: int) -> None:
+    global _approx_bytes
+    with _stats_lock:
+        _approx_bytes = total
+
+
+def cache_usage() -> Tuple[int, int]:
+    """(entries, total bytes) currently cached."""
+    entries = _entries()
+    return len(entries), sum(size for _, size, _ in entries)
+
+
+def cache_counters() -> Tuple[int, int]:
+    """(hits, misses) since startup."""
+    with _stats_lock:
+        return _hits, _misses
+
+
+def referenced_paths(db: Session, paths: Iterable[str]) -> Set[str]:
+    """The subset of `paths` (artifact keys or legacy local paths) some GeneratedResume still points at."""
+    paths = list(paths)
+    referenced: Set[str] = set()
+    for start in range(0, len(paths), 500):
+        rows = db.query(GeneratedResume.pdf_path).filter(
+            GeneratedResume.pdf_path.in_(paths[start:start + 500])
+        ).all()
+        referenced.update(row[0] for row in rows)
+    return referenced
+
+
+def discard(key: str) -> bool:
+    """Delete a cached PDF and its report; False if it was already gone."""
+    artifacts = get_artifact_store()
+    if not artifacts.delete(key):
+        return False
+    artifacts.delete(_report_key(key))
+    return True
+
+
+def discard_if_unreferenced(db: Session, pdf_path: Optional[str]) -> bool:
+    """Delete a PDF once no resume points at it, e.g. after its resume is deleted."""
+    if not pdf_path or not pdf_path.endswith(".pdf") or referenced_paths(db, [pdf_path]):
+        return False
+    return discard_path(pdf_path)
+
+
+def discard_path(pdf_path: str) -> bool:
+    """
+    Delete a PDF no resume references any more, by artifact key or legacy local path.
+    Local paths from before the artifact store are only removed under LATEX_OUTPUT_DIR.
+    """
+    if is_artifact_key(pdf_path):
+        removed = discard(pdf_path)
+    else:
+        output_dir = os.path.abspath(settings.LATEX_OUTPUT_DIR)
+        if os.path.commonpath([output_dir, os.path.abspath(pdf_path)]) != output_dir:
+            return False
+        removed = False
+        for path in (pdf_path, pdf_path[:-len(".pdf")] + ".json"):
+            try:
+                os.remove(path)
+                removed = removed or path == pdf_path
+            except FileNotFoundError:
+                pass
+    if removed:
+        logger.info(f"Deleted unreferenced PDF {pdf_path}")
+    return removed
+
+
+def expire(db: Session) -> int:
+    """
+    Delete unreferenced entries not used for LATEX_ARTIFACT_RETENTION_DAYS,
+    whatever the cache size. Returns the number deleted.
+    """
+    if settings.LATEX_ARTIFACT_RETENTION_DAYS <= 0:
+        return 0
+    with _evict_lock:
+        entries = _entries()
+        total = sum(size for _, size, _ in entries)
+        cutoff = time.time() - settings.LATEX_ARTIFACT_RETENTION_DAYS * 86400
+        candidates = [(size, path) for last_used, size, path in entries if last_used < cutoff]
+        referenced = referenced_paths(db, [path for _, path in candidates])
+        expired = 0
+        for size, path in candidates:
+            if path not in referenced and discard(path):
+                total -= size
+                expired += 1
+        _resync(total)
+        if expired:
+            logger.info(f"Expired {expired} cached PDFs unused for {settings.LATEX_ARTIFACT_RETENTION_DAYS} days")
+        return expired
+
+
+def evict(db: Session) -> int:
+    """
+    Delete unreferenced entries, least recently used first, until the cache fits
+    LATEX_PDF_CACHE_MAX_MB. Entries used within LATEX_PDF_CACHE_MIN_AGE_SECONDS are
+    kept, as their resume may not be committed yet. Returns the number deleted.
+    """
+    with _evict_lock:
+        entries = sorted(_entries())
+        budget = settings.LATEX_PDF_CACHE_MAX_MB * 1024 * 1024
+        total = sum(size for _, size, _ in entries)
+        _resync(total)
+        if total <= budget:
+            return 0
+
+        cutoff = time.time() - settings.LATEX_PDF_CACHE_MIN_AGE_SECONDS
+        candidates = [e for e in entries if e[0] < cutoff]
+        referenced = referenced_paths(db, [path for _, _, path in candidates])
+
+        evicted = 0
+        for _, size, path in candidates:
+            if total <= budget:
+                break
+            if path in referenced or not discard(path):
+                continue
+            total -= size
+            evicted += 1
+        _resync(total)
+        if evicted:
+            logger.info(f"Evicted {evicted} cached PDFs; cache now {total / (1024 * 1024):.1f} MB")
+        elif total > budget:
+            logger.warning("PDF cache over budget but every entry is referenced or recent")
+        return evicted
@@ -5,8 +5,24 @@ NEVER regenerates the full template — only modifies %%PLACEHOLDER%% sections.
 """
 import json
 import logging
-from typing import List, Dict, Any, Optional
-from app.services.llm_client import call_llm
+import threading
+import contextvars
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+from sqlalchemy import Update, update
+from app.config import settings
+from app.services.llm_client import call_llm, cancellable, stream_llm, LLMCancelled
+from app.services.structured_output import (
+    loads, response_format, section_model, StreamingJSONParser, StructuredOutputError,
+)
+from app.services.guardrail_validator import completed_prefix, validate_sections
+from app.services.latex_lexer import find_placeholders
+from app.services.latex_preflight import repair
+from app.services.section_renderers import has_renderer, render_sections, RenderContext, USER_SECTIONS
+from app.models.user import User
 from app.models.project import Project
 from app.models.experience import Experience
 
@@ -22,44 +38,66 @@ CRITICAL RULES:
 5. Use professional, concise language appropriate for resumes.
 6. Tailor the content to match the job description while ONLY using provided data.
 
-You MUST return valid JSON with these keys (each value is a LaTeX string):
-{
-  "summary": "LaTeX content for professional summary",
-  "skills": "LaTeX content for skills section",
-  "projects": "LaTeX content for projects section",
-  "experiences": "LaTeX content for experience section"
-}
+You MUST return valid JSON with exactly the keys requested at the end of the message (each value is a LaTeX string).
 
 IMPORTANT: Escape LaTeX special characters properly. Use \\\\textbf, \\\\item, etc."""
 
+RESUME_SECTIONS = ["summary", "skills", "projects", "experiences"]
 
-def generate_resume_content(
-    job_description: str,
+# Sections the LLM writes; the rest render deterministically from the database
+PROSE_SECTIONS = [name for name in RESUME_SECTIONS if not has_renderer(name)]
+
+SECTION_DESCRIPTIONS = {
+    "summary": "LaTeX content for professional summary",
+    "skills": "LaTeX content for skills section",
+    "projects": "LaTeX content for projects section",
+    "experiences": "LaTeX content for experience section",
+}
+
+
+def _section_model(sections: List[str]):
+    """Pydantic model of the generation reply for the requested sections."""
+    return section_model(tuple(sections), tuple((name, SECTION_DESCRIPTIONS[name]) for name in sections))
+
+
+def _output_schema(sections: List[str]) -> str:
+    """Render the JSON shape the model must return for the requested sections."""
+    lines = [f'  "{name}": "{SECTION_DESCRIPTIONS[name]}"' for name in sections]
+    return "{\n" + ",\n".join(lines) + "\n}"
+
+
+def _repair_instruction(repair_violations: Dict[str, List[str]]) -> str:
+    """Describe guardrail violations from a previous attempt so the model can fix them."""
+    lines = [f"- {name}: {', '.join(terms)}" for name, terms in repair_violations.items() if terms]
+    return (
+        "\n\nREPAIR: Your previous output for these sections mentioned terms that are NOT in the "
+        "verified data. Rewrite the sections without them:\n" + "\n".join(lines)
+    )
+
+
+# Which verified-data blocks each section needs when generated on its own
+SECTION_CONTEXT = {
+    "summary": ("skills", "projects", "experiences"),
+    "skills": ("skills",),
+    "projects": ("skills", "projects"),
+    "experiences": ("skills", "experiences"),
+}
+
+SECTION_MAX_TOKENS = 1536
+
+
+def _build_context_blocks(
     matched_skills: List[str],
     ranked_projects: List[Dict[str, Any]],
     experiences: List[Experience],
-    domain: str,
-    seniority: str,
+    max_projects: Optional[int] = 5,
 ) -> Dict[str, str]:
-    """
-    Generate resume placeholder content using only verified user data.
-
-    Args:
-        job_description: The target job description
-        matched_skills: ONLY skills verified from user's database
-        ranked_projects: Projects ranked by relevance
-        experiences: User's work experiences
-        domain: Target job domain
-        seniority: Target seniority level
-
-    Returns:
-        Dict mapping placeholder names to LaTeX content
-    """
+    """Render the verified data into prompt blocks, keyed like SECTION_CONTEXT."""
     # Build context from verified data only
     skills_text = ", ".join(matched_skills) if matched_skills else "No matching skills"
 
     projects_text = ""
-    for i, proj in enumerate(ranked_projects[:5], 1):
+    for i, proj in enumerate(ranked_projects[:max_projects], 1):
         projects_text += f"\n{i}. {proj['title']}: {proj['description']}"
         if proj.get('technologies'):
             projects_text += f" (Technologies: {proj['technologies']})"
@@ -72,75 +110,513 @@ def generate_resume_content(
         if exp.technologies:
             experiences_text += f" (Technologies: {exp.technologies})"
 
-    user_prompt = f"""Job Description:
+    return {
+        "skills": f"VERIFIED SKILLS (use ONLY these):\n{skills_text}",
+        "projects": f"VERIFIED PROJECTS (use ONLY these):\n{projects_text}",
+        "experiences": f"VERIFIED EXPERIENCES (use ONLY these):\n{experiences_text}",
+    }
+
+
+@dataclass(frozen=True)
+class ProfileContext:
+    """A user's whole verified profile rendered into prompt blocks, keyed like SECTION_CONTEXT."""
+    user_id: str
+    revision: int
+    blocks: Dict[str, str]
+
+
+_PROFILE_CACHE_SIZE = 256
+_profile_contexts: "OrderedDict[str, ProfileContext]" = OrderedDict()
+_profile_lock = threading.Lock()
+
+
+def bump_profile_revision(user_id: str) -> Update:
+    """
+    The UPDATE that invalidates a user's memoized profile. The increment happens in
+    SQL, so concurrent edits each get their own revision instead of writing the same one.
+    """
+    return update(User).where(User.id == user_id).values(profile_revision=User.profile_revision + 1)
+
+
+def get_profile_context(
+    user: Any,
+    skills: List[Any],
+    projects: List[Project],
+    experiences: List[Experience],
+) -> ProfileContext:
+    """
+    Return the rendered profile blocks for the user's current profile revision.
+    Rows are rendered in a canonical order so the blocks are byte-identical for
+    every request until the profile changes.
+    """
+    revision = user.profile_revision or 0
+    with _profile_lock:
+        cached = _profile_contexts.get(user.id)
+        if cached and cached.revision == revision:
+            _profile_contexts.move_to_end(user.id)
+            return cached
+
+    def canonical(rows):
+        return sorted(rows, key=lambda row: (row.created_at or datetime.min, row.id or ""))
+
+    ranked_projects = [
+        {"title": p.title, "description": p.description, "technologies": p.technologies, "impact": p.impact}
+        for p in canonical(projects)
+    ]
+    blocks = _build_context_blocks(
+        sorted({s.name for s in skills}, key=str.lower),
+        ranked_projects,
+        canonical(experiences),
+        max_projects=None,
+    )
+    context = ProfileContext(user_id=user.id, revision=revision, blocks=blocks)
+
+    with _profile_lock:
+        _profile_contexts[user.id] = context
+        _profile_contexts.move_to_end(user.id)
+        while len(_profile_contexts) > _PROFILE_CACHE_SIZE:
+            _profile_contexts.popitem(last=False)
+    return context
+
+
+def _focus_block(matched_skills: List[str], ranked_projects: List[Dict[str, Any]]) -> str:
+    """Job-specific emphasis over the full profile: matched skills and project ranking."""
+    skills_text = ", ".join(matched_skills) if matched_skills else "None"
+    projects_text = "".join(f"\n{i}. {proj['title']}" for i, proj in enumerate(ranked_projects[:5], 1))
+    return (
+        f"EMPHASIZE these skills that match the job:\n{skills_text}\n\n"
+        f"FEATURE these projects, most relevant first:{projects_text or ' None'}"
+    )
+
+
+def _build_user_prompt(
+    job_description: str,
+    domain: str,
+    seniority: str,
+    blocks: List[str],
+    sections: List[str],
+    repair_violations: Optional[Dict[str, List[str]]] = None,
+    focus: Optional[str] = None,
+) -> str:
+    """
+    Assemble the user prompt: verified data blocks first, job-specific text last.
+    With a memoized profile the leading blocks are byte-identical across requests,
+    so together with the constant system prompt they form a cacheable prefix.
+    """
+    context = "\n\n".join(blocks)
+    focus_text = f"{focus}\n\n" if focus else ""
+    user_prompt = f"""{context}
+
+Job Description:
 {job_description}
 
 Domain: {domain}
 Seniority: {seniority}
 
-VERIFIED SKILLS (use ONLY these):
-{skills_text}
+{focus_text}Generate LaTeX content for each placeholder. Remember: use ONLY the verified data above, do not add anything else.
+
+Return JSON with these keys:
+{_output_schema(sections)}"""
 
-VERIFIED PROJECTS (use ONLY these):
-{projects_text}
+    if repair_violations:
+        user_prompt += _repair_instruction(repair_violations)
+    return user_prompt
 
-VERIFIED EXPERIENCES (use ONLY these):
-{experiences_text}
 
-Generate LaTeX content for each placeholder. Remember: use ONLY the data above, do not add anything else."""
+class GenerationAborted(Exception):
+    """A streamed generation was cancelled because a section violated the guardrail."""
+
+    def __init__(self, violations: Dict[str, List[str]], completed: Dict[str, str]):
+        super().__init__(f"Generation aborted on guardrail violations: {violations}")
+        self.violations = violations
+        self.completed = completed  # Sections that finished cleanly before the abort
+
+
+def _repair_sections(content: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply the preflight linter's mechanical fixes (escaping, closing braces) to each section."""
+    if not settings.LATEX_PREFLIGHT:
+        return content
+    return {
+        key: repair(value, fragment=True)[0] if isinstance(value, str) else value
+        for key, value in content.items()
+    }
+
+
+def _request_sections(
+    user_prompt: str,
+    sections: List[str],
+    max_tokens: int = 4096,
+    temperature: float = 0.2,
+    authorized_terms: Optional[List[str]] = None,
+) -> Dict[str, str]:
+    """
+    Ask the model for the given sections and parse its JSON reply. The reply is
+    streamed for the incremental guardrail, and inside a cancel scope so that a
+    cancelled generation stops paying for tokens.
+    """
+    guard_terms = authorized_terms if settings.STREAMING_GUARDRAIL else None
+    if guard_terms is not None or cancellable():
+        return _stream_sections(user_prompt, sections, max_tokens, temperature, guard_terms)
 
     response = call_llm(
         system_prompt=RESUME_GENERATION_PROMPT,
         user_prompt=user_prompt,
-        temperature=0.2,
-        response_format={"type": "json_object"},
+        temperature=temperature,
+        max_tokens=max_tokens,
+        response_format=response_format("resume_sections", _section_model(sections)),
     )
 
     try:
-        content = json.loads(response)
+        content = loads(response)
         # Ensure all expected keys exist
-        for key in ["summary", "skills", "projects", "experiences"]:
+        for key in sections:
             if key not in content:
                 content[key] = ""
-        return content
-    except json.JSONDecodeError as e:
+        return _repair_sections(content)
+    except (StructuredOutputError, TypeError) as e:
         logger.error(f"Failed to parse resume generation response: {e}")
         raise ValueError(f"Resume generation failed: {e}")
 
 
-def fill_template(template_latex: str, content: Dict[str, str], user: Optional[Any] = None) -> str:
+def _stream_sections(
+    user_prompt: str,
+    sections: List[str],
+    max_tokens: int,
+    temperature: float,
+    authorized_terms: Optional[List[str]],
+) -> Dict[str, str]:
     """
-    Replace markers in the template with generated content and user info.
-    Supports %%KEY%%, {{key}}, and [[key]] styles (case-insensitive).
+    Stream the reply, validating each section's completed lines and items as they arrive.
+    On the first definite violation the stream is closed, which cancels the request,
+    and GenerationAborted is raised so the caller can start a repair attempt at once.
+    Without authorized_terms the reply is streamed unchecked.
+    """
+    parser = StreamingJSONParser()
+    checked: Dict[str, int] = {}
+    stream = stream_llm(
+        system_prompt=RESUME_GENERATION_PROMPT,
+        user_prompt=user_prompt,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        response_format=response_format("resume_sections", _section_model(sections)),
+    )
+    try:
+        for chunk in stream:
+            if authorized_terms is None:
+                parser.feed(chunk)
+                continue
+            candidates = [(key, value, True) for key, value in parser.feed(chunk)]
+            # Line and item boundaries only arrive in chunks with a newline or backslash
+            if "\\" in chunk or "\n" in chunk:
+                partial = parser.partial_field()
+                if partial:
+                    candidates.append((partial[0], partial[1], False))
+
+            for key, text, complete in candidates:
+                name = key.lower()
+                if not isinstance(text, str):
+                    continue
+                checked_text = text if complete else completed_prefix(text)
+                if not complete and len(checked_text) <= checked.get(name, 0):
+                    continue
+                checked[name] = len(checked_text)
+                violations = validate_sections({name: checked_text}, authorized_terms)
+                if violations:
+                    logger.warning(f"Aborting streamed generation: section '{name}' mentions {violations[name]}")
+                    completed = {
+                        k.lower(): v for k, v in parser.fields.items()
+                        if k.lower() != name and isinstance(v, str)
+                    }
+                    raise GenerationAborted(violations, _repair_sections(completed))
+    finally:
+        stream.close()
+
+    try:
+        content = parser.close()
+    except StructuredOutputError as e:
+        logger.error(f"Failed to parse resume generation response: {e}")
+        raise ValueError(f"Resume generation failed: {e}")
+    # A reply cut off by max_tokens or a dropped connection keeps only its finished fields
+    received = {key.lower() for key in content}
+    missing = [key for key in sections if key not in received]
+    if missing:
+        logger.error(f"Truncated resume generation response; missing sections {missing}")
+        raise ValueError(f"Resume generation failed: reply ended before sections {missing}")
+    return _repair_sections(content)
+
+
+def generate_resume_content(
+    job_description: str,
+    matched_skills: List[str],
+    ranked_projects: List[Dict[str, Any]],
+    experiences: List[Experience],
+    domain: str,
+    seniority: str,
+    sections: Optional[List[str]] = None,
+    repair_violations: Optional[Dict[str, List[str]]] = None,
+    parallel: Optional[bool] = None,
+    temperature: float = 0.2,
+    profile: Optional[ProfileContext] = None,
+    authorized_terms: Optional[List[str]] = None,
+) -> Dict[str, str]:
+    """
+    Generate resume placeholder content using only verified user data.
+
+    Args:
+        job_description: The target job description
+        matched_skills: ONLY skills verified from user's database
+        ranked_projects: Projects ranked by relevance
+        experiences: User's work experiences
+        domain: Target job domain
+        seniority: Target seniority level
+        sections: Sections to generate (defaults to PROSE_SECTIONS)
+        repair_violations: Guardrail violations per section from a previous attempt
+        parallel: One concurrent request per section (defaults to PARALLEL_SECTION_GENERATION)
+        temperature: LLM temperature for this generation
+        profile: The user's memoized profile; when given, the whole profile forms the
+            stable prompt prefix and the JD-specific selection moves to the suffix
+        authorized_terms: When given (and STREAMING_GUARDRAIL is on), replies are streamed
+            and cancelled on the first guardrail violation, raising GenerationAborted
+
+    Returns:
+        Dict mapping placeholder names to LaTeX content
+    """
+    sections = sections or PROSE_SECTIONS
+    if parallel is None:
+        parallel = settings.PARALLEL_SECTION_GENERATION
+
+    if profile is not None:
+        blocks = profile.blocks
+        focus = _focus_block(matched_skills, ranked_projects)
+    else:
+        blocks = _build_context_blocks(matched_skills, ranked_projects, experiences)
+        focus = None
+
+    if parallel and len(sections) > 1:
+        return _generate_sections_parallel(
+            job_description, domain, seniority, blocks, sections, repair_violations or {}, temperature, focus,
+            authorized_terms,
+        )
+
+    user_prompt = _build_user_prompt(
+        job_description, domain, seniority,
+        [blocks["skills"], blocks["projects"], blocks["experiences"]],
+        sections,
+        repair_violations,
+        focus,
+    )
+    return _request_sections(user_prompt, sections, temperature=temperature, authorized_terms=authorized_terms)
+
+
+def _generate_one_section(
+    job_description: str,
+    domain: str,
+    seniority: str,
+    blocks: Dict[str, str],
+    section: str,
+    repair_violations: Dict[str, List[str]],
+    temperature: float = 0.2,
+    focus: Optional[str] = None,
+    authorized_terms: Optional[List[str]] = None,
+) -> str:
+    """Generate a single section from the verified data it needs."""
+    user_prompt = _build_user_prompt(
+        job_description, domain, seniority,
+        [blocks[name] for name in SECTION_CONTEXT[section]],
+        [section],
+        {section: repair_violations[section]} if repair_violations.get(section) else None,
+        focus,
+    )
+    content = _request_sections(
+        user_prompt, [section], max_tokens=SECTION_MAX_TOKENS, temperature=temperature,
+        authorized_terms=authorized_terms,
+    )
+    normalized = {k.lower(): v for k, v in content.items()}
+    return normalized.get(section, "")
+
+
+def _generate_sections_parallel(
+    job_description: str,
+    domain: str,
+    seniority: str,
+    blocks: Dict[str, str],
+    sections: List[str],
+    repair_violations: Dict[str, List[str]],
+    temperature: float = 0.2,
+    focus: Optional[str] = None,
+    authorized_terms: Optional[List[str]] = None,
+) -> Dict[str, str]:
+    """
+    Issue one focused request per section concurrently and assemble the results.
+    A section whose request fails is retried on its own before giving up; sections
+    aborted on a guardrail violation are reported together once the rest finish.
+    """
+    results: Dict[str, str] = {}
+    failed: Dict[str, Exception] = {}
+    aborted: Dict[str, List[str]] = {}
+
+    workers = max(1, min(len(sections), settings.LLM_MAX_CONCURRENCY))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            # Copied context, so LLM usage is counted in the caller's track_usage() scope
+            executor.submit(
+                contextvars.copy_context().run, _generate_one_section,
+                job_description, domain, seniority, blocks, section, repair_violations, temperature, focus,
+                authorized_terms,
+            ): section
+            for section in sections
+        }
+        for future, section in futures.items():
+            try:
+                results[section] = future.result()
+            except GenerationAborted as e:
+                aborted.update(e.violations)
+            except LLMCancelled:
+                raise
+            except Exception as e:
+                logger.warning(f"Section '{section}' generation failed: {e}. Retrying on its own...")
+                failed[section] = e
+
+    for section in list(failed):
+        try:
+            results[section] = _generate_one_section(
+                job_description, domain, seniority, blocks, section, repair_violations, temperature, focus,
+                authorized_terms,
+            )
+            del failed[section]
+        except GenerationAborted as e:
+            del failed[section]
+            aborted.update(e.violations)
+        except Exception as e:
+            failed[section] = e
+
+    if failed:
+        raise ValueError(f"Resume generation failed for sections {sorted(failed)}: {list(failed.values())[0]}")
+    if aborted:
+        raise GenerationAborted(aborted, results)
+
+    return results
+
+
+# Singular spellings used by older templates, resolved to the generated section
+PLACEHOLDER_ALIASES = {"experience": "experiences", "project": "projects", "skill": "skills"}
+
+_COMPILED_CACHE_SIZE = 256
+_compiled_templates: "OrderedDict[str, Tuple[Any, CompiledTemplate]]" = OrderedDict()
+_compiled_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """
+    A template parsed once into literal chunks and placeholder slots.
+    There is always one more literal than there are slots.
+    """
+    literals: Tuple[str, ...]
+    slots: Tuple[Tuple[str, str], ...]  # (placeholder key, original marker text)
+
+    @property
+    def keys(self) -> List[str]:
+        return list(dict.fromkeys(key for key, _ in self.slots))
+
+    @property
+    def unknown_placeholders(self) -> List[str]:
+        return [
+            key for key in self.keys
+            if PLACEHOLDER_ALIASES.get(key, key) not in RESUME_SECTIONS and not has_renderer(key)
+        ]
+
+
+def compile_template(template_latex: str) -> CompiledTemplate:
+    """Parse a template into literal chunks and %%KEY%% / {{key}} / [[key]] slots."""
+    literals = []
+    slots = []
+    last = 0
+    for placeholder in find_placeholders(template_latex):
+        literals.append(template_latex[last:placeholder.start])
+        slots.append((placeholder.key.lower(), placeholder.value))
+        last = placeholder.end
+    literals.append(template_latex[last:])
+    return CompiledTemplate(literals=tuple(literals), slots=tuple(slots))
+
+
+def get_compiled_template(template: Any) -> CompiledTemplate:
+    """
+    Return the compiled form of a ResumeTemplate, cached by id and updated_at.
+    Templates are compiled when saved, so generation normally hits the cache.
     """
-    result = template_latex
-    
+    with _compiled_lock:
+        cached = _compiled_templates.get(template.id)
+        if cached and cached[0] == template.updated_at:
+            _compiled_templates.move_to_end(template.id)
+            return cached[1]
+
+    # Parsed outside the lock; two threads compiling one template produce the same result
+    compiled = compile_template(template.latex_content)
+    with _compiled_lock:
+        _compiled_templates[template.id] = (template.updated_at, compiled)
+        _compiled_templates.move_to_end(template.id)
+        while len(_compiled_templates) > _COMPILED_CACHE_SIZE:
+            _compiled_templates.popitem(last=False)
+    return compiled
+
+
+def render_template(compiled: CompiledTemplate, content: Dict[str, str], user: Optional[Any] = None) -> str:
+    """Fill a compiled template in a single join. Unknown keys keep their marker."""
     # Standardize markers
     full_content = {k.lower(): v for k, v in content.items()}
     if user:
-        full_content.update({
-            "full_name": user.full_name,
-            "email": user.email,
-        })
-
-    # Loop over all potential keys found in the template using regex for robustness
-    import re
-    
-    # 1. Replace {{key}}, [[key]], %%key%% styles (case-insensitive)
-    for key, value in full_content.items():
-        # Build patterns that match the key case-insensitively within markers
-        patterns = [
-            (rf"{{{{\s*{re.escape(key)}\s*}}}}", str(value)),
-            (rf"\[\[\s*{re.escape(key)}\s*\]\]", str(value)),
-            (rf"%%\s*{re.escape(key)}\s*%%", str(value)),
-        ]
-        
-        for pattern, replacement in patterns:
-            result = re.sub(pattern, lambda m: replacement, result, flags=re.IGNORECASE)
-    
+        full_content.update(render_sections(USER_SECTIONS, RenderContext(user=user)))
+
+    parts = [compiled.literals[0]]
+    for (key, marker), literal in zip(compiled.slots, compiled.literals[1:]):
+        if key in full_content:
+            parts.append(str(full_content[key]))
+        elif PLACEHOLDER_ALIASES.get(key) in full_content:
+            parts.append(str(full_content[PLACEHOLDER_ALIASES[key]]))
+        else:
+            parts.append(marker)
+        parts.append(literal)
+    result = "".join(parts)
+
     # Safety check: Ensure no content is appended after \end{document}
     if "\\end{document}" in result:
         parts = result.split("\\end{document}")
         result = parts[0] + "\\end{document}"
         
     return result
+
+
+def fill_template(template_latex: str, content: Dict[str, str], user: Optional[Any] = None) -> str:
+    """
+    Replace markers in the template with generated content and user info.
+    Supports %%KEY%%, {{key}}, and [[key]] styles (case-insensitive).
+    """
+    return render_template(compile_template(template_latex), content, user)
+
+
+def rerender_resume(
+    resume: Any,
+    compiled: CompiledTemplate,
+    user: Optional[Any] = None,
+    rendered_from: Optional[CompiledTemplate] = None,
+) -> Optional[str]:
+    """
+    Re-render a stored resume's section content into a compiled template, no LLM call.
+
+    Returns None when the resume has no stored sections, or when a section placed by
+    the template it was rendered from (`rendered_from`, defaulting to its current
+    template) no longer appears verbatim in its output, i.e. it was edited since
+    generation and re-rendering would lose the edit.
+    """
+    if not resume.section_content:
+        return None
+    sections = json.loads(resume.section_content)
+    if rendered_from is None and resume.template is not None:
+        rendered_from = get_compiled_template(resume.template)
+    placed = sections.keys()
+    if rendered_from is not None:
+        placed = {PLACEHOLDER_ALIASES.get(key, key) for key in rendered_from.keys}
+    if any(sections.get(name) and str(sections[name]) not in resume.latex_output for name in placed):
+        return None
+    return render_template(compiled, sections, user)
@@ -0,0 +1,127 @@
+"""
+Section Renderers.
+Registry of sections rendered deterministically from database data instead of
+by the LLM. Output is built only from verified records, so it needs no
+guardrail validation and never triggers a regeneration.
+"""
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from app.services.skill_matcher import fuzzy_match
+
+logger = logging.getLogger(__name__)
+
+_LATEX_ESCAPES = {
+    "\\": r"\textbackslash{}",
+    "&": r"\&",
+    "%": r"\%",
+    "$": r"\$",
+    "#": r"\#",
+    "_": r"\_",
+    "{": r"\{",
+    "}": r"\}",
+    "~": r"\textasciitilde{}",
+    "^": r"\textasciicircum{}",
+}
+
+# Placeholders filled from the user record rather than generated content
+USER_SECTIONS = ("full_name", "email", "header")
+
+
+def escape_latex(text: Optional[str]) -> str:
+    """Escape LaTeX special characters in plain text taken from the database."""
+    if not text:
+        return ""
+    return "".join(_LATEX_ESCAPES.get(ch, ch) for ch in str(text))
+
+
+@dataclass
+class RenderContext:
+    """Verified data available to deterministic renderers."""
+    user: Any = None
+    skills: List[Any] = field(default_factory=list)  # Skill rows
+    matched_skills: List[str] = field(default_factory=list)  # JD skills that matched the user's
+
+
+Renderer = Callable[[RenderContext], Optional[str]]
+
+_RENDERERS: Dict[str, Renderer] = {}
+
+
+def register_renderer(name: str) -> Callable[[Renderer], Renderer]:
+    """Register a deterministic renderer for a section or placeholder name."""
+    def decorator(func: Renderer) -> Renderer:
+        _RENDERERS[name] = func
+        return func
+    return decorator
+
+
+def has_renderer(name: str) -> bool:
+    return name in _RENDERERS
+
+
+def render_sections(names: Iterable[str], context: RenderContext) -> Dict[str, str]:
+    """
+    Render every registered section among `names`.
+    Renderers return None when their data is missing; those sections are omitted.
+    """
+    rendered = {}
+    for name in names:
+        renderer = _RENDERERS.get(name)
+        if renderer is None:
+            continue
+        output = renderer(context)
+        if output is not None:
+            rendered[name] = output
+    return rendered
+
+
+@register_renderer("skills")
+def render_skills(context: RenderContext) -> Optional[str]:
+    """Matched skills grouped by Skill.category, strongest first within a group."""
+    if not context.skills:
+        return None
+
+    selected = [s for s in context.skills if fuzzy_match(s.name, context.matched_skills)]
+    if not selected:
+        # Nothing matched the JD; list the whole verified profile instead
+        selected = list(context.skills)
+
+    groups: Dict[str, List[Any]] = {}
+    for skill in selected:
+        groups.setdefault(skill.category or "Other", []).append(skill)
+
+    lines = ["\\begin{itemize}"]
+    for category in sorted(groups, key=lambda c: (c == "Other", c.lower())):
+        ordered = sorted(groups[category], key=lambda s: (-(s.proficiency_level or 0), s.name.lower()))
+        names = ", ".join(escape_latex(s.name) for s in ordered)
+        lines.append(f"  \\item \\textbf{{{escape_latex(category)}}}: {names}")
+    lines.append("\\end{itemize}")
+    return "\n".join(lines)
+
+
+@register_renderer("full_name")
+def render_full_name(context: RenderContext) -> Optional[str]:
+    if context.user is None:
+        return None
+    return escape_latex(context.user.full_name)
+
+
+@register_renderer("email")
+def render_email(context: RenderContext) -> Optional[str]:
+    if context.user is None:
+        return None
+    return escape_latex(context.user.email)
+
+
+@register_renderer("header")
+def render_header(context: RenderContext) -> Optional[str]:
+    """Centered name and contact line."""
+    if context.user is None:
+        return None
+    return (
+        "\\begin{center}\n"
+        f"  {{\\Large \\textbf{{{escape_latex(context.user.full_name)}}}}} \\\\\n"
+        f"  {escape_latex(context.user.email)}\n"
+        "\\end{center}"
+    )
@@ -15,7 +15,7 @@ def _normalize(skill: str) -> str:
     return skill.lower().strip().replace("-", " ").replace("_", " ").replace(".", "")
 
 
-def _fuzzy_match(skill: str, user_skills: List[str]) -> bool:
+def fuzzy_match(skill: str, user_skills: List[str]) -> bool:
     """
     Check if a skill matches any user skill with fuzzy matching.
     Handles cases like 'react.js' matching 'react' or 'reactjs'.
@@ -82,13 +82,13 @@ def match_skills(jd_analysis: JDAnalysis, user_skill_names: List[str]) -> SkillM
     missing = []
 
     for skill in all_jd_skills:
-        if _fuzzy_match(skill, user_skill_names):
+        if fuzzy_match(skill, user_skill_names):
             matched.append(skill)
         else:
             missing.append(skill)
 
     # Calculate required skill match percentage
-    required_matched = [s for s in jd_analysis.required_skills if _fuzzy_match(s, user_skill_names)]
+    required_matched = [s for s in jd_analysis.required_skills if fuzzy_match(s, user_skill_names)]
     required_total = max(len(jd_analysis.required_skills), 1)
     required_match_pct = len(required_matched) / required_total
 
@@ -98,7 +98,7 @@ def match_skills(jd_analysis: JDAnalysis, user_skill_names: List[str]) -> SkillM
 
     # Generate improvement suggestions
     suggestions = []
-    missing_required = [s for s in jd_analysis.required_skills if not _fuzzy_match(s, user_skill_names)]
+    missing_required = [s for s in jd_analysis.required_skills if not fuzzy_match(s, user_skill_names)]
     if missing_required:
         suggestions.append(
             f"Consider learning these required skills: {', '.join(missing_required[:5])}"
@@ -0,0 +1,138 @@
+"""
+Speculative Generation Service.
+Runs several candidate generations concurrently and keeps the first one that
+passes the guardrail, trading token spend for predictable tail latency. Candidates
+stream inside a shared cancel scope, so the losers stop as soon as a winner is
+picked.
+"""
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+from app.config import settings
+from app.services.llm_client import LLMCancelled, LLMUsage, cancel_scope, track_usage
+
+logger = logging.getLogger(__name__)
+
+# In-flight candidate generations per user, bounded by SPECULATIVE_USER_BUDGET
+_inflight: Dict[str, int] = {}
+_inflight_lock = threading.Lock()
+
+
+@dataclass
+class Candidate:
+    index: int
+    temperature: float
+    content: Optional[Dict[str, str]] = None
+    violations: Dict[str, List[str]] = field(default_factory=dict)
+    error: Optional[str] = None
+    latency_ms: float = 0.0
+    usage: LLMUsage = field(default_factory=LLMUsage)
+
+    @property
+    def passed(self) -> bool:
+        return self.content is not None and self.error is None and not self.violations
+
+    @property
+    def violation_count(self) -> int:
+        return sum(len(terms) for terms in self.violations.values())
+
+
+def reserve_candidates(user_id: str, requested: int) -> int:
+    """Reserve up to `requested` candidate slots from the user's budget."""
+    with _inflight_lock:
+        in_use = _inflight.get(user_id, 0)
+        granted = max(0, min(requested, settings.SPECULATIVE_USER_BUDGET - in_use))
+        if granted:
+            _inflight[user_id] = in_use + granted
+        return granted
+
+
+def release_candidate(user_id: str) -> None:
+    """Return one candidate slot to the user's budget."""
+    with _inflight_lock:
+        remaining = _inflight.get(user_id, 0) - 1
+        if remaining > 0:
+            _inflight[user_id] = remaining
+        else:
+            _inflight.pop(user_id, None)
+
+
+def _run_candidate(
+    index: int,
+    temperature: float,
+    generate: Callable[[float], Dict[str, str]],
+    validate: Callable[[Dict[str, str]], Dict[str, List[str]]],
+    cancel: threading.Event,
+) -> Candidate:
+    candidate = Candidate(index=index, temperature=temperature)
+    started = time.perf_counter()
+    try:
+        with cancel_scope(cancel), track_usage() as candidate.usage:
+            candidate.content = generate(temperature)
+        candidate.violations = validate(candidate.content)
+    except LLMCancelled:
+        candidate.error = "cancelled"
+    except Exception as e:
+        candidate.error = str(e)
+    candidate.latency_ms = (time.perf_counter() - started) * 1000
+    return candidate
+
+
+def run_speculative(
+    user_id: str,
+    generate: Callable[[float], Dict[str, str]],
+    validate: Callable[[Dict[str, str]], Dict[str, List[str]]],
+    temperatures: List[float],
+) -> Tuple[Optional[Candidate], List[Candidate]]:
+    """
+    Launch one candidate per temperature and return the first that passes validation.
+
+    Candidates are validated as they complete. Once one passes, the others are
+    cancelled: their LLM streams close at the next chunk, calls not yet sent are
+    skipped, and each budget slot is released as its candidate unwinds.
+
+    Args:
+        user_id: Owner of the generation, for the per-user fan-out budget
+        generate: Produces section content at a given temperature
+        validate: Returns guardrail violations per section (empty when valid)
+        temperatures: One entry per requested candidate
+
+    Returns:
+        Tuple of (winning candidate or None, all candidates that completed)
+    """
+    slots = reserve_candidates(user_id, len(temperatures))
+    if not slots:
+        logger.info(f"Speculative generation budget exhausted for user {user_id}")
+        return None, []
+
+    cancel = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=slots)
+    futures = []
+    for index, temperature in enumerate(temperatures[:slots]):
+        future = executor.submit(_run_candidate, index, temperature, generate, validate, cancel)
+        # Fires on completion and on cancellation, so every slot is returned
+        future.add_done_callback(lambda _: release_candidate(user_id))
+        futures.append(future)
+
+    winner = None
+    completed = []
+    try:
+        for future in as_completed(futures):
+            candidate = future.result()
+            completed.append(candidate)
+            if candidate.passed:
+                winner = candidate
+                break
+    finally:
+        cancel.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    if winner:
+        logger.info(
+            f"Speculative candidate {winner.index} (temperature {winner.temperature}) passed "
+            f"after {len(completed)} of {slots} completed"
+        )
+    return winner, completed
@@ -0,0 +1,283 @@
+"""
+Structured Output Service.
+One contract for LLM JSON replies: response formats built from pydantic models,
+and a tolerant parser that repairs the defects models commonly emit (code fences,
+trailing commas, unescaped LaTeX backslashes) instead of failing the whole call.
+The streaming parser pulls completed top-level fields out of a partial response.
+"""
+import copy
+import json
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar
+from pydantic import BaseModel, Field, ValidationError, create_model
+
+logger = logging.getLogger(__name__)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Keywords the provider's strict schema mode does not accept
+_UNSUPPORTED_SCHEMA_KEYS = ("default", "title")
+
+# `\n` followed by letters is usually a real newline; these are the LaTeX exceptions
+_LATEX_N_COMMANDS = ("newline", "noindent", "newpage", "normalsize", "nolinebreak", "nopagebreak", "nobreak")
+
+
+class StructuredOutputError(ValueError):
+    """The LLM reply could not be parsed or did not match the expected model."""
+
+
+def _strict(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Close every object and require all its properties, as strict mode demands."""
+    if isinstance(schema, dict):
+        for key in _UNSUPPORTED_SCHEMA_KEYS:
+            if not isinstance(schema.get(key), dict):
+                schema.pop(key, None)
+        if schema.get("type") == "object" and "properties" in schema:
+            schema["additionalProperties"] = False
+            schema["required"] = list(schema["properties"])
+        for value in schema.values():
+            _strict(value)
+    elif isinstance(schema, list):
+        for item in schema:
+            _strict(item)
+    return schema
+
+
+def json_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """JSON schema for a pydantic model, in the provider's strict dialect."""
+    return _strict(copy.deepcopy(model.model_json_schema()))
+
+
+def response_format(name: str, model: Type[BaseModel]) -> Dict[str, Any]:
+    """`response_format` argument asking the provider to enforce the model's schema."""
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": name, "schema": json_schema(model), "strict": True},
+    }
+
+
+@lru_cache(maxsize=64)
+def section_model(sections: Tuple[str, ...], descriptions: Tuple[Tuple[str, str], ...] = ()) -> Type[BaseModel]:
+    """A model with one string field per resume section, e.g. for the generation reply."""
+    described = dict(descriptions)
+    fields = {name: (str, Field(description=described.get(name, name))) for name in sections}
+    return create_model("ResumeSections", **fields)
+
+
+def _looks_like_latex(text: str, start: int) -> bool:
+    """Whether a valid JSON escape at text[start] actually begins a LaTeX command."""
+    end = start
+    while end < len(text) and text[end].isascii() and text[end].isalpha():
+        end += 1
+    word = text[start:end]
+    if not word:
+        return False
+    if word[0] == "n":
+        return word.startswith(_LATEX_N_COMMANDS)
+    # Tab, backspace, form feed or carriage return directly followed by letters: \textbf, \begin, \frac, \rule
+    return len(word) > 1
+
+
+def repair_json(text: str) -> str:
+    """
+    Repair common defects in LLM-produced JSON.
+
+    - Strips code fences and any prose around the outermost object
+    - Escapes backslashes of LaTeX commands inside strings (\\item, \\textbf, \\&)
+    - Escapes raw control characters inside strings
+    - Drops trailing commas before a closing bracket
+    """
+    start = text.find("{")
+    if start == -1:
+        return text.strip()
+    end = text.rfind("}")
+    text = text[start:end + 1] if end > start else text[start:]
+
+    out: List[str] = []
+    in_string = False
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        if in_string:
+            if ch == "\\":
+                nxt = text[i + 1] if i + 1 < len(text) else ""
+                if nxt in ('"', "\\", "/"):
+                    out.append(ch + nxt)
+                    i += 2
+                    continue
+                if nxt == "u" and len(text) >= i + 6 and all(c in "0123456789abcdefABCDEF" for c in text[i + 2:i + 6]):
+                    out.append(text[i:i + 6])
+                    i += 6
+                    continue
+                if nxt in "bfnrt" and not _looks_like_latex(text, i + 1):
+                    out.append(ch + nxt)
+                    i += 2
+                    continue
+                # Not a JSON escape (or a LaTeX command): keep the backslash literally
+                out.append("\\\\")
+                i += 1
+                continue
+            if ch == '"':
+                in_string = False
+            elif ord(ch) < 0x20:
+                out.append(json.dumps(ch)[1:-1])
+                i += 1
+                continue
+            out.append(ch)
+        elif ch == '"':
+            in_string = True
+            out.append(ch)
+        elif ch == ",":
+            j = i + 1
+            while j < len(text) and text[j].isspace():
+                j += 1
+            if j < len(text) and text[j] in "}]":
+                i += 1
+                continue
+            out.append(ch)
+        elif ch == "`":
+            pass  # Stray fence characters outside strings
+        else:
+            out.append(ch)
+        i += 1
+    return "".join(out)
+
+
+def loads(text: str) -> Any:
+    """Parse an LLM JSON reply, repairing common defects only when it is not valid JSON."""
+    if text is None:
+        raise StructuredOutputError("Empty LLM response")
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+    try:
+        return json.loads(repair_json(text))
+    except json.JSONDecodeError as e:
+        raise StructuredOutputError(f"Malformed JSON in LLM response: {e}") from e
+
+
+def parse_model(text: str, model: Type[ModelT]) -> ModelT:
+    """Parse an LLM reply into a pydantic model."""
+    data = loads(text)
+    try:
+        return model.model_validate(data)
+    except ValidationError as e:
+        raise StructuredOutputError(f"LLM response does not match {model.__name__}: {e}") from e
+
+
+class StreamingJSONParser:
+    """
+    Incremental parser for a streamed JSON object.
+
+    `feed()` scans each chunk once and returns the top-level fields whose values
+    completed in it, so callers can act on a field before the reply is finished.
+    """
+
+    def __init__(self) -> None:
+        self.fields: Dict[str, Any] = {}
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._started = False
+        self._done = False
+        self._key_start: Optional[int] = None
+        self._colon: Optional[int] = None
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        self._text += chunk
+        completed = []
+        text = self._text
+        while self._pos < len(text) and not self._done:
+            i = self._pos
+            ch = text[i]
+            self._pos += 1
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+            if not self._started:
+                if ch == "{":
+                    self._started = True
+                    self._depth = 1
+                    self._key_start = i + 1
+                continue
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    completed.extend(self._complete_field(i))
+                    self._done = True
+            elif ch == ":" and self._depth == 1 and self._colon is None:
+                self._colon = i
+            elif ch == "," and self._depth == 1:
+                completed.extend(self._complete_field(i))
+                self._key_start = i + 1
+        return completed
+
+    def _decode_field(self, value_text: str) -> Tuple[str, Any]:
+        key_text = self._text[self._key_start:self._colon]
+        key = json.loads(repair_json("{" + key_text + ": null}")).popitem()[0]
+        value = json.loads(repair_json("{\"v\": " + value_text + "}"))["v"]
+        return key, value
+
+    def _complete_field(self, end: int) -> List[Tuple[str, Any]]:
+        if self._key_start is None or self._colon is None:
+            return []
+        value_text = self._text[self._colon + 1:end]
+        if not value_text.strip():
+            self._colon = None
+            return []
+        try:
+            key, value = self._decode_field(value_text)
+        except (json.JSONDecodeError, KeyError) as e:
+            logger.warning(f"Skipping unparseable streamed field: {e}")
+            return []
+        finally:
+            self._colon = None
+        self.fields[key] = value
+        return [(key, value)]
+
+    def partial_field(self) -> Optional[Tuple[str, str]]:
+        """The top-level string field still being streamed, with its value so far."""
+        if not self._in_string or self._depth != 1 or self._colon is None:
+            return None
+        value_text = self._text[self._colon + 1:self._pos].lstrip()
+        if not value_text.startswith('"'):
+            return None
+        if self._escape:
+            value_text = value_text[:-1]  # Half an escape sequence
+        try:
+            return self._decode_field(value_text + '"')
+        except (json.JSONDecodeError, KeyError):
+            return None
+
+    def close(self) -> Dict[str, Any]:
+        """Parse the full reply; fall back to the fields completed so far if it is truncated."""
+        try:
+            parsed = loads(self._text)
+            if isinstance(parsed, dict):
+                return parsed
+        except StructuredOutputError:
+            if not self.fields:
+                raise
+            logger.warning(f"Truncated LLM response; keeping {len(self.fields)} completed fields")
+        return dict(self.fields)
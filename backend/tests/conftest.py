@@ -4,10 +4,12 @@ Uses an in-memory SQLite database for testing.
 """
 import pytest
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from fastapi.testclient import TestClient
 
-from app.database import Base, get_db
+from app.database import Base, async_url, get_async_db, get_db
 from app.main import app
 from app.models.user import User
 from app.models.skill import Skill
@@ -19,6 +21,27 @@ from app.auth.auth import hash_password, create_access_token
 SQLALCHEMY_TEST_URL = "sqlite:///./test.db"
 engine = create_engine(SQLALCHEMY_TEST_URL, connect_args={"check_same_thread": False})
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Async routers reach the same file through aiosqlite; NullPool since every TestClient runs its own event loop
+async_engine = create_async_engine(async_url(SQLALCHEMY_TEST_URL), poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+@pytest.fixture(autouse=True)
+def no_compile_workers(monkeypatch):
+    """Keep queued compiles from running in background threads; tests run jobs explicitly."""
+    from app.services import compile_queue
+    monkeypatch.setattr(compile_queue, "_ensure_workers", lambda: None)
+    yield
+    while not compile_queue._jobs.empty():
+        compile_queue._jobs.get_nowait()
+
+
+@pytest.fixture(autouse=True)
+def test_session_factory(monkeypatch):
+    """Point services that open their own sessions (compile jobs, cache eviction, GC) at the test database."""
+    from app.services import artifact_gc, compile_queue, pdf_cache
+    for module in (artifact_gc, compile_queue, pdf_cache):
+        monkeypatch.setattr(module, "SessionLocal", TestingSessionLocal)
 
 
 @pytest.fixture(scope="function")
@@ -42,7 +65,12 @@ def client(db_session):
         finally:
             pass
 
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
@@ -0,0 +1,115 @@
+"""
+Tests for compile artifact retention: garbage collection and PDF cleanup on delete.
+"""
+import os
+import time
+import pytest
+from pathlib import Path
+from app.config import settings
+from app.models.generated_resume import GeneratedResume
+from app.services import pdf_cache
+from app.services.artifact_gc import collect_garbage
+from app.services.artifact_store import get_artifact_store
+
+
+@pytest.fixture
+def output_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "LATEX_OUTPUT_DIR", str(tmp_path / "output"))
+    monkeypatch.setattr(settings, "LATEX_SCRATCH_DIR", str(tmp_path / "scratch"))
+    (tmp_path / "output").mkdir()
+    return tmp_path / "output"
+
+
+def _write(path, age_seconds=0):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("%PDF-1.5")
+    past = time.time() - age_seconds
+    os.utime(path, (past, past))
+    return str(path)
+
+
+def _cached(digest, age_seconds=0):
+    key = pdf_cache.artifact_key(digest)
+    _write(Path(get_artifact_store().path(key)), age_seconds)
+    return key
+
+
+def _stored(key):
+    return get_artifact_store().stat(key) is not None
+
+
+def _resume(db_session, user, pdf_path):
+    resume = GeneratedResume(user_id=user.id, job_description="JD", latex_output="x", pdf_path=pdf_path)
+    db_session.add(resume)
+    db_session.commit()
+    return resume
+
+
+class TestCollectGarbage:
+    def test_unreferenced_legacy_files_are_deleted(self, output_dir, db_session, test_user):
+        day = 86400
+        kept = _write(output_dir / "kept.pdf", day)
+        orphan_pdf = _write(output_dir / "orphan.pdf", day)
+        orphan_tex = _write(output_dir / "orphan.tex", day)
+        recent = _write(output_dir / "recent.pdf")
+        _resume(db_session, test_user, kept)
+
+        assert collect_garbage(db_session).legacy_files == 2
+        assert os.path.exists(kept) and os.path.exists(recent)
+        assert not os.path.exists(orphan_pdf) and not os.path.exists(orphan_tex)
+
+    def test_abandoned_scratch_is_deleted(self, output_dir, db_session):
+        scratch = output_dir.parent / "scratch" / "w0"
+        stale = scratch / "stale-job"
+        _write(stale / "stale-job.aux")
+        os.utime(stale, (time.time() - 7200, time.time() - 7200))
+        running = scratch / "running-job"
+        _write(running / "running-job.tex")
+        staged = _write(output_dir / ".staging" / "lost.pdf", 7200)
+
+        assert collect_garbage(db_session).scratch_dirs == 2
+        assert not stale.exists() and not os.path.exists(staged)
+        assert running.exists()
+
+    def test_retention_expires_unreferenced_cache_entries(self, output_dir, db_session, test_user, monkeypatch):
+        monkeypatch.setattr(settings, "LATEX_ARTIFACT_RETENTION_DAYS", 1)
+        old_day = 2 * 86400
+        referenced = _cached("aa" * 32, old_day)
+        expired = _cached("bb" * 32, old_day)
+        fresh = _cached("cc" * 32)
+        _resume(db_session, test_user, referenced)
+
+        assert collect_garbage(db_session).expired_pdfs == 1
+        assert _stored(referenced) and _stored(fresh)
+        assert not _stored(expired)
+
+    def test_retention_can_be_disabled(self, output_dir, db_session, monkeypatch):
+        monkeypatch.setattr(settings, "LATEX_ARTIFACT_RETENTION_DAYS", 0)
+        key = _cached("dd" * 32, 365 * 86400)
+        assert collect_garbage(db_session).expired_pdfs == 0
+        assert _stored(key)
+
+
+class TestDeleteResume:
+    def test_deleting_last_reference_removes_pdf(self, client, auth_headers, output_dir, db_session, test_user):
+        key = _cached("ee" * 32)
+        resume = _resume(db_session, test_user, key)
+
+        assert client.delete(f"/api/resumes/{resume.id}", headers=auth_headers).status_code in (200, 204)
+        assert not _stored(key)
+
+    def test_shared_pdf_is_kept(self, client, auth_headers, output_dir, db_session, test_user):
+        key = _cached("ff" * 32)
+        resume = _resume(db_session, test_user, key)
+        _resume(db_session, test_user, key)
+
+        client.delete(f"/api/resumes/{resume.id}", headers=auth_headers)
+        assert _stored(key)
+
+    def test_paths_outside_output_dir_are_never_removed(self, output_dir, tmp_path, db_session):
+        outside = _write(tmp_path / "elsewhere.pdf")
+        assert pdf_cache.discard_if_unreferenced(db_session, outside) is False
+        assert os.path.exists(outside)
+
+    def test_gc_endpoint_requires_admin(self, client, auth_headers):
+        assert client.post("/api/admin/artifacts/gc", headers=auth_headers).status_code == 403
@@ -0,0 +1,83 @@
+"""
+Tests for the async database path: URL mapping and CRUD routers served on the event loop.
+"""
+import asyncio
+import threading
+from unittest.mock import patch
+import anyio
+import httpx
+import pytest
+from app.database import async_url
+from app.main import app
+from app.models.generated_resume import GeneratedResume
+from app.models.resume_template import ResumeTemplate
+
+
+class TestAsyncUrl:
+    @pytest.mark.parametrize("url,expected", [
+        ("sqlite:///./test.db", "sqlite+aiosqlite:///./test.db"),
+        ("postgresql://user:pass@db:5432/resumes", "postgresql+asyncpg://user:pass@db:5432/resumes"),
+        ("postgresql+psycopg2://user:pass@db/resumes", "postgresql+asyncpg://user:pass@db/resumes"),
+    ])
+    def test_maps_to_async_driver(self, url, expected):
+        assert async_url(url) == expected
+
+    def test_rejects_unknown_backend(self):
+        with pytest.raises(ValueError):
+            async_url("mysql://user:pass@db/resumes")
+
+
+class TestAsyncCrud:
+    @pytest.fixture
+    def resume(self, db_session, test_user):
+        template = ResumeTemplate(user_id=test_user.id, name="T", latex_content="%%SUMMARY%%", placeholders="[]")
+        db_session.add(template)
+        db_session.commit()
+        resume = GeneratedResume(
+            user_id=test_user.id, template_id=template.id, job_description="JD", latex_output="x",
+        )
+        db_session.add(resume)
+        db_session.commit()
+        return resume
+
+    def test_crud_answers_while_threadpool_is_busy(self, client, auth_headers, sample_skills, resume):
+        entered, release = threading.Event(), threading.Event()
+
+        def slow_refine(**kwargs):
+            entered.set()
+            release.wait(5)
+            return "Done", None, True, []
+
+        async def scenario():
+            # One worker thread, held by a sync endpoint stuck in its LLM call
+            anyio.to_thread.current_default_thread_limiter().total_tokens = 1
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+                refine = asyncio.create_task(ac.post(
+                    "/api/chat/refine", json={"resume_id": resume.id, "message": "x"}, headers=auth_headers,
+                ))
+                try:
+                    assert await asyncio.to_thread(entered.wait, 5)
+                    skills = await asyncio.wait_for(ac.get("/api/skills/", headers=auth_headers), 2)
+                    assert not refine.done()
+                finally:
+                    release.set()
+                return skills, await refine
+
+        with patch("app.routers.chat.refine_resume", side_effect=slow_refine):
+            skills, refined = asyncio.run(scenario())
+        assert skills.status_code == 200
+        assert len(skills.json()) == len(sample_skills)
+        assert refined.status_code == 200
+
+    def test_delete_template_cascades_to_resumes(self, client, db_session, auth_headers, resume):
+        response = client.delete(f"/api/templates/{resume.template_id}", headers=auth_headers)
+        assert response.status_code == 204
+        db_session.expire_all()
+        assert db_session.query(GeneratedResume).count() == 0
+
+    def test_resume_lookups_are_scoped_to_owner(self, client, db_session, auth_headers, resume):
+        resume.user_id = "someone-else"
+        db_session.commit()
+        assert client.get(f"/api/resumes/{resume.id}", headers=auth_headers).status_code == 404
+        assert client.get("/api/resumes/", headers=auth_headers).json() == []
@@ -0,0 +1,252 @@
+"""
+Tests for the background compile queue and its status endpoints.
+"""
+import json
+import time
+import threading
+import pytest
+from unittest.mock import patch
+from app.auth.auth import create_access_token
+from app.models.generated_resume import GeneratedResume
+from app.routers import resumes as resumes_router
+from app.schemas.schemas import CompileReport
+from app.services import compile_queue
+from app.services.artifact_store import get_artifact_store
+from app.services.compile_queue import (
+    mark_pending, mark_stale, recover_pending_jobs, request_compile, run_compile_job, schedule_idle_compile,
+)
+from app.services.latex_compiler import CompileQueueFull, CompileResult, PRIORITY_BATCH, PRIORITY_INTERACTIVE
+
+
+@pytest.fixture
+def pending_resume(db_session, test_user):
+    resume = GeneratedResume(user_id=test_user.id, job_description="JD", latex_output="\\documentclass{article}")
+    mark_pending(resume)
+    db_session.add(resume)
+    db_session.commit()
+    return resume
+
+
+class TestRunCompileJob:
+    @patch("app.services.compile_queue.compile_document")
+    def test_success_marks_ready(self, mock_compile, db_session, pending_resume):
+        mock_compile.return_value = CompileResult("/cache/ab/ab.pdf", CompileReport(succeeded=True, runs=1, pages=1))
+
+        assert run_compile_job(pending_resume.id, db_session) == "ready"
+        db_session.refresh(pending_resume)
+        assert pending_resume.pdf_path == "/cache/ab/ab.pdf"
+        assert pending_resume.compile_attempts == 1
+        assert json.loads(pending_resume.compile_report)["pages"] == 1
+
+    @patch("app.services.compile_queue.compile_document")
+    def test_latex_errors_fail_without_retry(self, mock_compile, db_session, pending_resume):
+        mock_compile.return_value = CompileResult(None, CompileReport(succeeded=False, runs=1))
+
+        with patch.object(compile_queue, "_retry_later") as retry:
+            assert run_compile_job(pending_resume.id, db_session) == "failed"
+        retry.assert_not_called()
+        db_session.refresh(pending_resume)
+        assert pending_resume.pdf_path is None
+
+    def test_preflight_failure_names_the_error(self, db_session, pending_resume):
+        report = CompileReport(succeeded=False, runs=0, errors=[{"message": "Opening brace is never closed", "line": 3}])
+        with patch.object(compile_queue, "compile_document", return_value=CompileResult(None, report)):
+            assert run_compile_job(pending_resume.id, db_session) == "failed"
+        db_session.refresh(pending_resume)
+        assert pending_resume.compile_error == "LaTeX preflight failed: Opening brace is never closed (line 3)"
+
+    @patch("app.services.compile_queue.compile_document", side_effect=OSError("disk full"))
+    def test_infrastructure_errors_are_retried(self, mock_compile, db_session, pending_resume, monkeypatch):
+        monkeypatch.setattr(compile_queue.settings, "LATEX_COMPILE_RETRIES", 1)
+        with patch.object(compile_queue, "_retry_later") as retry:
+            assert run_compile_job(pending_resume.id, db_session) == "pending"
+            backoff = compile_queue.settings.LATEX_COMPILE_RETRY_BACKOFF_SECONDS
+            retry.assert_called_once_with(pending_resume.id, backoff, PRIORITY_INTERACTIVE)
+            assert run_compile_job(pending_resume.id, db_session) == "failed"
+        db_session.refresh(pending_resume)
+        assert pending_resume.compile_attempts == 2
+        assert pending_resume.compile_error == "disk full"
+
+    @patch("app.services.compile_queue.compile_document", side_effect=CompileQueueFull(7))
+    def test_overload_waits_without_using_an_attempt(self, mock_compile, db_session, pending_resume):
+        with patch.object(compile_queue, "_retry_later") as retry:
+            assert run_compile_job(pending_resume.id, db_session) == "pending"
+        retry.assert_called_once_with(pending_resume.id, 7, PRIORITY_INTERACTIVE)
+        db_session.refresh(pending_resume)
+        assert pending_resume.compile_attempts == 0
+
+    def test_edit_during_compile_discards_result(self, db_session, pending_resume):
+        def compile_and_edit(latex, priority):
+            pending_resume.latex_output = "edited"
+            db_session.commit()
+            return CompileResult("/cache/old.pdf")
+
+        with patch("app.services.compile_queue.compile_document", side_effect=compile_and_edit):
+            assert run_compile_job(pending_resume.id, db_session) is None
+        db_session.refresh(pending_resume)
+        assert pending_resume.pdf_path is None
+
+    def test_second_worker_cannot_claim_a_running_job(self, db_session, pending_resume):
+        claims = []
+
+        def compile_and_race(latex, priority):
+            claims.append(run_compile_job(pending_resume.id, db_session))
+            return CompileResult("/cache/ab/ab.pdf")
+
+        with patch("app.services.compile_queue.compile_document", side_effect=compile_and_race) as mock_compile:
+            assert run_compile_job(pending_resume.id, db_session) == "ready"
+        assert claims == [None]
+        assert mock_compile.call_count == 1
+
+    def test_superseded_claim_is_dropped(self, db_session, pending_resume):
+        with patch.object(compile_queue, "_write_job", return_value=False) as write:
+            with patch("app.services.compile_queue.compile_document") as mock_compile:
+                assert run_compile_job(pending_resume.id, db_session) is None
+        write.assert_called_once()
+        mock_compile.assert_not_called()
+
+    def test_finished_jobs_are_skipped(self, db_session, pending_resume):
+        pending_resume.compile_status = "ready"
+        db_session.commit()
+        with patch("app.services.compile_queue.compile_document") as mock_compile:
+            assert run_compile_job(pending_resume.id, db_session) is None
+        mock_compile.assert_not_called()
+
+    def test_unfinished_jobs_are_recovered(self, db_session, pending_resume):
+        with patch.object(compile_queue, "enqueue_compile") as enqueue:
+            assert recover_pending_jobs() == 1
+        enqueue.assert_called_once_with(pending_resume.id)
+
+    def test_interrupted_compiles_are_reset_to_pending(self, db_session, pending_resume):
+        pending_resume.compile_status = "compiling"
+        db_session.commit()
+        with patch.object(compile_queue, "enqueue_compile"):
+            assert recover_pending_jobs() == 1
+        db_session.refresh(pending_resume)
+        assert pending_resume.compile_status == "pending"
+
+
+class TestCompileEndpoints:
+    def test_status(self, client, auth_headers, pending_resume):
+        response = client.get(f"/api/resumes/{pending_resume.id}/compile", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json()["status"] == "pending"
+        assert response.json()["pdf_ready"] is False
+
+    def test_download_while_compiling(self, client, test_user, pending_resume):
+        token = create_access_token(data={"sub": test_user.id})
+        response = client.get(f"/api/resumes/{pending_resume.id}/pdf?token={token}")
+        assert response.status_code == 409
+
+    def test_events_end_with_ready(self, client, db_session, test_user, pending_resume):
+        token = create_access_token(data={"sub": test_user.id})
+
+        def finish():
+            pending_resume.compile_status = "ready"
+            pending_resume.pdf_path = "/cache/ab/ab.pdf"
+            compile_queue._publish(pending_resume)
+
+        timer = threading.Timer(0.2, finish)
+        timer.start()
+        response = client.get(f"/api/resumes/{pending_resume.id}/events?token={token}")
+        timer.join()
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = [json.loads(line[len("data: "):]) for line in response.text.splitlines() if line.startswith("data: ")]
+        assert [e["status"] for e in events] == ["pending", "ready"]
+        assert events[-1]["pdf_ready"] is True
+
+    def test_stale_stream_closes_after_max_lifetime(self, client, test_user, stale_resume, monkeypatch):
+        monkeypatch.setattr(resumes_router, "SSE_MAX_STREAM_SECONDS", 0.2)
+        token = create_access_token(data={"sub": test_user.id})
+        started = time.monotonic()
+        response = client.get(f"/api/resumes/{stale_resume.id}/events?token={token}")
+        assert time.monotonic() - started < 5
+        events = [json.loads(line[len("data: "):]) for line in response.text.splitlines() if line.startswith("data: ")]
+        assert [e["status"] for e in events] == ["stale"]
+
+
+@pytest.fixture
+def stale_resume(db_session, test_user):
+    resume = GeneratedResume(
+        user_id=test_user.id, job_description="JD", latex_output="edited", pdf_path="old.pdf", compile_status="ready",
+    )
+    mark_stale(resume)
+    db_session.add(resume)
+    db_session.commit()
+    return resume
+
+
+class TestLazyCompile:
+    def test_stale_resume_waits_for_a_request(self, db_session, stale_resume):
+        with patch("app.services.compile_queue.compile_document") as mock_compile:
+            assert run_compile_job(stale_resume.id, db_session) is None
+        mock_compile.assert_not_called()
+
+    def test_request_queues_one_compile(self, db_session, stale_resume):
+        with patch.object(compile_queue, "enqueue_compile") as enqueue:
+            assert request_compile(stale_resume.id, db_session) == "pending"
+            assert request_compile(stale_resume.id, db_session) == "pending"
+        enqueue.assert_called_once_with(stale_resume.id, PRIORITY_INTERACTIVE)
+
+    def test_idle_timer_coalesces_edits(self, monkeypatch):
+        monkeypatch.setattr(compile_queue.settings, "LATEX_IDLE_COMPILE_SECONDS", 0.1)
+        with patch.object(compile_queue, "request_compile") as request:
+            for _ in range(3):
+                schedule_idle_compile("r1")
+                time.sleep(0.03)
+            time.sleep(0.3)
+        request.assert_called_once_with("r1", priority=PRIORITY_BATCH)
+
+    def test_download_compiles_latest_version(self, client, db_session, test_user, stale_resume, tmp_path, monkeypatch):
+        monkeypatch.setattr(compile_queue.settings, "LATEX_OUTPUT_DIR", str(tmp_path))
+        # Fail fast rather than sit out the production wait if the compile never lands
+        monkeypatch.setattr(compile_queue.settings, "LATEX_ON_DEMAND_WAIT_SECONDS", 5)
+        get_artifact_store().put_bytes("new.pdf", b"%PDF-new")
+        result = CompileResult("new.pdf", CompileReport(succeeded=True, runs=1))
+
+        def run_now(resume_id, priority):
+            threading.Thread(target=run_compile_job, args=(resume_id,), kwargs={"priority": priority}).start()
+
+        token = create_access_token(data={"sub": test_user.id})
+        with patch.object(compile_queue, "enqueue_compile", side_effect=run_now), \
+                patch.object(compile_queue, "compile_document", return_value=result) as mock_compile:
+            response = client.get(f"/api/resumes/{stale_resume.id}/pdf?token={token}")
+        assert response.status_code == 200
+        assert response.content == b"%PDF-new"
+        mock_compile.assert_called_once_with("edited", PRIORITY_INTERACTIVE)
+
+    @patch("app.routers.chat.refine_resume")
+    def test_chat_refinement_marks_stale(self, mock_refine, client, db_session, auth_headers, stale_resume):
+        stale_resume.compile_status = "ready"
+        db_session.commit()
+        mock_refine.return_value = ("Done", "refined", True, [])
+        with patch("app.routers.chat.schedule_idle_compile") as schedule:
+            client.post("/api/chat/refine", json={"resume_id": stale_resume.id, "message": "x"}, headers=auth_headers)
+            mock_refine.return_value = ("Nothing to change", "refined", True, [])
+            client.post("/api/chat/refine", json={"resume_id": stale_resume.id, "message": "y"}, headers=auth_headers)
+        db_session.refresh(stale_resume)
+        assert stale_resume.compile_status == "stale"
+        assert stale_resume.pdf_path == "old.pdf"
+        assert stale_resume.version == 2
+        schedule.assert_called_once_with(stale_resume.id)
+
+
+class TestBackpressure:
+    def test_generate_sheds_load_when_backlog_is_full(self, client, auth_headers, monkeypatch):
+        monkeypatch.setattr(compile_queue.settings, "LATEX_COMPILE_BACKLOG_LIMIT", 0)
+        with patch("app.routers.resumes.analyze_job_description") as mock_analyze:
+            response = client.post(
+                "/api/resumes/generate",
+                json={"template_id": "any", "job_description": "Python developer"},
+                headers=auth_headers,
+            )
+        assert response.status_code == 503
+        assert int(response.headers["Retry-After"]) >= 1
+        mock_analyze.assert_not_called()
+
+    def test_jobs_are_served_by_priority(self):
+        compile_queue.enqueue_compile("batch", priority=1)
+        compile_queue.enqueue_compile("interactive")
+        assert compile_queue.backlog() == 2
+        assert compile_queue._jobs.get_nowait()[2] == "interactive"
@@ -0,0 +1,84 @@
+"""
+Tests for guardrail attempt telemetry and the admin stats endpoint.
+"""
+import pytest
+from app.config import settings
+from app.services.guardrail_telemetry import record_attempt, finalize_generation, get_guardrail_stats
+from app.services.llm_client import LLMUsage
+
+
+class TestGuardrailStats:
+    def test_counts_retries_and_exhaustion(self, db_session, test_user):
+        # Generation 1: skills fails once, then passes on retry
+        record_attempt(db_session, "gen-1", test_user.id, "generate", 1, passed=True,
+                       section="summary", latency_ms=100)
+        record_attempt(db_session, "gen-1", test_user.id, "generate", 1, passed=False,
+                       violations=["kubernetes"], section="skills", latency_ms=100)
+        record_attempt(db_session, "gen-1", test_user.id, "generate", 2, passed=True,
+                       section="skills", latency_ms=40)
+        # Generation 2: every attempt fails
+        for number in (1, 2, 3):
+            record_attempt(db_session, "gen-2", test_user.id, "generate", number, passed=False,
+                           violations=["kubernetes"], section="skills", latency_ms=50)
+        db_session.commit()
+
+        stats = get_guardrail_stats(db_session)
+
+        assert stats.total_generations == 2
+        assert stats.total_attempts == 5
+        assert stats.retry_rate == 1.0
+        assert stats.exhausted_generations == 1
+        assert stats.avg_attempt_latency_ms == 58.0
+        assert stats.total_retry_latency_ms == 140.0
+        assert stats.top_violating_terms[0].term == "kubernetes"
+        assert stats.top_violating_terms[0].count == 4
+        assert stats.exhaustion_rate == 0.5
+        assert [(t.generations, t.retried) for t in stats.retry_rate_by_template] == [(2, 2)]
+
+    def test_counts_cached_prompt_tokens_once_per_attempt(self, db_session, test_user):
+        usage = LLMUsage(calls=1, prompt_tokens=2000, cached_tokens=1500)
+        # Two section rows of one attempt share its usage
+        for section in ("summary", "projects"):
+            record_attempt(db_session, "gen-1", test_user.id, "generate", 1, passed=True,
+                           section=section, usage=usage)
+        record_attempt(db_session, "gen-2", test_user.id, "refine", 1, passed=True,
+                       usage=LLMUsage(calls=1, prompt_tokens=1000, cached_tokens=0))
+        db_session.commit()
+
+        stats = get_guardrail_stats(db_session)
+
+        assert stats.total_prompt_tokens == 3000
+        assert stats.total_cached_tokens == 1500
+        assert stats.prompt_cache_hit_rate == 0.5
+
+    def test_finalize_flags_accepted_violations(self, db_session, test_user):
+        attempt = record_attempt(db_session, "gen-1", test_user.id, "generate", 1, passed=False,
+                                 violations=["react native", "rust"], section="skills")
+        db_session.flush()
+        finalize_generation(db_session, "gen-1", None, "Built apps with React Native")
+        db_session.commit()
+
+        accepted = {v.term: v.accepted for v in attempt.violations}
+        assert accepted == {"react native": True, "rust": False}
+
+    def test_finalize_matches_whole_words_only(self, db_session, test_user):
+        attempt = record_attempt(db_session, "gen-1", test_user.id, "generate", 1, passed=False,
+                                 violations=["go", "rust", "c++"], section="skills")
+        db_session.flush()
+        finalize_generation(db_session, "gen-1", None, "Good at building trust; shipped C++ services")
+        db_session.commit()
+
+        accepted = {v.term: v.accepted for v in attempt.violations}
+        assert accepted == {"go": False, "rust": False, "c++": True}
+
+
+class TestAdminEndpoint:
+    def test_requires_admin(self, client, auth_headers):
+        response = client.get("/api/admin/guardrail/stats", headers=auth_headers)
+        assert response.status_code == 403
+
+    def test_admin_can_read_stats(self, client, auth_headers, monkeypatch):
+        monkeypatch.setattr(settings, "ADMIN_EMAILS", "test@example.com")
+        response = client.get("/api/admin/guardrail/stats", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json()["total_generations"] == 0
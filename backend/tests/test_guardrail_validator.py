@@ -3,7 +3,10 @@ Unit tests for the Guardrail Validator service.
 Tests the final defense against AI hallucination.
 """
 import pytest
-from app.services.guardrail_validator import validate_resume, _extract_technologies_from_latex, _normalize
+from app.services.guardrail_validator import (
+    validate_resume, validate_sections, validate_resume_incremental, completed_prefix,
+    _extract_technologies_from_latex, _normalize,
+)
 
 
 class TestExtractTechnologies:
@@ -113,3 +116,60 @@ class TestValidateResume:
         user_skills = ["React.js"]
         is_valid, violations = validate_resume(latex, user_skills)
         assert is_valid is True
+
+
+class TestValidateSections:
+    def test_reports_only_failing_sections(self):
+        sections = {
+            "summary": "Backend developer working with Python",
+            "skills": "Skills: Python, Kubernetes",
+        }
+        failures = validate_sections(sections, ["Python"])
+        assert list(failures) == ["skills"]
+        assert "kubernetes" in failures["skills"]
+
+    def test_all_sections_pass(self):
+        sections = {"skills": "Skills: Python, React", "projects": ""}
+        assert validate_sections(sections, ["Python", "React"]) == {}
+
+
+class TestValidateResumeIncremental:
+    PREVIOUS = "\\section{Summary}\nPython developer\n\\section{Skills}\nSkills: Python, React\n"
+
+    def test_valid_resume_passes(self):
+        is_valid, violations = validate_resume_incremental(self.PREVIOUS, ["Python", "React"])
+        assert is_valid is True
+        assert violations == []
+
+    def test_catches_violation_in_changed_section(self):
+        updated = self.PREVIOUS.replace("Python, React", "Python, React, Kubernetes")
+        is_valid, violations = validate_resume_incremental(updated, ["Python", "React"])
+        assert is_valid is False
+        assert violations == ["kubernetes"]
+
+    def test_unchanged_section_is_checked_against_current_terms(self):
+        assert validate_resume_incremental(self.PREVIOUS, ["Python", "React"])[0] is True
+        # React was removed from the profile; the skills section did not change, but still fails
+        updated = self.PREVIOUS.replace("Python developer", "Seasoned Python developer")
+        is_valid, violations = validate_resume_incremental(updated, ["Python"])
+        assert is_valid is False
+        assert violations == ["react"]
+
+
+class TestCompletedPrefix:
+    def test_cuts_at_last_complete_line(self):
+        assert completed_prefix("Built APIs with Python.\nNow using Kube") == "Built APIs with Python.\n"
+        assert completed_prefix("Line one \\\\ line tw") == "Line one \\\\"
+
+    def test_open_item_excluded(self):
+        partial = "\\begin{itemize}\n\\item Python, Docker\n\\item Built a scheduler\n"
+        assert completed_prefix(partial) == "\\begin{itemize}\n\\item Python, Docker\n"
+
+    def test_item_closed_by_end(self):
+        partial = "\\begin{itemize}\n\\item Python\n\\end{itemize}\n"
+        assert completed_prefix(partial) == partial
+
+    def test_prefix_violations_are_definite(self):
+        partial = "\\begin{itemize}\n\\item Rust, Python\n\\item Kubernetes and Do"
+        prefix = completed_prefix(partial)
+        assert validate_sections({"skills": prefix}, ["Python"]) == {"skills": ["rust"]}
@@ -0,0 +1,344 @@
+"""
+Tests for the warm LaTeX compile pool.
+A stub `pdflatex` on PATH stands in for TeX Live.
+"""
+import os
+import stat
+import time
+import threading
+import pytest
+from app.config import settings
+from app.services import latex_compiler
+from app.models.generated_resume import GeneratedResume
+from app.services import latex_formats, pdf_cache
+from app.services.artifact_store import get_artifact_store
+from app.services.latex_compiler import (
+    CompilePool, CompileQueueFull, CompileResult, PRIORITY_BATCH, PRIORITY_INTERACTIVE,
+    compile_document, compile_latex, get_compile_stats, precompile_format, shutdown_compile_pool,
+)
+
+FAKE_PDFLATEX = """#!/bin/sh
+for arg in "$@"; do
+  case "$arg" in
+    -output-directory=*) outdir="${arg#-output-directory=}" ;;
+    -jobname=*) jobname="${arg#-jobname=}" ;;
+    -fmt=*) fmt="${arg#-fmt=}" ;;
+    -ini) ini=1 ;;
+    *.tex) tex="$arg" ;;
+  esac
+done
+if [ -n "$ini" ]; then
+  echo "FORMAT" > "$outdir/$jobname.fmt"
+  exit 0
+fi
+if [ -n "$fmt" ]; then
+  grep -q STALE "$fmt.fmt" && exit 1
+  echo "$fmt" >> "$outdir/../../formats-used"
+fi
+name=$(basename "$tex" .tex)
+if grep -q FAIL "$tex"; then
+  printf '! Undefined control sequence.\nl.3 \\foo\nNo pages of output.\n' > "$outdir/$name.log"
+  exit 1
+fi
+echo "%PDF-1.5" > "$outdir/$name.pdf"
+if grep -q REF "$tex" && [ ! -f "$outdir/$name.aux" ]; then
+  touch "$outdir/$name.aux"
+  echo "LaTeX Warning: Label(s) may have changed. Rerun to get cross-references right." > "$outdir/$name.log"
+else
+  echo "Output written on $name.pdf (1 page, 1234 bytes)." > "$outdir/$name.log"
+fi
+"""
+
+
+def _stored_path(key):
+    return get_artifact_store().path(key)
+
+
+@pytest.fixture
+def fake_tex(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "pdflatex"
+    script.write_text(FAKE_PDFLATEX)
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setattr(settings, "LATEX_OUTPUT_DIR", str(tmp_path / "output"))
+    monkeypatch.setattr(settings, "LATEX_SCRATCH_DIR", str(tmp_path / "scratch"))
+    monkeypatch.setattr(latex_compiler._sandbox, "_probe", lambda: False)
+    latex_compiler._sandbox._available = None
+    shutdown_compile_pool()
+    yield tmp_path / "output"
+    shutdown_compile_pool()
+
+
+class TestCompilePool:
+    def test_compiles_to_output_dir(self, fake_tex):
+        path = compile_latex("\\documentclass{article}\\begin{document}Hi\\end{document}")
+        assert path.endswith(".pdf")
+        assert os.path.exists(_stored_path(path))
+        assert _stored_path(path).startswith(str(fake_tex))
+
+    def test_failed_compile_leaves_nothing_behind(self, fake_tex):
+        assert compile_latex("FAIL") is None
+        assert not any(name.endswith(".tex") for _, _, files in os.walk(fake_tex) for name in files)
+
+    def test_each_job_gets_a_scratch_dir_that_is_removed(self, fake_tex):
+        compile_latex("first")
+        compile_latex("FAIL")
+        scratch = fake_tex.parent / "scratch"
+        assert os.listdir(scratch / "w0") == []
+        assert os.listdir(fake_tex / ".staging") == []
+
+    def test_sandbox_probe_is_cached(self, fake_tex, monkeypatch):
+        probes = []
+        monkeypatch.setattr(latex_compiler._sandbox, "_probe", lambda: probes.append(1) or False)
+        for i in range(3):
+            compile_latex(f"doc {i}")
+        assert len(probes) == 1
+
+    def test_pool_bounds_concurrency(self, fake_tex, monkeypatch):
+        monkeypatch.setattr(settings, "LATEX_WORKERS", 2)
+        shutdown_compile_pool()
+        results = []
+        threads = [
+            threading.Thread(target=lambda i=i: results.append(compile_latex(f"doc {i}")))
+            for i in range(5)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        stats = get_compile_stats()
+        assert len(results) == 5 and all(r.endswith(".pdf") for r in results)
+        assert stats.workers == 2
+        assert stats.completed_jobs == 5
+        assert stats.queue_depth == 0 and stats.busy_workers == 0
+        assert {job.worker for job in stats.recent_jobs} <= {0, 1}
+
+    def test_stats_record_timings(self, fake_tex):
+        pool = CompilePool(1)
+        try:
+            pool.compile("doc")
+            stats = pool.stats()
+        finally:
+            pool.close()
+        job = stats.recent_jobs[0]
+        assert job.backend == "local"
+        assert job.runs == 1
+        assert job.succeeded
+        assert job.compile_ms >= 0 and job.queue_wait_ms >= 0
+
+
+
+class TestAdaptiveReruns:
+    def test_single_pass_without_rerun_markers(self, fake_tex):
+        result = compile_document("plain document")
+        assert result.report.runs == 1
+        assert result.report.pages == 1
+        assert result.report.succeeded
+
+    def test_reruns_until_references_settle(self, fake_tex):
+        result = compile_document("document with REF")
+        assert result.report.runs == 2
+
+    def test_runs_are_capped(self, fake_tex, monkeypatch):
+        monkeypatch.setattr(settings, "LATEX_MAX_RUNS", 1)
+        assert compile_document("document with REF").report.runs == 1
+
+    def test_failed_compile_reports_errors(self, fake_tex):
+        result = compile_document("FAIL")
+        assert not result.succeeded
+        assert result.report.errors[0].message == "Undefined control sequence."
+        assert result.report.errors[0].line == 3
+        assert result.report.pages == 0
+
+    def test_preflight_refuses_broken_document(self, fake_tex):
+        result = compile_document("\\documentclass{article}\n\\begin{document}\n\\textbf{x\n\\end{document}")
+        assert not result.succeeded
+        assert result.report.runs == 0
+        assert (result.report.errors[0].line, result.report.errors[0].column) == (3, 8)
+
+    def test_cache_hit_keeps_report(self, fake_tex):
+        compile_document("cached document")
+        assert compile_document("cached document").report.pages == 1
+
+
+PREAMBLE = "\\documentclass{article}\n\\usepackage{geometry}\n"
+
+
+def _formats_used(output_dir):
+    used = output_dir.parent / "scratch" / "formats-used"
+    return used.read_text().split() if used.exists() else []
+
+
+class TestPrecompiledFormats:
+    def test_compile_loads_dumped_format(self, fake_tex):
+        keys = precompile_format(PREAMBLE + "\\begin{document}%%SUMMARY%%\\end{document}")
+        assert len(keys) == 1
+        assert os.path.exists(latex_formats.format_path(keys[0]))
+
+        path = compile_latex(PREAMBLE + "\\begin{document}Hello\\end{document}")
+        assert path.endswith(".pdf")
+        assert _formats_used(fake_tex) == keys
+
+    def test_other_preamble_compiles_without_format(self, fake_tex):
+        precompile_format(PREAMBLE + "\\begin{document}\\end{document}")
+        compile_latex("\\documentclass{report}\n\\begin{document}Hi\\end{document}")
+        assert _formats_used(fake_tex) == []
+
+    def test_preamble_with_placeholders_is_not_dumped(self, fake_tex):
+        assert precompile_format("\\documentclass{article}\\title{{{full_name}}}\\begin{document}\\end{document}") == []
+
+    def test_dump_is_skipped_when_format_exists(self, fake_tex):
+        document = PREAMBLE + "\\begin{document}\\end{document}"
+        assert precompile_format(document)
+        assert precompile_format(document) == []
+
+    def test_stale_format_falls_back_and_is_discarded(self, fake_tex):
+        document = PREAMBLE + "\\begin{document}Hello\\end{document}"
+        key = precompile_format(document)[0]
+        with open(latex_formats.format_path(key), "w") as f:
+            f.write("STALE")
+
+        path = compile_latex(document)
+        assert path.endswith(".pdf")
+        assert not os.path.exists(latex_formats.format_path(key))
+
+    def test_body_error_keeps_format(self, fake_tex):
+        key = precompile_format(PREAMBLE + "\\begin{document}%%SUMMARY%%\\end{document}")[0]
+
+        assert compile_latex(PREAMBLE + "\\begin{document}FAIL\\end{document}") is None
+        assert os.path.exists(latex_formats.format_path(key))
+        # One pass with the format, no rerun of the full preamble
+        assert _formats_used(fake_tex) == [key]
+        assert get_compile_stats().recent_jobs[-1].runs == 1
+
+    def test_disabled(self, fake_tex, monkeypatch):
+        monkeypatch.setattr(settings, "LATEX_PRECOMPILED_FORMATS", False)
+        assert precompile_format(PREAMBLE + "\\begin{document}\\end{document}") == []
+
+
+class TestPdfCache:
+    def test_identical_source_skips_compile(self, fake_tex):
+        hits_before = pdf_cache.cache_counters()[0]
+        first = compile_latex("same source")
+        second = compile_latex("same source")
+
+        stats = get_compile_stats()
+        assert first == second
+        assert stats.completed_jobs == 1
+        assert stats.cache_hits == hits_before + 1
+        assert stats.cache_entries == 1
+
+    def test_cache_key_covers_compiler_config(self, fake_tex, monkeypatch):
+        key = pdf_cache.cache_key("doc")
+        monkeypatch.setattr(settings, "LATEX_MAX_RUNS", settings.LATEX_MAX_RUNS + 1)
+        assert pdf_cache.cache_key("doc") != key
+
+    def test_failed_compiles_are_not_cached(self, fake_tex):
+        compile_latex("FAIL")
+        assert pdf_cache.lookup("FAIL") is None
+
+    def test_eviction_keeps_referenced_pdfs(self, fake_tex, db_session, test_user, monkeypatch):
+        kept = compile_latex("referenced")
+        dropped = compile_latex("orphaned")
+        db_session.add(GeneratedResume(
+            user_id=test_user.id, job_description="JD", latex_output="referenced", pdf_path=kept,
+        ))
+        db_session.commit()
+
+        monkeypatch.setattr(settings, "LATEX_PDF_CACHE_MAX_MB", 0)
+        monkeypatch.setattr(settings, "LATEX_PDF_CACHE_MIN_AGE_SECONDS", 0)
+        past = os.path.getmtime(_stored_path(kept)) - 10
+        os.utime(_stored_path(dropped), (past, past))
+
+        assert pdf_cache.evict(db_session) == 1
+        assert os.path.exists(_stored_path(kept))
+        assert not os.path.exists(_stored_path(dropped))
+
+    def test_recent_entries_are_not_evicted(self, fake_tex, db_session, monkeypatch):
+        path = compile_latex("fresh")
+        monkeypatch.setattr(settings, "LATEX_PDF_CACHE_MAX_MB", 0)
+        assert pdf_cache.evict(db_session) == 0
+        assert os.path.exists(_stored_path(path))
+
+
+class TestAdmission:
+    @staticmethod
+    def _blocking_pool(order):
+        """A one-worker pool whose compiles record their source and wait for `release`."""
+        pool = CompilePool(1)
+        release = threading.Event()
+
+        def compile(job_id, latex_content):
+            order.append(latex_content)
+            if latex_content == "holder":
+                release.wait(timeout=5)
+            return CompileResult(f"/out/{job_id}.pdf"), "local"
+
+        pool._workers[0].compile = compile
+        return pool, release
+
+    @staticmethod
+    def _wait_for_waiters(pool, count):
+        for _ in range(500):
+            if pool.stats().queue_depth == count:
+                return
+            time.sleep(0.01)
+        raise AssertionError("compile never queued")
+
+    def test_interactive_jumps_ahead_of_batch(self):
+        order = []
+        pool, release = self._blocking_pool(order)
+        holder = threading.Thread(target=pool.compile, args=("holder",))
+        holder.start()
+        self._wait_for_order(order, 1)
+        batch = threading.Thread(target=pool.compile, args=("batch", PRIORITY_BATCH))
+        batch.start()
+        self._wait_for_waiters(pool, 1)
+        interactive = threading.Thread(target=pool.compile, args=("interactive", PRIORITY_INTERACTIVE))
+        interactive.start()
+        self._wait_for_waiters(pool, 2)
+
+        release.set()
+        for t in (holder, batch, interactive):
+            t.join(timeout=5)
+        assert order == ["holder", "interactive", "batch"]
+        stats = pool.stats()
+        assert set(stats.avg_queue_wait_ms_by_priority) == {"interactive", "batch"}
+
+    def test_full_queue_rejects_fast(self, monkeypatch):
+        monkeypatch.setattr(settings, "LATEX_COMPILE_QUEUE_LIMIT", 1)
+        order = []
+        pool, release = self._blocking_pool(order)
+        holder = threading.Thread(target=pool.compile, args=("holder",))
+        holder.start()
+        self._wait_for_order(order, 1)
+        waiter = threading.Thread(target=pool.compile, args=("waiter",))
+        waiter.start()
+        self._wait_for_waiters(pool, 1)
+
+        with pytest.raises(CompileQueueFull) as exc:
+            pool.compile("rejected")
+        release.set()
+        holder.join(timeout=5)
+        waiter.join(timeout=5)
+
+        assert exc.value.retry_after >= 1
+        assert "rejected" not in order
+        assert pool.stats().rejected_jobs == 1
+
+    @staticmethod
+    def _wait_for_order(order, count):
+        for _ in range(500):
+            if len(order) >= count:
+                return
+            time.sleep(0.01)
+        raise AssertionError("compile never started")
+
+
+class TestCompileStatsEndpoint:
+    def test_requires_admin(self, client, auth_headers):
+        response = client.get("/api/admin/compile/stats", headers=auth_headers)
+        assert response.status_code == 403
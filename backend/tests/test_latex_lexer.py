@@ -0,0 +1,69 @@
+"""
+Unit tests for the LaTeX lexer shared by the guardrail and template filling.
+"""
+import pytest
+from app.services.latex_lexer import tokenize, find_placeholders, iter_text_runs, split_sections
+from app.services.guardrail_validator import _extract_technologies_from_latex
+
+
+class TestPlaceholders:
+    def test_finds_all_syntaxes(self):
+        latex = r"%%SUMMARY%% \section{X} {{ skills }} [[projects]]"
+        found = [(p.key, p.syntax) for p in find_placeholders(latex)]
+        assert found == [("SUMMARY", "%%"), ("skills", "{{"), ("projects", "[[")]
+
+    def test_comment_is_not_a_placeholder(self):
+        latex = "% Section header\n%%SUMMARY%%"
+        assert [p.key for p in find_placeholders(latex)] == ["SUMMARY"]
+
+    def test_nested_braces_are_groups(self):
+        latex = r"\textbf{{{name}}}"
+        kinds = [t.kind for t in tokenize(latex)]
+        assert kinds == ["command", "open", "placeholder", "close"]
+
+
+class TestTextRuns:
+    def test_bold_context_handles_nested_braces(self):
+        runs = list(iter_text_runs(r"\textbf{Py{th}on} rest"))
+        bold = "".join(r.text for r in runs if r.within("textbf"))
+        assert bold == "Python"
+
+    def test_structural_arguments_are_skipped(self):
+        latex = r"\usepackage[margin=1in]{geometry}\href{https://x.io}{Site}"
+        text = "".join(r.text for r in iter_text_runs(latex))
+        assert "geometry" not in text
+        assert "x.io" not in text
+        assert "Site" in text
+
+    def test_item_context_ends_at_newline(self):
+        runs = list(iter_text_runs("\\item Python\nafter"))
+        assert [r.text for r in runs if r.item is not None] == [" Python"]
+
+    def test_escaped_characters_render_literally(self):
+        text = "".join(r.text for r in iter_text_runs(r"C\# and R\&D"))
+        assert text == "C# and R&D"
+
+
+class TestExtractionWithLexer:
+    def test_bold_with_nested_group(self):
+        techs = _extract_technologies_from_latex(r"\textbf{Spring {Boot}}")
+        assert "spring boot" in techs
+
+    def test_line_break_separates_skill_lines(self):
+        latex = r"Languages: Python, Java \\ Tools: Docker"
+        techs = _extract_technologies_from_latex(latex)
+        assert {"python", "java", "docker"} <= techs
+
+    def test_items_on_one_line_are_separate(self):
+        latex = r"\begin{itemize}\item Python\item Docker\end{itemize}"
+        techs = _extract_technologies_from_latex(latex)
+        assert {"python", "docker"} <= techs
+
+
+class TestSplitSections:
+    def test_round_trips_document(self):
+        latex = "preamble\n\\section{A}\nbody a\n\\subsection*{B}\nbody b\n"
+        chunks = split_sections(latex)
+        assert "".join(chunks) == latex
+        assert len(chunks) == 3
+        assert chunks[1].startswith("\\section{A}")
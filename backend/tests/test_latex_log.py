@@ -0,0 +1,73 @@
+"""
+Tests for pdflatex log parsing.
+"""
+from app.services.latex_log import format_load_failed, needs_rerun, parse_log
+
+LOG = """This is pdfTeX, Version 3.141592653-2.6-1.40.25 (TeX Live 2023) (preloaded format=pdflatex)
+(./resume.tex
+LaTeX2e <2022-11-01>
+Package hyperref Warning: Token not allowed in a PDF string (Unicode):
+(hyperref)                removing `\\\\' on input line 12.
+
+LaTeX Warning: Reference `sec:skills' on page 1 undefined on input line 40.
+
+Overfull \\hbox (12.34pt too wide) in paragraph at lines 52--53
+[]\\OT1/cmr/m/n/10 Python, TypeScript, Kubernetes
+! Undefined control sequence.
+l.61 \\skillz
+             {Rust}
+[1] (./resume.aux) )
+Output written on resume.pdf (2 pages, 45678 bytes).
+"""
+
+
+class TestNeedsRerun:
+    def test_rerun_marker(self):
+        assert needs_rerun("LaTeX Warning: Label(s) may have changed. Rerun to get cross-references right.")
+
+    def test_marker_split_by_line_wrapping(self):
+        prefix = "Package rerunfilecheck Warning: File `resume.out' has changed. "
+        message = prefix.ljust(75) + "Rerun to get outlines right"
+        wrapped = message[:79] + "\n" + message[79:]
+        assert "Rerun to get" not in wrapped
+        assert needs_rerun(wrapped)
+
+    def test_stable_log(self):
+        assert not needs_rerun(LOG)
+        assert not needs_rerun("")
+        assert not needs_rerun(None)
+
+
+class TestFormatLoadFailed:
+    def test_missing_log(self):
+        assert format_load_failed(None)
+        assert format_load_failed("")
+
+    def test_format_errors(self):
+        assert format_load_failed("I can't find the format file `fmt-abc.fmt'!")
+        assert format_load_failed("---! ./fmt-abc.fmt was written by tex\n(Fatal format file error; I'm stymied)")
+
+    def test_document_error(self):
+        assert not format_load_failed("! Undefined control sequence.\nl.3 \\foo\nNo pages of output.")
+
+
+class TestParseLog:
+    def test_structured_report(self):
+        report = parse_log(LOG, runs=1, succeeded=True)
+        assert report.pages == 2
+        assert report.runs == 1
+        assert report.errors[0].message == "Undefined control sequence."
+        assert report.errors[0].line == 61
+        assert report.overfull_boxes == ["Overfull \\hbox (12.34pt too wide) in paragraph at lines 52--53"]
+        assert len(report.warnings) == 2
+        assert report.warnings[0].startswith("Package hyperref Warning: Token not allowed")
+        assert "removing" in report.warnings[0]
+
+    def test_no_output(self):
+        report = parse_log("! Emergency stop.\nNo pages of output.\n", runs=1, succeeded=False)
+        assert report.pages == 0
+        assert report.errors[0].line is None
+
+    def test_empty_log(self):
+        report = parse_log(None, runs=0, succeeded=False)
+        assert report.errors == [] and report.pages is None
@@ -0,0 +1,89 @@
+"""
+Tests for the LaTeX preflight linter and its mechanical repairs.
+"""
+import pytest
+from app.services.latex_preflight import ERROR, WARNING, errors, lint, preflight_report, repair
+
+DOCUMENT = "\\documentclass{article}\n\\begin{document}\n%s\n\\end{document}\n"
+
+
+def _codes(issues):
+    return [issue.code for issue in issues]
+
+
+class TestStructuralErrors:
+    def test_clean_document(self):
+        assert lint(DOCUMENT % "\\section{Skills}\n\\textbf{Python} \\& SQL, 100\\% uptime") == []
+
+    def test_unclosed_brace_inside_environment(self):
+        source = DOCUMENT % "\\begin{itemize}\n\\item \\textbf{Python\n\\end{itemize}"
+        issues = lint(source)
+        assert _codes(issues) == ["unclosed_brace"]
+        assert (issues[0].line, issues[0].column) == (4, 14)
+        repaired, remaining = repair(source)
+        assert "\\textbf{Python\n}\\end{itemize}" in repaired
+        assert remaining == []
+
+    def test_unmatched_close_brace(self):
+        issues = lint(DOCUMENT % "Python}")
+        assert _codes(issues) == ["unmatched_close_brace"]
+        assert issues[0].severity == ERROR
+
+    def test_unclosed_environment_is_ended_before_its_parent(self):
+        source = DOCUMENT % "\\begin{itemize}\n\\item Python"
+        assert _codes(lint(source)) == ["unclosed_environment"]
+        repaired, remaining = repair(source)
+        assert "\\item Python\n\\end{itemize}\\end{document}" in repaired
+        assert remaining == []
+
+    def test_unmatched_end(self):
+        repaired, remaining = repair("Python\n\\end{itemize}", fragment=True)
+        assert repaired == "Python\n"
+        assert remaining == []
+
+    def test_missing_begin_document(self):
+        issues = lint("\\documentclass{article}\nHello")
+        assert _codes(issues) == ["missing_begin_document"]
+        assert repair("\\documentclass{article}\nHello")[1] == issues
+
+    def test_report_carries_positions(self):
+        report = preflight_report(lint(DOCUMENT % "a}"))
+        assert not report.succeeded and report.runs == 0
+        assert (report.errors[0].line, report.errors[0].column) == (3, 2)
+
+
+class TestUnescapedCharacters:
+    @pytest.mark.parametrize("text,expected", [
+        ("R&D", "R\\&D"),
+        ("C# and F#", "C\\# and F\\#"),
+        ("snake_case", "snake\\_case"),
+        ("x^2 growth", "x\\textasciicircum{}2 growth"),
+        ("grew 40% year on year", "grew 40\\% year on year"),
+        ("saved $5k", "saved \\$5k"),
+    ])
+    def test_prose_is_escaped(self, text, expected):
+        repaired, remaining = repair(text, fragment=True)
+        assert repaired == expected
+        assert remaining == []
+        assert all(issue.severity == WARNING for issue in lint(text, fragment=True))
+
+    def test_markup_is_left_alone(self):
+        source = (
+            "\\begin{tabular}{ll} a & b \\\\ \\end{tabular}\n"
+            "\\href{https://x.io/a_b#c}{site} $x_1^2$ \\(a_b\\)\n"
+            "\\newcommand{\\entry}[1]{#1} \\def\\pair#1#2{#1 & #2}\n"
+            "% a comment with R&D and snake_case\n"
+            "\\begin{verbatim}\nraw_text & {\n\\end{verbatim}"
+        )
+        assert lint(source, fragment=True) == []
+
+    def test_preamble_is_not_prose(self):
+        assert lint("\\documentclass{article}\n\\usepackage{my_package}\n\\begin{document}\nx\\end{document}") == []
+
+    def test_content_after_end_document_is_dropped(self):
+        repaired, remaining = repair(DOCUMENT % "Hi" + "Thanks for reading!")
+        assert repaired.endswith("\\end{document}\n")
+        assert remaining == []
+
+    def test_warnings_do_not_block(self):
+        assert errors(lint(DOCUMENT % "R&D")) == []
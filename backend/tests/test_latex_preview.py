@@ -0,0 +1,72 @@
+"""
+Tests for the HTML preview renderer and its endpoint.
+"""
+from app.services.latex_preview import render_preview
+
+DOCUMENT = r"""\documentclass{article}
+\usepackage{hyperref}
+\newcommand{\resumeItem}[1]{\item \small{#1}}
+\newcommand{\role}[2]{\textbf{#1} \hfill #2}
+\begin{document}
+%s
+\end{document}
+Ignored after the document.
+"""
+
+
+class TestRenderPreview:
+    def test_sections_lists_and_fonts(self):
+        result = render_preview(DOCUMENT % r"""\section*{Experience}
+\begin{itemize}
+  \item Built \textbf{APIs} with \emph{FastAPI}
+  \item R\&D -- 40\% faster
+\end{itemize}""")
+        assert "<h2>Experience</h2>" in result.html
+        assert "<li>Built <strong>APIs</strong> with <em>FastAPI</em></li>" in result.html
+        assert "R&amp;D – 40% faster" in result.html
+        assert "Ignored" not in result.html and "hyperref" not in result.html
+        assert result.unsupported == []
+
+    def test_template_macros_are_expanded(self):
+        result = render_preview(DOCUMENT % "\\role{Acme}{2021}\n\n\\begin{itemize}\\resumeItem{Shipped}\\end{itemize}")
+        assert "<span><strong>Acme</strong></span><span>2021</span>" in result.html
+        assert '<li><span style="font-size:0.9em">Shipped</span></li>' in result.html
+
+    def test_tabular_rows_and_alignment(self):
+        result = render_preview(r"\begin{tabular*}{\textwidth}{l@{\extracolsep{\fill}}r} \textbf{Acme} & 2021 \\ Engineer & Remote \\ \end{tabular*}")
+        assert result.html.startswith('<table style="width:100%"><tr><td style="text-align:left"><strong>Acme</strong>')
+        assert result.html.count("<tr>") == 2
+        assert '<td style="text-align:right">Remote</td>' in result.html
+
+    def test_paragraphs_and_line_breaks(self):
+        html = render_preview("first\nline \\\\ second\n\n  \nnext").html
+        assert html == "<p>first line <br> second</p>\n<p>next</p>"
+
+    def test_text_is_escaped_and_links_are_restricted(self):
+        result = render_preview(
+            r"<script>x</script> \href{javascript:alert(1)}{bad} \href{https://x.io/a\_b}{ok} \url{github.com/me}"
+        )
+        assert "&lt;script&gt;" in result.html and "<script>" not in result.html
+        assert "javascript" not in result.html
+        assert '<a href="https://x.io/a_b"' in result.html
+        assert '<a href="https://github.com/me"' in result.html
+
+    def test_placeholders_and_unsupported_commands(self):
+        result = render_preview("%%SUMMARY%% \\faPhone{} \\begin{multicols}{2}x\\end{multicols}")
+        assert '<span class="placeholder">%%SUMMARY%%</span>' in result.html
+        assert result.unsupported == ["\\begin{multicols}", "\\faPhone"]
+
+    def test_recursive_macro_terminates(self):
+        result = render_preview("\\newcommand{\\again}{\\again}\\again done")
+        assert "done" in result.html
+        assert result.unsupported == ["\\again (recursive)"]
+
+
+class TestPreviewEndpoint:
+    def test_requires_auth(self, client):
+        assert client.post("/api/preview/", json={"latex_content": "x"}).status_code in (401, 403)
+
+    def test_renders(self, client, auth_headers):
+        response = client.post("/api/preview/", json={"latex_content": "\\textbf{Hi}"}, headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json() == {"html": "<p><strong>Hi</strong></p>", "unsupported": []}
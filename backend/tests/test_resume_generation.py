@@ -5,8 +5,11 @@ Tests the end-to-end flow without LLM calls (mocked).
 import json
 import pytest
 from unittest.mock import patch, MagicMock
-from app.services.resume_generator import fill_template, generate_resume_content
+from app.services.resume_generator import (
+    fill_template, generate_resume_content, compile_template, get_compiled_template, render_template,
+)
 from app.services.guardrail_validator import validate_resume
+from app.services.latex_compiler import PRIORITY_BATCH
 
 
 class TestFillTemplate:
@@ -61,6 +64,19 @@ class TestFillTemplate:
         assert "Test" in result
         assert "%%CUSTOM%%" in result  # Unmatched placeholder stays
 
+    def test_fills_alternate_marker_syntaxes(self):
+        template = r"{{ summary }} [[Skills]] %%full_name%%"
+        content = {"SUMMARY": "Sum", "skills": "Python"}
+        user = MagicMock(full_name="Jane Doe", email="jane@example.com")
+        result = fill_template(template, content, user)
+        assert result == "Sum Python Jane Doe"
+
+    def test_content_is_not_refilled(self):
+        template = r"%%SUMMARY%% %%SKILLS%%"
+        content = {"SUMMARY": "see %%SKILLS%%", "SKILLS": "Python"}
+        result = fill_template(template, content)
+        assert result == "see %%SKILLS%% Python"
+
     def test_handles_empty_content(self):
         template = r"%%SUMMARY%%"
         content = {"SUMMARY": ""}
@@ -68,6 +84,39 @@ class TestFillTemplate:
         assert result == ""
 
 
+class TestCompiledTemplate:
+    def test_segments_and_slots(self):
+        compiled = compile_template(r"A %%SUMMARY%% B {{skills}} C")
+        assert compiled.literals == ("A ", " B ", " C")
+        assert compiled.keys == ["summary", "skills"]
+
+    def test_reports_unknown_placeholders(self):
+        compiled = compile_template(r"%%SUMMARY%% %%EXPERIENCE%% %%HOBBIES%% {{email}}")
+        assert compiled.unknown_placeholders == ["hobbies"]
+
+    def test_singular_alias_is_filled(self):
+        compiled = compile_template(r"%%EXPERIENCE%%")
+        assert render_template(compiled, {"experiences": "Tech Corp"}) == "Tech Corp"
+
+    def test_cache_keyed_by_updated_at(self):
+        template = MagicMock(id="tmpl-cache", latex_content="%%SUMMARY%%", updated_at=1)
+        first = get_compiled_template(template)
+        template.latex_content = "%%SKILLS%%"
+        assert get_compiled_template(template) is first
+        template.updated_at = 2
+        assert get_compiled_template(template).keys == ["skills"]
+
+    def test_template_save_reports_unknown_placeholders(self, client, auth_headers):
+        response = client.post(
+            "/api/templates/",
+            json={"name": "Custom", "latex_content": "%%SUMMARY%% %%HOBBIES%%"},
+            headers=auth_headers,
+        )
+        assert response.status_code == 201
+        assert response.json()["unknown_placeholders"] == ["hobbies"]
+        assert json.loads(response.json()["placeholders"]) == ["SUMMARY", "HOBBIES"]
+
+
 class TestEndToEndValidation:
     """Test the full pipeline: generate → fill → validate."""
 
@@ -134,3 +183,532 @@ class TestEndToEndValidation:
         assert "SKILLS" in content
         assert "PROJECTS" in content
         assert "EXPERIENCE" in content
+
+    @patch("app.services.resume_generator.call_llm")
+    def test_repair_requests_only_failing_sections(self, mock_llm):
+        """A retry asks only for the failing sections and lists their violations."""
+        mock_llm.return_value = json.dumps({"skills": "Skills: Python"})
+
+        content = generate_resume_content(
+            job_description="Looking for a Python developer",
+            matched_skills=["Python"],
+            ranked_projects=[],
+            experiences=[],
+            domain="Web Development",
+            seniority="Senior",
+            sections=["skills"],
+            repair_violations={"skills": ["kubernetes"]},
+        )
+
+        kwargs = mock_llm.call_args.kwargs
+        assert '"skills"' in kwargs["user_prompt"]
+        assert '"summary"' not in kwargs["user_prompt"]
+        assert "kubernetes" in kwargs["user_prompt"]
+        assert content == {"skills": "Skills: Python"}
+
+
+class TestPromptPrefixCaching:
+    """Generation prompts put the stable system prompt and profile first."""
+
+    def _generate(self, profile, job_description, matched_skills):
+        return generate_resume_content(
+            job_description=job_description,
+            matched_skills=matched_skills,
+            ranked_projects=[{"title": "ML Pipeline"}],
+            experiences=[],
+            domain="Web Development",
+            seniority="Senior",
+            profile=profile,
+        )
+
+    @patch("app.services.resume_generator.call_llm")
+    def test_profile_forms_shared_prefix(
+        self, mock_llm, db_session, test_user, sample_skills, sample_projects, sample_experiences,
+    ):
+        from app.services.resume_generator import get_profile_context
+
+        mock_llm.return_value = json.dumps({"summary": "", "projects": "", "experiences": ""})
+        profile = get_profile_context(test_user, sample_skills, sample_projects, sample_experiences)
+
+        self._generate(profile, "Python backend role", ["Python"])
+        self._generate(profile, "React frontend role", ["React", "TypeScript"])
+
+        first, second = (c.kwargs for c in mock_llm.call_args_list)
+        assert first["system_prompt"] == second["system_prompt"]
+        prefix = "\n\n".join(profile.blocks[name] for name in ("skills", "projects", "experiences"))
+        assert first["user_prompt"].startswith(prefix)
+        assert second["user_prompt"].startswith(prefix)
+        # JD-specific selection is in the suffix, after the job description
+        suffix = second["user_prompt"][second["user_prompt"].index("React frontend role"):]
+        assert "match the job:\nReact, TypeScript" in suffix
+
+    def test_profile_memoized_per_revision(self, db_session, test_user, sample_skills, sample_projects):
+        from app.services.resume_generator import get_profile_context
+
+        first = get_profile_context(test_user, sample_skills, sample_projects, [])
+        assert get_profile_context(test_user, sample_skills, sample_projects, []) is first
+
+        test_user.profile_revision += 1
+        refreshed = get_profile_context(test_user, sample_skills[:1], sample_projects, [])
+        assert refreshed is not first
+        assert "TypeScript" not in refreshed.blocks["skills"]
+
+    def test_skill_change_bumps_profile_revision(self, client, db_session, auth_headers, test_user):
+        response = client.post("/api/skills/", json={"name": "Go", "category": "Programming"}, headers=auth_headers)
+
+        assert response.status_code == 201
+        db_session.refresh(test_user)
+        assert test_user.profile_revision == 1
+
+    def test_profile_revision_increments_in_sql(self, client, db_session, auth_headers, test_user):
+        from app.auth.auth import get_current_user_async
+        from app.main import app
+        from app.models.user import User
+
+        test_user.profile_revision = 5
+        db_session.commit()
+        # The request's copy of the user predates a concurrent edit that already bumped the row
+        app.dependency_overrides[get_current_user_async] = lambda: User(id=test_user.id, profile_revision=4)
+        response = client.post("/api/skills/", json={"name": "Go", "category": "Programming"}, headers=auth_headers)
+
+        assert response.status_code == 201
+        db_session.refresh(test_user)
+        assert test_user.profile_revision == 6
+
+    @patch("app.services.llm_client.get_openai_client")
+    def test_track_usage_counts_cached_tokens(self, mock_client):
+        from types import SimpleNamespace
+        from app.services.llm_client import call_llm, track_usage
+
+        mock_client.return_value.chat.completions.create.return_value = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="{}"))],
+            usage=SimpleNamespace(
+                total_tokens=1300, prompt_tokens=1200, completion_tokens=100,
+                prompt_tokens_details=SimpleNamespace(cached_tokens=1024),
+            ),
+        )
+
+        with track_usage() as outer:
+            call_llm("system", "user")
+            with track_usage() as inner:
+                call_llm("system", "user")
+
+        assert (outer.calls, outer.prompt_tokens, outer.cached_tokens) == (2, 2400, 2048)
+        assert (inner.calls, inner.cached_tokens) == (1, 1024)
+
+    @patch("app.services.llm_client.get_openai_client")
+    def test_concurrency_limit_is_process_wide(self, mock_client, monkeypatch):
+        import threading
+        import time
+        from types import SimpleNamespace
+        from app.services import llm_client
+
+        monkeypatch.setattr(llm_client, "_concurrency", threading.BoundedSemaphore(2))
+        in_flight, peak, lock = [0], [0], threading.Lock()
+
+        def create(**kwargs):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(0.05)
+            with lock:
+                in_flight[0] -= 1
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="{}"))], usage=None)
+
+        mock_client.return_value.chat.completions.create.side_effect = create
+        # Independent callers, as separate generations would be, each with their own threads
+        threads = [threading.Thread(target=llm_client.call_llm, args=("system", "user")) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert peak[0] == 2
+
+
+class TestTargetedRegeneration:
+    """The /generate loop regenerates only sections that failed validation."""
+
+    @patch("app.routers.resumes.enqueue_compile")
+    @patch("app.routers.resumes.generate_resume_content")
+    @patch("app.routers.resumes.analyze_job_description")
+    def test_only_failing_section_is_regenerated(
+        self, mock_analyze, mock_generate, mock_enqueue,
+        client, db_session, auth_headers, sample_skills, sample_projects, sample_experiences,
+    ):
+        from app.models.resume_template import ResumeTemplate
+        from app.schemas.schemas import JDAnalysis
+
+        template = ResumeTemplate(
+            user_id="test-user-id",
+            name="Basic",
+            latex_content="%%SUMMARY%%\n%%SKILLS%%\n%%PROJECTS%%\n%%EXPERIENCES%%",
+        )
+        db_session.add(template)
+        db_session.commit()
+
+        mock_analyze.return_value = JDAnalysis(
+            required_skills=["python"], preferred_skills=[], keywords=[],
+            domain="Web Development", seniority="Senior",
+        )
+        mock_generate.side_effect = [
+            {
+                "summary": "Python developer",
+                "projects": "Technologies: Python, Kubernetes",
+                "experiences": "",
+            },
+            {"projects": "Technologies: Python, Docker"},
+        ]
+
+        response = client.post(
+            "/api/resumes/generate",
+            json={"template_id": template.id, "job_description": "Python developer"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert mock_generate.call_count == 2
+        retry = mock_generate.call_args_list[1].kwargs
+        assert retry["sections"] == ["projects"]
+        assert "kubernetes" in retry["repair_violations"]["projects"]
+        latex = response.json()["latex_output"]
+        assert "Technologies: Python, Docker" in latex
+        # Skills come from the database, not the LLM
+        assert r"\item \textbf{Programming}: Python" in latex
+
+        from app.models.guardrail_attempt import GuardrailAttempt
+        attempts = db_session.query(GuardrailAttempt).order_by(GuardrailAttempt.attempt_number).all()
+        assert len(attempts) == 4
+        assert {a.resume_id for a in attempts} == {response.json()["id"]}
+
+
+class TestStreamingGuardrail:
+    """Streamed generations are cancelled on the first definite violation."""
+
+    def _stream(self, chunks, closed):
+        def stream(**kwargs):
+            try:
+                for chunk in chunks:
+                    yield chunk
+            finally:
+                closed.append(True)
+        return stream
+
+    def _generate(self, sections):
+        return generate_resume_content(
+            job_description="Looking for a Python developer",
+            matched_skills=["Python"],
+            ranked_projects=[],
+            experiences=[],
+            domain="Web Development",
+            seniority="Senior",
+            sections=sections,
+            parallel=False,
+            authorized_terms=["Python", "Docker"],
+        )
+
+    def test_aborts_on_completed_item_violation(self):
+        from app.services.resume_generator import GenerationAborted
+
+        chunks = [
+            '{"summary": "Python developer", ',
+            '"projects": "\\\\begin{itemize}\\n\\\\item Python, Kubernetes\\n',
+            '\\\\item Docker\\n',
+            'never reached',
+        ]
+        consumed = []
+        closed = []
+
+        def tracking(**kwargs):
+            for chunk in self._stream(chunks, closed)(**kwargs):
+                consumed.append(chunk)
+                yield chunk
+
+        with patch("app.services.resume_generator.stream_llm", side_effect=tracking):
+            with pytest.raises(GenerationAborted) as exc_info:
+                self._generate(["summary", "projects"])
+
+        assert exc_info.value.violations == {"projects": ["kubernetes"]}
+        assert exc_info.value.completed == {"summary": "Python developer"}
+        assert len(consumed) == 3
+        assert closed == [True]
+
+    def test_clean_stream_returns_sections(self):
+        closed = []
+        chunks = ['{"summary": "Python ', 'developer", "projects": "Docker\\nPython"}']
+
+        with patch("app.services.resume_generator.stream_llm", side_effect=self._stream(chunks, closed)):
+            content = self._generate(["summary", "projects"])
+
+        assert content == {"summary": "Python developer", "projects": "Docker\nPython"}
+        assert closed == [True]
+
+    def test_truncated_stream_fails_the_attempt(self):
+        closed = []
+        chunks = ['{"summary": "Python developer", "projects": "Docker, Pyt']
+
+        with patch("app.services.resume_generator.stream_llm", side_effect=self._stream(chunks, closed)):
+            with pytest.raises(ValueError, match="projects"):
+                self._generate(["summary", "projects", "experiences"])
+
+    @patch("app.routers.resumes.enqueue_compile")
+    @patch("app.routers.resumes.generate_resume_content")
+    @patch("app.routers.resumes.analyze_job_description")
+    def test_abort_starts_repair_immediately(
+        self, mock_analyze, mock_generate, mock_enqueue,
+        client, db_session, auth_headers, sample_skills, sample_projects, sample_experiences,
+    ):
+        from app.models.resume_template import ResumeTemplate
+        from app.schemas.schemas import JDAnalysis
+        from app.services.resume_generator import GenerationAborted
+
+        template = ResumeTemplate(user_id="test-user-id", name="Basic", latex_content="%%SUMMARY%%\n%%PROJECTS%%\n%%EXPERIENCES%%")
+        db_session.add(template)
+        db_session.commit()
+        mock_analyze.return_value = JDAnalysis(
+            required_skills=["python"], preferred_skills=[], keywords=[],
+            domain="Web Development", seniority="Senior",
+        )
+        mock_generate.side_effect = [
+            GenerationAborted({"projects": ["kubernetes"]}, {"summary": "Python developer"}),
+            {"projects": "Technologies: Python, Docker", "experiences": "Tech Corp"},
+        ]
+
+        response = client.post(
+            "/api/resumes/generate",
+            json={"template_id": template.id, "job_description": "Python developer"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        retry = mock_generate.call_args_list[1].kwargs
+        # The aborted section is repaired; the one the stream never reached is generated
+        assert sorted(retry["sections"]) == ["experiences", "projects"]
+        assert retry["repair_violations"]["projects"] == ["kubernetes"]
+        assert mock_generate.call_args_list[0].kwargs["authorized_terms"]
+        assert "Python developer" in response.json()["latex_output"]
+
+
+class TestSectionRegeneration:
+    """POST /api/resumes/{id}/sections/{name}/regenerate touches only one section."""
+
+    @staticmethod
+    def _resume(db_session, latex, sections, template_id=None):
+        from app.models.generated_resume import GeneratedResume
+
+        resume = GeneratedResume(
+            user_id="test-user-id",
+            template_id=template_id,
+            job_description="Python developer",
+            latex_output=latex,
+            metadata_json=json.dumps({
+                "jd_analysis": {
+                    "required_skills": ["python"], "preferred_skills": [], "keywords": [],
+                    "domain": "Web Development", "seniority": "Senior",
+                },
+                "skill_match": {"matched_skills": ["Python"]},
+                "project_rankings": [],
+            }),
+            section_content=json.dumps(sections),
+        )
+        db_session.add(resume)
+        db_session.commit()
+        return resume
+
+    @patch("app.routers.resumes.generate_resume_content")
+    def test_regenerates_and_splices_one_section(
+        self, mock_generate, client, db_session, auth_headers, sample_skills, sample_projects,
+    ):
+        resume = self._resume(
+            db_session,
+            "Intro\nOld summary\nOld projects\nEnd",
+            {"summary": "Old summary", "projects": "Old projects"},
+        )
+        mock_generate.side_effect = [
+            {"projects": "Technologies: Python, Kubernetes"},
+            {"projects": "Technologies: Python, Docker"},
+        ]
+
+        response = client.post(f"/api/resumes/{resume.id}/sections/projects/regenerate", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert mock_generate.call_count == 2
+        assert mock_generate.call_args_list[0].kwargs["sections"] == ["projects"]
+        assert "kubernetes" in mock_generate.call_args_list[1].kwargs["repair_violations"]["projects"]
+        body = response.json()
+        assert body["latex_output"] == "Intro\nOld summary\nTechnologies: Python, Docker\nEnd"
+        assert body["version"] == 2
+        assert json.loads(body["section_content"])["projects"] == "Technologies: Python, Docker"
+
+    @patch("app.routers.resumes.generate_resume_content")
+    def test_edited_section_conflicts(self, mock_generate, client, db_session, auth_headers, sample_skills):
+        resume = self._resume(db_session, "Edited by chat", {"summary": "Old summary"})
+
+        response = client.post(f"/api/resumes/{resume.id}/sections/summary/regenerate", headers=auth_headers)
+
+        assert response.status_code == 409
+        mock_generate.assert_not_called()
+
+    def test_unknown_section(self, client, db_session, auth_headers):
+        resume = self._resume(db_session, "Old summary", {"summary": "Old summary"})
+
+        response = client.post(f"/api/resumes/{resume.id}/sections/hobbies/regenerate", headers=auth_headers)
+
+        assert response.status_code == 404
+
+
+class TestRetemplating:
+    """Stored section content is re-rendered into templates without the LLM."""
+
+    def _template(self, db_session, latex):
+        from app.models.resume_template import ResumeTemplate
+
+        template = ResumeTemplate(user_id="test-user-id", name="Basic", latex_content=latex)
+        db_session.add(template)
+        db_session.commit()
+        return template
+
+    @patch("app.routers.resumes.enqueue_compile")
+    @patch("app.routers.resumes.generate_resume_content")
+    def test_retemplate_creates_new_version(self, mock_generate, mock_enqueue, client, db_session, auth_headers):
+        old = self._template(db_session, "A: %%SUMMARY%%")
+        new = self._template(db_session, "B: [[summary]] / {{projects}}")
+        resume = TestSectionRegeneration._resume(
+            db_session, "A: Summary text", {"summary": "Summary text", "projects": "Project text"}, old.id,
+        )
+
+        response = client.post(
+            f"/api/resumes/{resume.id}/retemplate", json={"template_id": new.id}, headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        mock_generate.assert_not_called()
+        body = response.json()
+        assert body["id"] != resume.id
+        assert body["template_id"] == new.id
+        assert body["latex_output"] == "B: Summary text / Project text"
+        assert body["compile_status"] == "pending"
+        assert body["section_content"] == resume.section_content
+        mock_enqueue.assert_called_once_with(body["id"])
+
+    def test_edited_resume_is_not_retemplated(self, client, db_session, auth_headers):
+        new = self._template(db_session, "B: %%SUMMARY%%")
+        resume = TestSectionRegeneration._resume(db_session, "Rewritten by chat", {"summary": "Summary text"})
+
+        response = client.post(
+            f"/api/resumes/{resume.id}/retemplate", json={"template_id": new.id}, headers=auth_headers,
+        )
+
+        assert response.status_code == 409
+
+    @patch("app.routers.templates.enqueue_compile")
+    def test_template_update_rerenders_resumes(self, mock_enqueue, client, db_session, auth_headers):
+        template = self._template(db_session, "A: %%SUMMARY%%")
+        sections = {"summary": "Summary text", "projects": "Project text"}
+        pristine = TestSectionRegeneration._resume(db_session, "A: Summary text", sections, template.id)
+        edited = TestSectionRegeneration._resume(db_session, "A: Chat edit", sections, template.id)
+
+        response = client.put(
+            f"/api/templates/{template.id}?rerender=true",
+            json={"latex_content": "C: %%SUMMARY%% %%PROJECTS%%"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert response.json()["rerendered_resumes"] == [pristine.id]
+        db_session.refresh(pristine)
+        db_session.refresh(edited)
+        assert pristine.latex_output == "C: Summary text Project text"
+        assert pristine.version == 2
+        assert pristine.compile_status == "pending"
+        assert edited.latex_output == "A: Chat edit"
+        mock_enqueue.assert_called_once_with(pristine.id, PRIORITY_BATCH)
+
+
+class TestParallelGeneration:
+    @staticmethod
+    def _section_of(user_prompt):
+        return next(name for name in ["summary", "skills", "projects", "experiences"]
+                    if f'"{name}"' in user_prompt)
+
+    def _generate(self):
+        return generate_resume_content(
+            job_description="Looking for a Python developer",
+            matched_skills=["Python"],
+            ranked_projects=[{"title": "Resume Builder", "description": "Platform"}],
+            experiences=[],
+            domain="Web Development",
+            seniority="Senior",
+            parallel=True,
+        )
+
+    @patch("app.services.resume_generator.call_llm")
+    def test_one_focused_request_per_section(self, mock_llm):
+        def reply(system_prompt, user_prompt, **kwargs):
+            section = self._section_of(user_prompt)
+            return json.dumps({section: f"{section} content"})
+        mock_llm.side_effect = reply
+
+        content = self._generate()
+
+        # Skills render from the database, so only the prose sections are requested
+        assert mock_llm.call_count == 3
+        assert content == {name: f"{name} content" for name in ["summary", "projects", "experiences"]}
+        projects_call = next(c for c in mock_llm.call_args_list
+                             if self._section_of(c.kwargs["user_prompt"]) == "projects")
+        assert "VERIFIED EXPERIENCES" not in projects_call.kwargs["user_prompt"]
+
+    @patch("app.services.resume_generator.call_llm")
+    def test_failing_section_retried_alone(self, mock_llm):
+        failures = {"projects": 1}
+
+        def reply(system_prompt, user_prompt, **kwargs):
+            section = self._section_of(user_prompt)
+            if failures.get(section):
+                failures[section] -= 1
+                raise RuntimeError("timeout")
+            return json.dumps({section: "ok"})
+        mock_llm.side_effect = reply
+
+        content = self._generate()
+
+        assert mock_llm.call_count == 4
+        assert content["projects"] == "ok"
+
+
+class TestSpeculativeGeneration:
+    @patch("app.routers.resumes.enqueue_compile")
+    @patch("app.routers.resumes.generate_resume_content")
+    @patch("app.routers.resumes.analyze_job_description")
+    def test_failed_candidates_seed_targeted_repair(
+        self, mock_analyze, mock_generate, mock_enqueue, monkeypatch,
+        client, db_session, auth_headers, sample_skills, sample_projects, sample_experiences,
+    ):
+        from app.config import settings
+        from app.models.resume_template import ResumeTemplate
+        from app.schemas.schemas import JDAnalysis
+
+        monkeypatch.setattr(settings, "SPECULATIVE_TEMPERATURES", "0.7")
+        template = ResumeTemplate(user_id="test-user-id", name="Basic", latex_content="%%PROJECTS%%")
+        db_session.add(template)
+        db_session.commit()
+
+        mock_analyze.return_value = JDAnalysis(
+            required_skills=["python"], preferred_skills=[], keywords=[],
+            domain="Web Development", seniority="Senior",
+        )
+        mock_generate.side_effect = [
+            {"summary": "", "projects": "Technologies: Python, Kubernetes", "experiences": ""},
+            {"projects": "Technologies: Python"},
+        ]
+
+        response = client.post(
+            "/api/resumes/generate",
+            json={"template_id": template.id, "job_description": "Python developer", "speculative": True},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert mock_generate.call_args_list[0].kwargs["temperature"] == 0.7
+        assert mock_generate.call_args_list[1].kwargs["sections"] == ["projects"]
+        assert response.json()["latex_output"] == "Technologies: Python"
@@ -0,0 +1,59 @@
+"""
+Tests for deterministic, LLM-free section rendering.
+"""
+import pytest
+from unittest.mock import MagicMock
+from app.services.section_renderers import escape_latex, render_sections, RenderContext, has_renderer
+from app.services.guardrail_validator import validate_resume
+
+
+def _skill(name, category, level=3):
+    skill = MagicMock(category=category, proficiency_level=level)
+    skill.name = name  # MagicMock reserves the name= constructor argument
+    return skill
+
+
+class TestEscapeLatex:
+    def test_escapes_special_characters(self):
+        assert escape_latex("R&D 100% #1 a_b $5") == r"R\&D 100\% \#1 a\_b \$5"
+
+    def test_handles_none(self):
+        assert escape_latex(None) == ""
+
+
+class TestSkillsRenderer:
+    def test_groups_matched_skills_by_category(self):
+        context = RenderContext(
+            skills=[
+                _skill("Python", "Programming", 5),
+                _skill("Go", "Programming", 4),
+                _skill("Docker", "DevOps", 4),
+                _skill("Excel", "Office", 2),
+            ],
+            matched_skills=["python", "go", "docker"],
+        )
+        latex = render_sections(["skills"], context)["skills"]
+        assert r"\item \textbf{DevOps}: Docker" in latex
+        assert r"\item \textbf{Programming}: Python, Go" in latex
+        assert "Excel" not in latex
+
+    def test_output_passes_guardrail(self):
+        skills = [_skill("C#", "Programming"), _skill("Node.js", None)]
+        context = RenderContext(skills=skills, matched_skills=["c#", "node.js"])
+        latex = render_sections(["skills"], context)["skills"]
+        is_valid, violations = validate_resume(latex, ["C#", "Node.js", "Programming"])
+        assert is_valid is True, violations
+
+    def test_no_skills_is_omitted(self):
+        assert render_sections(["skills"], RenderContext()) == {}
+
+
+class TestUserRenderers:
+    def test_header_fields_are_escaped(self):
+        user = MagicMock(full_name="Ana & Co", email="ana_b@example.com")
+        rendered = render_sections(["full_name", "email", "summary"], RenderContext(user=user))
+        assert rendered == {"full_name": r"Ana \& Co", "email": r"ana\_b@example.com"}
+
+    def test_prose_sections_have_no_renderer(self):
+        assert has_renderer("skills") is True
+        assert has_renderer("summary") is False
@@ -3,7 +3,7 @@ Unit tests for the Skill Matcher service.
 Tests the core hallucination prevention mechanism.
 """
 import pytest
-from app.services.skill_matcher import match_skills, _fuzzy_match, _normalize
+from app.services.skill_matcher import fuzzy_match, match_skills, _normalize
 from app.schemas.schemas import JDAnalysis
 
 
@@ -23,28 +23,28 @@ class TestNormalize:
 
 class TestFuzzyMatch:
     def test_exact_match(self):
-        assert _fuzzy_match("Python", ["Python"]) is True
+        assert fuzzy_match("Python", ["Python"]) is True
 
     def test_case_insensitive(self):
-        assert _fuzzy_match("python", ["Python"]) is True
+        assert fuzzy_match("python", ["Python"]) is True
 
     def test_substring_match(self):
-        assert _fuzzy_match("react", ["React.js"]) is True
+        assert fuzzy_match("react", ["React.js"]) is True
 
     def test_no_match(self):
-        assert _fuzzy_match("Rust", ["Python", "JavaScript"]) is False
+        assert fuzzy_match("Rust", ["Python", "JavaScript"]) is False
 
     def test_abbreviation_js(self):
-        assert _fuzzy_match("js", ["JavaScript"]) is True
+        assert fuzzy_match("js", ["JavaScript"]) is True
 
     def test_abbreviation_ts(self):
-        assert _fuzzy_match("ts", ["TypeScript"]) is True
+        assert fuzzy_match("ts", ["TypeScript"]) is True
 
     def test_postgres_match(self):
-        assert _fuzzy_match("postgres", ["PostgreSQL"]) is True
+        assert fuzzy_match("postgres", ["PostgreSQL"]) is True
 
     def test_k8s_match(self):
-        assert _fuzzy_match("k8s", ["Kubernetes"]) is True
+        assert fuzzy_match("k8s", ["Kubernetes"]) is True
 
 
 class TestMatchSkills:
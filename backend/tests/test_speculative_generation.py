@@ -0,0 +1,100 @@
+"""
+Tests for speculative candidate generation.
+"""
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+import pytest
+from app.config import settings
+from app.services import speculative_generation
+from app.services.speculative_generation import run_speculative, reserve_candidates, release_candidate
+
+
+class TestRunSpeculative:
+    def test_first_passing_candidate_wins(self):
+        slow_release = threading.Event()
+
+        def generate(temperature):
+            if temperature == 0.2:
+                slow_release.wait(timeout=2)  # Still running when the winner arrives
+                return {"skills": "Skills: Python"}
+            if temperature == 0.5:
+                return {"skills": "Skills: Rust"}
+            return {"skills": "Skills: Python"}
+
+        def validate(content):
+            return {"skills": ["rust"]} if "Rust" in content["skills"] else {}
+
+        winner, completed = run_speculative("user-a", generate, validate, [0.2, 0.5, 0.8])
+        slow_release.set()
+
+        assert winner is not None
+        assert winner.temperature == 0.8
+        assert all(c.temperature != 0.2 for c in completed)
+
+    def test_no_candidate_passes(self):
+        winner, completed = run_speculative(
+            "user-b",
+            generate=lambda t: {"skills": "Skills: Rust"},
+            validate=lambda c: {"skills": ["rust"]},
+            temperatures=[0.2, 0.5],
+        )
+        assert winner is None
+        assert len(completed) == 2
+        assert completed[0].violation_count == 1
+
+    @patch("app.services.llm_client.get_openai_client")
+    def test_losing_streams_are_cancelled(self, mock_client):
+        from app.services.llm_client import stream_llm
+        closed = threading.Event()
+
+        def chunks():
+            for _ in range(500):  # Five seconds of tokens unless the stream is cancelled
+                time.sleep(0.01)
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="x"))], usage=None)
+
+        def slow_stream(**kwargs):
+            stream = MagicMock()
+            stream.__iter__.return_value = chunks()
+            stream.response.close.side_effect = closed.set
+            return stream
+
+        mock_client.return_value.chat.completions.create.side_effect = slow_stream
+
+        def generate(temperature):
+            if temperature == 0.2:
+                return {"skills": "".join(stream_llm("system", "user"))}
+            return {"skills": "Skills: Python"}
+
+        winner, _ = run_speculative("user-f", generate, lambda c: {}, [0.2, 0.5])
+
+        assert winner.temperature == 0.5
+        assert closed.wait(timeout=2)
+
+    def test_errors_are_captured(self):
+        def generate(temperature):
+            raise RuntimeError("upstream timeout")
+
+        winner, completed = run_speculative("user-c", generate, lambda c: {}, [0.2])
+        assert winner is None
+        assert completed[0].error == "upstream timeout"
+
+
+class TestUserBudget:
+    def test_fan_out_is_capped(self, monkeypatch):
+        monkeypatch.setattr(settings, "SPECULATIVE_USER_BUDGET", 3)
+        assert reserve_candidates("user-d", 2) == 2
+        assert reserve_candidates("user-d", 2) == 1
+        assert reserve_candidates("user-d", 2) == 0
+        for _ in range(3):
+            release_candidate("user-d")
+        assert "user-d" not in speculative_generation._inflight
+
+    def test_exhausted_budget_runs_nothing(self, monkeypatch):
+        monkeypatch.setattr(settings, "SPECULATIVE_USER_BUDGET", 0)
+        calls = []
+        winner, completed = run_speculative("user-e", lambda t: calls.append(t) or {}, lambda c: {}, [0.2])
+        assert winner is None
+        assert completed == []
+        assert calls == []
@@ -0,0 +1,89 @@
+"""
+Tests for the structured-output contract: schemas, JSON repair and streaming parse.
+"""
+import json
+import pytest
+from app.schemas.schemas import JDAnalysis, RefineReply
+from app.services.structured_output import (
+    loads, parse_model, json_schema, response_format, section_model,
+    StreamingJSONParser, StructuredOutputError,
+)
+
+
+class TestSchemas:
+    def test_model_schema_is_strict(self):
+        schema = json_schema(RefineReply)
+        assert schema["additionalProperties"] is False
+        assert schema["required"] == ["reply", "updated_latex", "changes_made"]
+        assert "default" not in json.dumps(schema)
+
+    def test_response_format_wraps_schema(self):
+        fmt = response_format("jd_analysis", JDAnalysis)
+        assert fmt["type"] == "json_schema"
+        assert fmt["json_schema"]["strict"] is True
+        assert "required_skills" in fmt["json_schema"]["schema"]["properties"]
+
+    def test_section_model_per_section_set(self):
+        model = section_model(("summary", "projects"))
+        assert list(json_schema(model)["properties"]) == ["summary", "projects"]
+        assert section_model(("summary", "projects")) is model
+
+
+class TestRepair:
+    def test_valid_json_unchanged(self):
+        assert loads('{"a": "x\\\\textbf{y}", "b": [1, 2]}') == {"a": "x\\textbf{y}", "b": [1, 2]}
+
+    def test_code_fences_and_prose(self):
+        assert loads('Here you go:\n```json\n{"a": 1}\n```') == {"a": 1}
+
+    def test_trailing_commas(self):
+        assert loads('{"a": [1, 2,], "b": 3,}') == {"a": [1, 2], "b": 3}
+
+    def test_unescaped_latex_backslashes(self):
+        raw = '{"skills": "\\begin{itemize} \\item \\textbf{Python} \\& Go \\end{itemize}"}'
+        assert loads(raw)["skills"] == r"\begin{itemize} \item \textbf{Python} \& Go \end{itemize}"
+
+    def test_newline_escape_kept_unless_latex_command(self):
+        assert loads('{"a": "Python\\nDjango \\newline \\item x"}')["a"] == "Python\nDjango \\newline \\item x"
+
+    def test_valid_json_is_not_repaired(self):
+        assert loads('{"a": "\\tab"}')["a"] == "\tab"
+
+    def test_raw_newline_in_string(self):
+        assert loads('{"a": "line one\nline two"}')["a"] == "line one\nline two"
+
+    def test_unparseable_raises(self):
+        with pytest.raises(StructuredOutputError):
+            loads("I cannot help with that.")
+
+    def test_parse_model_validates(self):
+        assert parse_model('{"reply": "Done"}', RefineReply).changes_made is False
+        with pytest.raises(StructuredOutputError):
+            parse_model('{"changes_made": true}', RefineReply)
+
+
+class TestStreamingParser:
+    def test_fields_complete_as_chunks_arrive(self):
+        raw = '{"summary": "\\textbf{Lead}, engineer", "skills": {"a": [1, "}"]}, "projects": "x"}'
+        parser = StreamingJSONParser()
+        seen = []
+        for i in range(0, len(raw), 4):
+            seen.extend(key for key, _ in parser.feed(raw[i:i + 4]))
+
+        assert seen == ["summary", "skills", "projects"]
+        assert parser.done
+        assert parser.fields["summary"] == r"\textbf{Lead}, engineer"
+        assert parser.fields["skills"] == {"a": [1, "}"]}
+
+    def test_truncated_stream_keeps_completed_fields(self):
+        parser = StreamingJSONParser()
+        parser.feed('{"summary": "Done", "projects": "cut off mid')
+
+        assert not parser.done
+        assert parser.close() == {"summary": "Done"}
+
+    def test_partial_field_exposes_value_in_progress(self):
+        parser = StreamingJSONParser()
+        parser.feed('{"summary": "Done", "projects": "\\item Python\\n\\item Ru')
+
+        assert parser.partial_field() == ("projects", "\\item Python\n\\item Ru")
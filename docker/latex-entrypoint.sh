@@ -12,22 +12,30 @@ if [ ! -f "$INPUT_FILE" ]; then
 fi
 
 BASENAME=$(basename "$INPUT_FILE" .tex)
+LOG_FILE="$OUTPUT_DIR/$BASENAME.log"
+MAX_RUNS="${LATEX_MAX_RUNS:-3}"
 
 # Run pdflatex with security restrictions
 # --no-shell-escape prevents arbitrary command execution
 # -interaction=nonstopmode prevents interactive prompts
-pdflatex \
-    --no-shell-escape \
-    -interaction=nonstopmode \
-    -output-directory="$OUTPUT_DIR" \
-    "$INPUT_FILE" 2>&1
+# Rerun only while the log asks for it (cross-references, changed labels)
+RUN=1
+while true; do
+    pdflatex \
+        --no-shell-escape \
+        -interaction=nonstopmode \
+        -output-directory="$OUTPUT_DIR" \
+        "$INPUT_FILE" 2>&1 || true
 
-# Run twice for references
-pdflatex \
-    --no-shell-escape \
-    -interaction=nonstopmode \
-    -output-directory="$OUTPUT_DIR" \
-    "$INPUT_FILE" 2>&1
+    if [ "$RUN" -ge "$MAX_RUNS" ]; then
+        break
+    fi
+    if ! grep -Eq "Rerun to get|Label\(s\) may have changed|Please rerun LaTeX|Rerun LaTeX" "$LOG_FILE" 2>/dev/null; then
+        break
+    fi
+    RUN=$((RUN + 1))
+done
+echo "RUNS: $RUN"
 
 # Check if PDF was generated
 if [ -f "$OUTPUT_DIR/$BASENAME.pdf" ]; then
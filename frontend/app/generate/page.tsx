@@ -1,11 +1,11 @@
 'use client';
 
 import React, { useState, useEffect, useRef } from 'react';
-import { api, ResumeTemplate, GeneratedResume, ChatResponse, getToken } from '@/lib/api';
+import { api, ResumeTemplate, GeneratedResume, ChatResponse, LatexPreview, getToken, subscribeCompile } from '@/lib/api';
 import {
     Sparkles, FileText, ClipboardPaste, ChevronRight,
     CheckCircle2, XCircle, TrendingUp, Send, Bot, User, Loader2,
-    Download, AlertTriangle
+    Download, AlertTriangle, Eye
 } from 'lucide-react';
 
 type Step = 'jd' | 'match' | 'generate' | 'result';
@@ -30,6 +30,7 @@ export default function GeneratePage() {
     const [result, setResult] = useState<GeneratedResume | null>(null);
     const [analysis, setAnalysis] = useState<AnalysisData | null>(null);
     const [error, setError] = useState('');
+    const [preview, setPreview] = useState<LatexPreview | null>(null);
 
     // Chat state
     const [chatMessages, setChatMessages] = useState<{ role: string; content: string }[]>([]);
@@ -45,6 +46,34 @@ export default function GeneratePage() {
         chatEndRef.current?.scrollIntoView({ behavior: 'smooth' });
     }, [chatMessages]);
 
+    // The PDF compiles in the background, and after edits once the chat goes idle;
+    // refresh the resume once it is ready
+    const resultId = result?.id;
+    const compiling = result?.compile_status === 'pending' || result?.compile_status === 'compiling';
+    const awaitingPdf = compiling || result?.compile_status === 'stale';
+    useEffect(() => {
+        if (!resultId || !awaitingPdf) return;
+        return subscribeCompile(resultId, (event) => {
+            if (event.status === 'ready' || event.status === 'failed') {
+                api.get<GeneratedResume>(`/api/resumes/${resultId}`).then(setResult).catch(() => { });
+            } else {
+                setResult(prev => prev && prev.id === resultId ? { ...prev, compile_status: event.status } : prev);
+            }
+        });
+    }, [resultId, awaitingPdf]);
+
+    // Refinements show up in the HTML preview at once, while the PDF compiles
+    const latexOutput = result?.latex_output;
+    useEffect(() => {
+        if (!latexOutput) {
+            setPreview(null);
+            return;
+        }
+        api.post<LatexPreview>('/api/preview', { latex_content: latexOutput })
+            .then(setPreview)
+            .catch(() => setPreview(null));
+    }, [latexOutput]);
+
     const handleGenerate = async () => {
         if (!selectedTemplate || !jdText.trim()) return;
         setGenerating(true);
@@ -82,8 +111,8 @@ export default function GeneratePage() {
                 history: chatMessages,
             });
             setChatMessages(prev => [...prev, { role: 'assistant', content: resp.reply }]);
-            if (resp.updated_latex) {
-                setResult({ ...result, latex_output: resp.updated_latex });
+            if (resp.updated_latex && resp.updated_latex !== result.latex_output) {
+                setResult({ ...result, latex_output: resp.updated_latex, compile_status: 'stale' });
             }
             if (!resp.validation_passed && resp.validation_errors.length > 0) {
                 setChatMessages(prev => [...prev, {
@@ -238,9 +267,14 @@ export default function GeneratePage() {
                                 <p className="text-sm text-slate-400 mt-1">Version {result.id.slice(0, 8)} • Crafted with {selectedTemplate && templates.find(t => t.id === selectedTemplate)?.name}</p>
                             </div>
                             <div className="flex gap-3">
+                                {compiling && (
+                                    <span className="btn-secondary flex items-center gap-3 px-6">
+                                        <Loader2 size={18} className="animate-spin" /> Compiling PDF…
+                                    </span>
+                                )}
                                 {result.pdf_path && (
                                     <a
-                                        href={`${process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'}/api/resumes/${result.id}/pdf?token=${getToken()}`}
+                                        href={`${process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'}/api/resumes/${result.id}/pdf?token=${getToken()}${result.compile_status === 'ready' ? `&v=${encodeURIComponent(result.pdf_path)}` : ''}`}
                                         target="_blank"
                                         rel="noopener noreferrer"
                                         className="btn-primary flex items-center gap-3 px-6"
@@ -320,6 +354,19 @@ export default function GeneratePage() {
                                     </div>
                                 )}
 
+                                {/* HTML Preview */}
+                                {preview && (
+                                    <div className="card">
+                                        <div className="flex items-center justify-between mb-6">
+                                            <h2 className="text-xl font-display font-bold text-white flex items-center gap-3">
+                                                <Eye size={22} className="text-slate-400" /> Live Preview
+                                            </h2>
+                                            <div className="px-4 py-1.5 rounded-full bg-slate-900 border border-white/5 text-[10px] font-bold text-slate-500 uppercase tracking-[0.2em]">Approximate</div>
+                                        </div>
+                                        <div className="latex-preview rounded-2xl bg-white max-h-[800px] overflow-auto" dangerouslySetInnerHTML={{ __html: preview.html }} />
+                                    </div>
+                                )}
+
                                 {/* LaTeX Output */}
                                 <div className="card">
                                     <div className="flex items-center justify-between mb-6">
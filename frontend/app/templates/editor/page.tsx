@@ -2,8 +2,8 @@
 
 import React, { useState, useEffect, Suspense } from 'react';
 import { useRouter, useSearchParams } from 'next/navigation';
-import { api, ResumeTemplate } from '@/lib/api';
-import { Save, ArrowLeft, Info } from 'lucide-react';
+import { api, ResumeTemplate, LatexPreview } from '@/lib/api';
+import { Save, ArrowLeft, Info, Eye, EyeOff } from 'lucide-react';
 import dynamic from 'next/dynamic';
 
 const MonacoEditor = dynamic(() => import('@monaco-editor/react'), { ssr: false });
@@ -17,6 +17,8 @@ function EditorContent() {
     const [content, setContent] = useState('');
     const [saving, setSaving] = useState(false);
     const [loaded, setLoaded] = useState(!templateId);
+    const [showPreview, setShowPreview] = useState(true);
+    const [preview, setPreview] = useState<LatexPreview | null>(null);
 
     useEffect(() => {
         if (templateId) {
@@ -30,6 +32,20 @@ function EditorContent() {
         }
     }, [templateId, router]);
 
+    // Instant HTML preview while typing, without compiling a PDF
+    useEffect(() => {
+        if (!showPreview || !content.trim()) {
+            setPreview(null);
+            return;
+        }
+        const timer = setTimeout(() => {
+            api.post<LatexPreview>('/api/preview', { latex_content: content })
+                .then(setPreview)
+                .catch(() => { });
+        }, 250);
+        return () => clearTimeout(timer);
+    }, [content, showPreview]);
+
     const handleSave = async () => {
         if (!name.trim() || !content.trim()) return;
         setSaving(true);
@@ -104,6 +120,12 @@ your@email.com \\quad | \\quad (555) 123-4567 \\quad | \\quad linkedin.com/in/yo
                     />
                 </div>
                 <div className="flex items-center gap-2">
+                    <button
+                        onClick={() => setShowPreview(v => !v)}
+                        className="btn-secondary text-xs flex items-center gap-1"
+                    >
+                        {showPreview ? <EyeOff size={12} /> : <Eye size={12} />} Preview
+                    </button>
                     {!templateId && !content && (
                         <button
                             onClick={() => setContent(defaultTemplate)}
@@ -131,27 +153,39 @@ your@email.com \\quad | \\quad (555) 123-4567 \\quad | \\quad linkedin.com/in/yo
             </div>
 
             {/* Editor */}
-            <div className="flex-1 min-h-0">
-                <MonacoEditor
-                    height="100%"
-                    language="latex"
-                    theme="vs-dark"
-                    value={content}
-                    onChange={(v) => setContent(v || '')}
-                    options={{
-                        fontSize: 14,
-                        minimap: { enabled: false },
-                        wordWrap: 'on',
-                        padding: { top: 16 },
-                        scrollBeyondLastLine: false,
-                        smoothScrolling: true,
-                        lineNumbers: 'on',
-                        glyphMargin: false,
-                        folding: true,
-                        renderLineHighlight: 'line',
-                        contextmenu: true,
-                    }}
-                />
+            <div className="flex-1 min-h-0 flex">
+                <div className={showPreview ? 'w-1/2 min-w-0' : 'w-full'}>
+                    <MonacoEditor
+                        height="100%"
+                        language="latex"
+                        theme="vs-dark"
+                        value={content}
+                        onChange={(v) => setContent(v || '')}
+                        options={{
+                            fontSize: 14,
+                            minimap: { enabled: false },
+                            wordWrap: 'on',
+                            padding: { top: 16 },
+                            scrollBeyondLastLine: false,
+                            smoothScrolling: true,
+                            lineNumbers: 'on',
+                            glyphMargin: false,
+                            folding: true,
+                            renderLineHighlight: 'line',
+                            contextmenu: true,
+                        }}
+                    />
+                </div>
+                {showPreview && (
+                    <div className="w-1/2 min-w-0 overflow-auto border-l border-indigo-500/10 bg-white">
+                        {preview && preview.unsupported.length > 0 && (
+                            <p className="px-6 pt-3 text-[11px] text-gray-500">
+                                Approximate preview, not shown: {preview.unsupported.join(', ')}
+                            </p>
+                        )}
+                        <div className="latex-preview" dangerouslySetInnerHTML={{ __html: preview?.html || '' }} />
+                    </div>
+                )}
             </div>
         </div>
     );
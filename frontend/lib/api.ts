@@ -69,6 +69,30 @@ export const api = {
         request<T>(endpoint, { method: 'DELETE' }),
 };
 
+/**
+ * Follow a resume's background PDF compile over server-sent events, including
+ * the deferred compile of a resume edited since its last PDF.
+ * Returns a function that closes the stream.
+ */
+export function subscribeCompile(
+    resumeId: string,
+    onEvent: (event: CompileStatus) => void
+): () => void {
+    const source = new EventSource(`${API_BASE}/api/resumes/${resumeId}/events?token=${getToken()}`);
+    source.addEventListener('compile', (e) => {
+        const event: CompileStatus = JSON.parse((e as MessageEvent).data);
+        onEvent(event);
+        if (event.status === 'ready' || event.status === 'failed') {
+            source.close();
+        }
+    });
+    // The server ends long streams; let EventSource reconnect unless it has given up
+    source.onerror = () => {
+        if (source.readyState === EventSource.CLOSED) source.close();
+    };
+    return () => source.close();
+}
+
 // ─── Type Definitions ──────────────────────────────────────────
 
 export interface User {
@@ -146,10 +170,19 @@ export interface GeneratedResume {
     matched_skills: string | null;
     missing_skills: string | null;
     metadata_json: string | null;
+    compile_status: 'pending' | 'compiling' | 'ready' | 'failed' | 'stale' | null;
     version: number;
     created_at: string;
 }
 
+export interface CompileStatus {
+    resume_id: string;
+    status: GeneratedResume['compile_status'];
+    attempts: number;
+    pdf_ready: boolean;
+    error: string | null;
+}
+
 export interface MatchScoreBreakdown {
     required_skill_match: number;
     project_relevance: number;
@@ -166,6 +199,11 @@ export interface MatchScoreBreakdown {
     improvement_suggestions: string[];
 }
 
+export interface LatexPreview {
+    html: string;
+    unsupported: string[];
+}
+
 export interface ChatResponse {
     reply: string;
     updated_latex: string | null;